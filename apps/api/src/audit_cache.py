@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from packages.contracts.serialization import dumps, loads
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class AuditResultCache:
+    """Content-addressed LRU cache for source-independent audit results.
+
+    Entries are stored as encoded JSON so the byte budget reflects real memory use
+    and every hit hands back a fresh, independently mutable dict. When `disk_dir`
+    is set, entries are also written there and memory misses fall back to disk.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        disk_dir: str | Path | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(request_body: bytes, ruleset_version: str) -> str:
+        return f"{ruleset_version}-{hashlib.sha256(request_body).hexdigest()}"
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            encoded = self._entries.get(key)
+            if encoded is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return loads(encoded)
+
+        encoded = self._read_disk(key)
+        value: dict[str, Any] | None = None
+        if encoded is not None:
+            try:
+                value = loads(encoded)
+            except ValueError:
+                value = None
+        with self._lock:
+            if value is None or encoded is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, encoded)
+        return value
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        encoded = dumps(value)
+        with self._lock:
+            self._store(key, encoded)
+        self._write_disk(key, encoded)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def _store(self, key: str, encoded: bytes) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size_bytes -= len(previous)
+        if len(encoded) > self.max_bytes:
+            return
+        self._entries[key] = encoded
+        self._size_bytes += len(encoded)
+        while self._entries and (len(self._entries) > self.max_entries or self._size_bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._size_bytes -= len(evicted)
+
+    def _disk_path(self, key: str) -> Path | None:
+        if self.disk_dir is None:
+            return None
+        return self.disk_dir / f"{key}.json"
+
+    def _read_disk(self, key: str) -> bytes | None:
+        path = self._disk_path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, encoded: bytes) -> None:
+        path = self._disk_path(key)
+        if path is None:
+            return
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_bytes(encoded)
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+
+DEFAULT_AUDIT_CACHE = AuditResultCache()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from .audit_jobs import DEFAULT_AUDIT_JOB_QUEUE, AuditJobQueue
+from .error_envelope import error_response
+from .request_limits import DEFAULT_REQUEST_LIMITS, LimitExceeded, RequestLimits
+from .rule_audit_endpoint import AUDIT_MODES, _rule_selection_error
+
+
+def post_rule_audit_job(
+    source_id: str,
+    request_body: bytes,
+    job_queue: AuditJobQueue | None = None,
+    limits: RequestLimits | None = None,
+    include_timings: bool = False,
+    mode: str = "full",
+    rules: Sequence[str] | None = None,
+) -> tuple[int, dict[str, Any]]:
+    """Framework-agnostic handler for POST /api/v1/sources/{source_id}/audits/rules?async=true.
+
+    The rule selection and `timings` flag run with the job. Delta audits are
+    rejected: their baseline lives in the serving process, not the workers.
+    """
+    if not source_id or not source_id.strip():
+        return error_response(
+            status_code=400,
+            code="invalid_source_id",
+            message="Path parameter `source_id` must be a non-empty string.",
+        )
+    if mode not in AUDIT_MODES:
+        return error_response(
+            status_code=400,
+            code="invalid_audit_mode",
+            message="Query parameter `mode` must be one of: " + ", ".join(AUDIT_MODES) + ".",
+            details={"mode": mode},
+        )
+    if mode != "full":
+        return error_response(
+            status_code=400,
+            code="unsupported_audit_mode",
+            message="Background audit jobs only support `mode=full`.",
+            details={"mode": mode},
+        )
+    rules_error = _rule_selection_error(rules)
+    if rules_error is not None:
+        return rules_error
+    try:
+        # Reject what the worker would reject anyway before it takes a queue slot.
+        (limits if limits is not None else DEFAULT_REQUEST_LIMITS).check_body(request_body)
+    except LimitExceeded as exc:
+        return exc.response()
+
+    queue = job_queue or DEFAULT_AUDIT_JOB_QUEUE
+    job = queue.submit(source_id, request_body, rules=rules, include_timings=include_timings)
+    if job is None:
+        return error_response(
+            status_code=429,
+            code="audit_queue_full",
+            message="Audit job queue is full. Retry later.",
+            details={"max_queue_depth": queue.max_queue_depth},
+        )
+
+    return 202, {
+        "job_id": job.job_id,
+        "source_id": source_id,
+        "status": job.status,
+        "submitted_at": job.submitted_at,
+        "status_url": f"/api/v1/jobs/{job.job_id}",
+    }
+
+
+def get_audit_job(job_id: str, job_queue: AuditJobQueue | None = None) -> tuple[int, dict[str, Any]]:
+    """Framework-agnostic handler for GET /api/v1/jobs/{job_id}."""
+    queue = job_queue or DEFAULT_AUDIT_JOB_QUEUE
+    job = queue.get(job_id)
+    if job is None:
+        return error_response(
+            status_code=404,
+            code="job_not_found",
+            message=f"No audit job found for id `{job_id}`.",
+        )
+    return 200, job.to_dict()
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Literal, Sequence
+from uuid import uuid4
+
+from .audit_store import DEFAULT_AUDIT_STORE, InMemoryAuditStore, StoredAudit
+from .error_envelope import error_response
+
+JobStatus = Literal["queued", "running", "done", "failed"]
+
+DEFAULT_MAX_WORKERS = int(os.environ.get("QADMS_AUDIT_JOB_WORKERS", "0")) or (os.cpu_count() or 1)
+DEFAULT_MAX_QUEUE_DEPTH = int(os.environ.get("QADMS_AUDIT_JOB_QUEUE_DEPTH", "64"))
+DEFAULT_MAX_RETAINED_JOBS = 1000
+
+
+def _now_iso() -> str:
+    return datetime.now(tz=timezone.utc).isoformat()
+
+
+def _run_audit_job(
+    source_id: str,
+    request_body: bytes,
+    rules: tuple[str, ...] | None = None,
+    include_timings: bool = False,
+) -> tuple[int, dict[str, Any]]:
+    # Imported here so worker processes only load the rule stack when they run a job.
+    from .rule_audit_endpoint import post_rule_audit
+
+    return post_rule_audit(source_id, request_body, include_timings=include_timings, rules=rules)
+
+
+@dataclass
+class AuditJob:
+    job_id: str
+    source_id: str
+    submitted_at: str
+    future: Future = field(repr=False)
+    finished_at: str | None = None
+    # Set once the completion callback has run, i.e. after the result was indexed.
+    finished: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def status(self) -> JobStatus:
+        if self.future.done():
+            return "failed" if self.future.cancelled() or self.future.exception() else "done"
+        if self.future.running():
+            return "running"
+        return "queued"
+
+    def to_dict(self) -> dict[str, Any]:
+        status = self.status
+        payload: dict[str, Any] = {
+            "job_id": self.job_id,
+            "source_id": self.source_id,
+            "status": status,
+            "submitted_at": self.submitted_at,
+            "finished_at": self.finished_at,
+        }
+        if status == "done":
+            result_status, result = self.future.result()
+            payload["result_status"] = result_status
+            payload["result"] = result
+        elif status == "failed":
+            crashed = not self.future.cancelled() and isinstance(self.future.exception(), BrokenProcessPool)
+            result_status, result = error_response(
+                status_code=500,
+                code="audit_job_failed",
+                message=(
+                    "Audit worker process exited before producing a result."
+                    if crashed
+                    else "Audit job failed before producing a result."
+                ),
+            )
+            payload["result_status"] = result_status
+            payload["result"] = result
+        return payload
+
+
+class AuditJobQueue:
+    """Bounded queue running audits on a worker process pool, off the request path.
+
+    `max_queue_depth` caps jobs that are queued or running; `submit` returns None
+    once it is reached so callers can shed load. The pool is created lazily on
+    first use, and replaced when a crashed worker has broken it: the jobs it
+    held fail with `audit_job_failed` and later submissions go to a new pool.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_queue_depth: int = DEFAULT_MAX_QUEUE_DEPTH,
+        max_retained_jobs: int = DEFAULT_MAX_RETAINED_JOBS,
+        executor_factory: Callable[[], Executor] | None = None,
+        audit_store: InMemoryAuditStore | None = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.max_retained_jobs = max_retained_jobs
+        self._executor_factory = executor_factory or self._default_executor
+        self._executor: Executor | None = None
+        self._audit_store = audit_store if audit_store is not None else DEFAULT_AUDIT_STORE
+        self._jobs: OrderedDict[str, AuditJob] = OrderedDict()
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _default_executor(self) -> Executor:
+        # Spawned workers avoid forking a server process that already runs threads.
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def submit(
+        self,
+        source_id: str,
+        request_body: bytes,
+        *,
+        rules: Sequence[str] | None = None,
+        include_timings: bool = False,
+    ) -> AuditJob | None:
+        selected = tuple(rules) if rules is not None else None
+        with self._lock:
+            if self._pending >= self.max_queue_depth:
+                return None
+            future = self._submit_locked(_run_audit_job, source_id, request_body, selected, include_timings)
+            job = AuditJob(job_id=str(uuid4()), source_id=source_id, submitted_at=_now_iso(), future=future)
+            self._pending += 1
+            self._jobs[job.job_id] = job
+            self._evict_finished_jobs()
+        future.add_done_callback(lambda _: self._on_done(job))
+        return job
+
+    def _submit_locked(self, fn: Callable[..., Any], *args: Any) -> Future:
+        if self._executor is None:
+            self._executor = self._executor_factory()
+        try:
+            return self._executor.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died (crash, OOM kill); its pool refuses all further work.
+            broken, self._executor = self._executor, self._executor_factory()
+            broken.shutdown(wait=False, cancel_futures=True)
+            return self._executor.submit(fn, *args)
+
+    def get(self, job_id: str) -> AuditJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: float | None = None) -> AuditJob | None:
+        job = self.get(job_id)
+        if job is not None:
+            job.finished.wait(timeout)
+        return job
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _on_done(self, job: AuditJob) -> None:
+        try:
+            if not job.future.cancelled() and job.future.exception() is None:
+                status_code, result = job.future.result()
+                if status_code == 200:
+                    # Workers keep their own stores; index the audit here so the violations query can find it.
+                    self._audit_store.save_audit(
+                        StoredAudit(
+                            source_id=job.source_id,
+                            audit_id=result["audit_id"],
+                            evaluated_at=result["evaluated_at"],
+                            violations=result["violations"],
+                        )
+                    )
+        finally:
+            with self._lock:
+                job.finished_at = _now_iso()
+                self._pending -= 1
+            job.finished.set()
+
+    def _evict_finished_jobs(self) -> None:
+        while len(self._jobs) > self.max_retained_jobs:
+            oldest_id = next(
+                (job_id for job_id, job in self._jobs.items() if job.future.done()),
+                None,
+            )
+            if oldest_id is None:
+                return
+            del self._jobs[oldest_id]
+
+
+DEFAULT_AUDIT_JOB_QUEUE = AuditJobQueue()
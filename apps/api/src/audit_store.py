@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import re
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Sequence
+
+from packages.rules.delta_audit import DeltaAuditState
+from packages.rules.registry import DEFAULT_RULE_REGISTRY, RuleSpec
+
+INDEXED_FIELDS = ("severity", "category", "rule_id", "code")
+SEARCH_FIELDS = ("rule_id", "code", "title", "description")
+DEFAULT_MAX_AUDITS = 100
+DEFAULT_MAX_DELTA_SOURCES = 32
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+# Sorts after any character that can appear in a token path, closing prefix ranges.
+_PREFIX_END = "\U0010ffff"
+
+
+def _violation_paths(violation: dict[str, Any]) -> list[str]:
+    evidence = violation.get("evidence") or {}
+    return [value for key, value in evidence.items() if key.endswith("_path") and isinstance(value, str)]
+
+
+def _search_words(text: str) -> set[str]:
+    return set(_WORD_PATTERN.findall(text.lower()))
+
+
+class ViolationIndex:
+    """Secondary indexes over an audit's sorted violation list.
+
+    Every index maps to ascending positions in `violations`, so filtered results
+    keep the audit's sort order and positions double as pagination cursors.
+    """
+
+    def __init__(self, violations: list[dict[str, Any]]) -> None:
+        self.violations = violations
+        self.by_field: dict[str, dict[str, list[int]]] = {name: {} for name in INDEXED_FIELDS}
+        path_entries: list[tuple[str, int]] = []
+        word_positions: dict[str, list[int]] = {}
+
+        for position, violation in enumerate(violations):
+            for name in INDEXED_FIELDS:
+                self.by_field[name].setdefault(str(violation.get(name)), []).append(position)
+            paths = _violation_paths(violation)
+            path_entries.extend((path, position) for path in set(paths))
+            words: set[str] = set()
+            for text in [*(str(violation.get(name, "")) for name in SEARCH_FIELDS), *paths]:
+                words |= _search_words(text)
+            for word in words:
+                word_positions.setdefault(word, []).append(position)
+
+        path_entries.sort()
+        self._paths = [path for path, _ in path_entries]
+        self._path_positions = [position for _, position in path_entries]
+        self._words = sorted(word_positions)
+        self._word_positions = word_positions
+
+    def __len__(self) -> int:
+        return len(self.violations)
+
+    def counts(self, name: str) -> dict[str, int]:
+        return {value: len(positions) for value, positions in self.by_field[name].items()}
+
+    def match_field(self, name: str, values: Iterable[str]) -> set[int]:
+        index = self.by_field[name]
+        matches: set[int] = set()
+        for value in values:
+            matches.update(index.get(value, ()))
+        return matches
+
+    def match_path_prefix(self, prefix: str) -> set[int]:
+        start = bisect_left(self._paths, prefix)
+        end = bisect_left(self._paths, prefix + _PREFIX_END, lo=start)
+        return set(self._path_positions[start:end])
+
+    def match_search(self, query: str) -> set[int] | None:
+        """Positions whose text contains a word starting with every query term (None: no terms)."""
+        matches: set[int] | None = None
+        for term in _search_words(query):
+            start = bisect_left(self._words, term)
+            end = bisect_left(self._words, term + _PREFIX_END, lo=start)
+            term_matches: set[int] = set()
+            for word in self._words[start:end]:
+                term_matches.update(self._word_positions[word])
+            matches = term_matches if matches is None else matches & term_matches
+            if not matches:
+                return set()
+        return matches
+
+
+@dataclass
+class StoredAudit:
+    """An audit's sorted violations; the query index is built on the first violations query."""
+
+    source_id: str
+    audit_id: str
+    evaluated_at: str
+    violations: list[dict[str, Any]] = field(repr=False)
+    _index: ViolationIndex | None = field(default=None, init=False, repr=False, compare=False)
+    _index_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    @property
+    def index(self) -> ViolationIndex:
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    self._index = ViolationIndex(self.violations)
+        return self._index
+
+
+class InMemoryAuditStore:
+    """Keeps the most recent audits (LRU) with their violation indexes for query endpoints."""
+
+    def __init__(self, max_audits: int = DEFAULT_MAX_AUDITS) -> None:
+        self.max_audits = max_audits
+        self._audits: OrderedDict[tuple[str, str], StoredAudit] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def save_audit(self, audit: StoredAudit) -> StoredAudit:
+        with self._lock:
+            key = (audit.source_id, audit.audit_id)
+            self._audits[key] = audit
+            self._audits.move_to_end(key)
+            while len(self._audits) > self.max_audits:
+                self._audits.popitem(last=False)
+        return audit
+
+    def get_audit(self, source_id: str, audit_id: str) -> StoredAudit | None:
+        with self._lock:
+            audit = self._audits.get((source_id, audit_id))
+            if audit is not None:
+                self._audits.move_to_end((source_id, audit_id))
+            return audit
+
+
+class DeltaStateStore:
+    """Per-source rule state for delta audits, evicting the least recently audited source."""
+
+    def __init__(self, max_sources: int = DEFAULT_MAX_DELTA_SOURCES) -> None:
+        self.max_sources = max_sources
+        self._states: OrderedDict[str, DeltaAuditState] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def state_for(self, source_id: str, specs: Sequence[RuleSpec] | None = None) -> DeltaAuditState:
+        """State for `source_id` tracking `specs` (default: every rule); callers hold `state.lock` while evaluating.
+
+        A request selecting different rules than the source's state replaces it
+        with a fresh one, so that audit is evaluated in full.
+        """
+        wanted = list(specs) if specs is not None else DEFAULT_RULE_REGISTRY.select()
+        with self._lock:
+            state = self._states.get(source_id)
+            if state is None or state.specs != wanted:
+                state = self._states[source_id] = DeltaAuditState(wanted)
+            self._states.move_to_end(source_id)
+            while len(self._states) > self.max_sources:
+                self._states.popitem(last=False)
+            return state
+
+
+DEFAULT_AUDIT_STORE = InMemoryAuditStore()
+DEFAULT_DELTA_STATE_STORE = DeltaStateStore()
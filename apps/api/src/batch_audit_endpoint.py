@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterator
+from uuid import uuid4
+
+from packages.contracts.serialization import dumps
+from packages.rules import build_tokens_studio_export
+
+from .audit_store import DEFAULT_AUDIT_STORE, InMemoryAuditStore, StoredAudit
+from .error_envelope import error_response
+from .persistence import DEFAULT_IMPORT_STORE, TokenImportStore
+from .request_limits import parse_json_body
+
+DEFAULT_BATCH_WORKERS = int(os.environ.get("QADMS_BATCH_AUDIT_WORKERS", "0")) or (os.cpu_count() or 1)
+MAX_BATCH_SOURCES = 256
+
+SEVERITIES = ("low", "medium", "high", "critical")
+CATEGORIES = ("tokens", "a11y", "other")
+
+
+def _run_source_audit(source_id: str, request_body: bytes) -> tuple[int, dict[str, Any]]:
+    # Imported here so worker processes only load the rule stack when they run an audit.
+    from .rule_audit_endpoint import post_rule_audit
+
+    return post_rule_audit(source_id, request_body)
+
+
+class BatchAuditPool:
+    """Lazily created worker process pool shared by batch audits.
+
+    A crashed worker (segfault, OOM kill) breaks a process pool for good; the
+    audits it held fail as per-source errors and the pool is replaced on the
+    next submission.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = DEFAULT_BATCH_WORKERS,
+        executor_factory: Callable[[], Executor] | None = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self._executor_factory = executor_factory or self._default_executor
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+
+    def _default_executor(self) -> Executor:
+        # Spawned workers avoid forking a server process that already runs threads.
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._executor_factory()
+            try:
+                return self._executor.submit(fn, *args)
+            except BrokenProcessPool:
+                broken, self._executor = self._executor, self._executor_factory()
+                broken.shutdown(wait=False, cancel_futures=True)
+                return self._executor.submit(fn, *args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+DEFAULT_BATCH_POOL = BatchAuditPool()
+
+
+def _resolve_entry(
+    position: int, entry: Any, import_store: TokenImportStore
+) -> tuple[str, bytes | None, tuple[int, dict[str, Any]] | None]:
+    """(source_id, audit request body, per-source error) for one batch entry."""
+    source_id = entry.get("source_id") if isinstance(entry, dict) else None
+    if not isinstance(source_id, str) or not source_id.strip():
+        return "", None, error_response(
+            status_code=400,
+            code="invalid_source_id",
+            message=f"Entry {position} needs a non-empty string `source_id`.",
+        )
+    if "payload" in entry:
+        return source_id, dumps(entry["payload"]), None
+
+    version_id = entry.get("version_id")
+    if not isinstance(version_id, str) or not version_id:
+        return source_id, None, error_response(
+            status_code=400,
+            code="invalid_batch_entry",
+            message=f"Entry {position} needs either `payload` or `version_id`.",
+        )
+    version = import_store.get_version(version_id)
+    if version is None or version.source_id != source_id:
+        return source_id, None, error_response(
+            status_code=404,
+            code="version_not_found",
+            message=f"No token version `{version_id}` found for source `{source_id}`.",
+        )
+    # Audit the stored canonical tokens through the same request path as an inline payload.
+    tokens = import_store.get_version_tokens(version_id)
+    payload = build_tokens_studio_export(tokens) if tokens is not None else None
+    if payload is None:
+        return source_id, None, error_response(
+            status_code=422,
+            code="version_payload_unavailable",
+            message=f"Token version `{version_id}` has no stored tokens to audit; send the export as `payload`.",
+            details={"version_id": version_id},
+        )
+    return source_id, dumps(payload), None
+
+
+def _result_record(position: int, source_id: str, status_code: int, body: dict[str, Any]) -> dict[str, Any]:
+    record: dict[str, Any] = {"type": "result", "index": position, "source_id": source_id, "status": status_code}
+    if status_code == 200:
+        record["audit"] = body
+    else:
+        record["error"] = body["error"]
+    return record
+
+
+def _summarize(results: list[dict[str, Any]], source_count: int) -> dict[str, Any]:
+    by_severity = dict.fromkeys(SEVERITIES, 0)
+    by_category = dict.fromkeys(CATEGORIES, 0)
+    by_rule: dict[str, int] = {}
+    total = 0
+    for summary in results:
+        total += summary["total_violations"]
+        for key, count in summary["by_severity"].items():
+            by_severity[key] = by_severity.get(key, 0) + count
+        for key, count in summary["by_category"].items():
+            by_category[key] = by_category.get(key, 0) + count
+        for key, count in summary["by_rule"].items():
+            by_rule[key] = by_rule.get(key, 0) + count
+    return {
+        "type": "summary",
+        "source_count": source_count,
+        "succeeded": len(results),
+        "failed": source_count - len(results),
+        "total_violations": total,
+        "by_severity": by_severity,
+        "by_category": by_category,
+        "by_rule": dict(sorted(by_rule.items())),
+    }
+
+
+def _stream_batch(
+    batch_id: str,
+    source_count: int,
+    rejected: list[dict[str, Any]],
+    futures: dict[Future, tuple[int, str]],
+    audit_store: InMemoryAuditStore,
+) -> Iterator[dict[str, Any]]:
+    summaries: list[dict[str, Any]] = []
+    try:
+        yield {"type": "batch", "batch_id": batch_id, "source_count": source_count}
+        yield from rejected
+        for future in as_completed(futures):
+            position, source_id = futures[future]
+            try:
+                status_code, body = future.result()
+            except BrokenProcessPool:
+                status_code, body = error_response(
+                    status_code=500,
+                    code="audit_failed",
+                    message="Audit worker process exited before producing a result.",
+                )
+            except Exception:
+                status_code, body = error_response(
+                    status_code=500,
+                    code="audit_failed",
+                    message="Audit failed before producing a result.",
+                )
+            if status_code == 200:
+                summaries.append(body["summary"])
+                # Workers keep their own stores; index the audit here so the violations query can find it.
+                audit_store.save_audit(
+                    StoredAudit(
+                        source_id=source_id,
+                        audit_id=body["audit_id"],
+                        evaluated_at=body["evaluated_at"],
+                        violations=body["violations"],
+                    )
+                )
+            yield _result_record(position, source_id, status_code, body)
+        yield _summarize(summaries, source_count)
+    finally:
+        # A client that disconnects mid-stream should not leave queued audits behind.
+        for future in futures:
+            future.cancel()
+
+
+def post_batch_audit(
+    request_body: bytes,
+    pool: BatchAuditPool | None = None,
+    import_store: TokenImportStore | None = None,
+    audit_store: InMemoryAuditStore | None = None,
+) -> tuple[int, dict[str, Any] | Iterator[dict[str, Any]]]:
+    """Framework-agnostic handler for POST /api/v1/audits/batch.
+
+    Validation errors return the usual error envelope. Otherwise the response is
+    an iterator of records: a `batch` header, one `result` per source in
+    completion order (failures included), and a closing cross-source `summary`.
+    """
+    payload, error = parse_json_body(request_body)
+    if error is not None:
+        return error
+
+    entries = payload.get("sources") if isinstance(payload, dict) else None
+    if not isinstance(entries, list) or not entries:
+        return error_response(
+            status_code=400,
+            code="invalid_batch",
+            message="Request body must contain a non-empty `sources` array.",
+        )
+    if len(entries) > MAX_BATCH_SOURCES:
+        return error_response(
+            status_code=400,
+            code="batch_too_large",
+            message=f"A batch can audit at most {MAX_BATCH_SOURCES} sources.",
+            details={"max_sources": MAX_BATCH_SOURCES, "source_count": len(entries)},
+        )
+
+    pool = pool if pool is not None else DEFAULT_BATCH_POOL
+    store = import_store if import_store is not None else DEFAULT_IMPORT_STORE
+    rejected: list[dict[str, Any]] = []
+    futures: dict[Future, tuple[int, str]] = {}
+    for position, entry in enumerate(entries):
+        source_id, body, error = _resolve_entry(position, entry, store)
+        if error is not None:
+            rejected.append(_result_record(position, source_id, *error))
+            continue
+        futures[pool.submit(_run_source_audit, source_id, body)] = (position, source_id)
+
+    records = _stream_batch(
+        str(uuid4()),
+        len(entries),
+        rejected,
+        futures,
+        audit_store if audit_store is not None else DEFAULT_AUDIT_STORE,
+    )
+    return 200, records
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator
+
+from .error_envelope import error_response
+
+DEFAULT_CPU_WORKERS = int(os.environ.get("QADMS_CPU_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+DEFAULT_CPU_QUEUE_DEPTH = int(os.environ.get("QADMS_CPU_QUEUE_DEPTH", "64"))
+# Streamed records are pulled from the handler's iterator in batches, one executor task per batch.
+STREAM_BATCH_SIZE = 64
+
+
+class ExecutorSaturated(Exception):
+    def __init__(self, max_queue_depth: int) -> None:
+        super().__init__("Server is busy with CPU-heavy requests. Retry later.")
+        self.max_queue_depth = max_queue_depth
+
+    def response(self) -> tuple[int, dict[str, Any]]:
+        return error_response(
+            status_code=429,
+            code="server_busy",
+            message=str(self),
+            details={"max_queue_depth": self.max_queue_depth},
+        )
+
+
+_gc_pause_lock = threading.Lock()
+_gc_pauses = 0
+_gc_was_enabled = False
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Hold off cyclic garbage collection for a short burst of allocation.
+
+    Work that builds a few hundred thousand objects which all live until the
+    response is returned sets off full collections that rescan the whole heap
+    and free nothing. Reference counting still reclaims everything acyclic.
+    Pauses nest and overlap across threads: the collector comes back when the
+    last one ends, and only if it was enabled when the first one began.
+    """
+    global _gc_pauses, _gc_was_enabled
+    with _gc_pause_lock:
+        if _gc_pauses == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_pause_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+def _next_batch(iterator: Iterable[Any], size: int) -> list[Any]:
+    batch = []
+    for item in iterator:
+        batch.append(item)
+        if len(batch) >= size:
+            break
+    return batch
+
+
+class CpuExecutor:
+    """Bounded thread pool for the CPU-heavy part of requests, kept off the event loop.
+
+    Normalization, rule evaluation and pixel diffs run here instead of on
+    Starlette's shared thread pool, so cheap routes served inline on the event
+    loop never wait behind them. At most `max_workers` tasks run and
+    `max_queue_depth` more wait; beyond that `run` raises `ExecutorSaturated`.
+    Streams that were admitted keep pulling batches regardless of the bound.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = DEFAULT_CPU_WORKERS,
+        max_queue_depth: int = DEFAULT_CPU_QUEUE_DEPTH,
+        executor_factory: Callable[[], Executor] | None = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self._executor_factory = executor_factory or self._default_executor
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_seconds = 0.0
+
+    def _default_executor(self) -> Executor:
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="qadms-cpu")
+
+    def submit(self, fn: Callable[..., Any], *args: Any, bounded: bool = True, **kwargs: Any) -> Future:
+        with self._lock:
+            if bounded and self.queued + self.running >= self.max_workers + self.max_queue_depth:
+                self.rejected += 1
+                raise ExecutorSaturated(self.max_queue_depth)
+            if self._executor is None:
+                self._executor = self._executor_factory()
+            self.queued += 1
+            future = self._executor.submit(self._call, time.perf_counter(), fn, args, kwargs)
+        future.add_done_callback(self._on_done)
+        return future
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    async def iterate(self, iterator: Iterable[Any], batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[Any]:
+        """Drive a lazy, CPU-heavy iterator on the pool and yield its items on the event loop."""
+        iterator = iter(iterator)
+        future: Future | None = None
+        try:
+            while True:
+                future = self.submit(_next_batch, iterator, batch_size, bounded=False)
+                batch = await asyncio.wrap_future(future)
+                if not batch:
+                    return
+                for item in batch:
+                    yield item
+        finally:
+            # A disconnected client closes the generator; its cleanup must not overlap a running pull.
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                if future is not None and not future.done():
+                    future.add_done_callback(lambda _: close())
+                else:
+                    close()
+
+    def _call(self, submitted_at: float, fn: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.queue_wait_seconds += time.perf_counter() - submitted_at
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def _on_done(self, future: Future) -> None:
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+DEFAULT_CPU_EXECUTOR = CpuExecutor()
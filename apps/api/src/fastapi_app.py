@@ -1,28 +1,150 @@
 from __future__ import annotations
 
-import json
+from contextlib import asynccontextmanager
+from typing import Any, Callable
 
-from .figma_import_endpoint import post_tokens_import_figma
+from packages.rules.registry import DEFAULT_RULE_REGISTRY
+from packages.rules.token_values import DEFAULT_COLOR_CACHE
+
+from .audit_cache import DEFAULT_AUDIT_CACHE
+from .audit_job_endpoint import get_audit_job, post_rule_audit_job
+from .audit_jobs import DEFAULT_AUDIT_JOB_QUEUE
+from .audit_store import DEFAULT_DELTA_STATE_STORE
+from .batch_audit_endpoint import DEFAULT_BATCH_POOL, post_batch_audit
+from .cpu_executor import DEFAULT_CPU_EXECUTOR, ExecutorSaturated
+from .figma_import_endpoint import post_tokens_import_figma, post_tokens_import_figma_modes
+from .instrumentation import DEFAULT_METRICS, PROMETHEUS_CONTENT_TYPE
 from .llm_contract_endpoints import post_violation_explain, post_violation_fix_suggest
-from .rule_audit_endpoint import post_rule_audit, post_rule_report
+from .mode_audit_endpoint import post_rule_mode_audit
+from .request_limits import DEFAULT_REQUEST_LIMITS, LimitExceeded
+from .rule_audit_endpoint import post_rule_audit, post_rule_audit_stream, post_rule_report, post_rule_report_stream
 from .storybook_endpoint import post_storybook_source_import
+from .streaming import NDJSON_MEDIA_TYPE, encode_json, iter_ndjson
+from .version_diff_endpoint import get_version_diff
+from .violations_query_endpoint import get_audit_violations
 from .visual_diff_endpoint import post_visual_diff_audit
 
 try:
-    from fastapi import Body, FastAPI, Path
+    from fastapi import FastAPI, Path, Query, Request
     from fastapi.middleware.cors import CORSMiddleware
-    from fastapi.responses import JSONResponse
+    from fastapi.responses import Response, StreamingResponse
 except ImportError:  # pragma: no cover - optional runtime dependency
-    Body = FastAPI = Path = CORSMiddleware = JSONResponse = None
+    FastAPI = Path = Query = Request = CORSMiddleware = None
+    Response = StreamingResponse = None
+
+
+def _json_body(description: str) -> dict[str, Any]:
+    """OpenAPI request body for routes that read raw bytes instead of a parsed `Body(...)`."""
+    return {
+        "requestBody": {
+            "required": True,
+            "description": description,
+            "content": {"application/json": {"schema": {"type": "object"}}},
+        }
+    }
+
+
+def _json_response(status_code: int, content: dict[str, Any], timed: bool = False) -> "Response":
+    # Encoded by the contracts serializer (orjson when installed) instead of Starlette's stdlib json.
+    # Audit routes pass `timed` so encoding shows up as the `serialize` stage in /metrics.
+    body = encode_json(content, DEFAULT_METRICS if timed else None)
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+async def _read_body(request: "Request") -> tuple[bytes, "Response | None"]:
+    """Read the body chunk by chunk and stop at the size cap instead of buffering an oversized upload."""
+    limits = DEFAULT_REQUEST_LIMITS
+    try:
+        declared = request.headers.get("content-length")
+        if declared is not None and declared.isdigit():
+            limits.check_body_size(int(declared))
+        chunks: list[bytes] = []
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            limits.check_body_size(size)
+            chunks.append(chunk)
+    except LimitExceeded as exc:
+        return b"", _json_response(*exc.response())
+    return b"".join(chunks), None
+
+
+def _rule_ids(rules: str | None) -> list[str] | None:
+    if rules is None:
+        return None
+    return [rule_id.strip() for rule_id in rules.split(",") if rule_id.strip()]
+
+
+def _wants_ndjson(request: "Request") -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def _offload(handler: Callable[..., tuple[int, Any]], **kwargs: Any) -> tuple[int, Any]:
+    """Run a CPU-heavy handler on the bounded CPU executor; a full queue becomes a 429 envelope."""
+    try:
+        return await DEFAULT_CPU_EXECUTOR.run(handler, **kwargs)
+    except ExecutorSaturated as exc:
+        return exc.response()
+
+
+def _stream_or_json(status_code: int, response: Any, offload: bool = True) -> "Response":
+    if isinstance(response, dict):
+        return _json_response(status_code, response, timed=True)
+    chunks = iter_ndjson(response, DEFAULT_METRICS)
+    # Audit streams evaluate rules as records are pulled, so they are driven on the CPU executor. Batch
+    # streams only wait on worker processes and stay on Starlette's pool rather than hold a CPU thread.
+    body = DEFAULT_CPU_EXECUTOR.iterate(chunks) if offload else chunks
+    return StreamingResponse(body, status_code=status_code, media_type=NDJSON_MEDIA_TYPE)
+
+
+def _register_runtime_metrics() -> None:
+    gauges = (
+        ("qadms_audit_cache_entries", "Entries in the audit result cache.", lambda: len(DEFAULT_AUDIT_CACHE)),
+        ("qadms_audit_cache_bytes", "Encoded bytes held by the audit result cache.", lambda: DEFAULT_AUDIT_CACHE.size_bytes),
+        ("qadms_audit_jobs_pending", "Background audit jobs queued or running.", lambda: DEFAULT_AUDIT_JOB_QUEUE.pending),
+        ("qadms_delta_audit_sources", "Sources holding delta audit state.", lambda: len(DEFAULT_DELTA_STATE_STORE)),
+        ("qadms_cpu_executor_workers", "Threads in the CPU executor.", lambda: DEFAULT_CPU_EXECUTOR.max_workers),
+        ("qadms_cpu_executor_queued", "CPU executor tasks waiting for a thread.", lambda: DEFAULT_CPU_EXECUTOR.queued),
+        ("qadms_cpu_executor_running", "CPU executor tasks running.", lambda: DEFAULT_CPU_EXECUTOR.running),
+    )
+    counters = (
+        ("qadms_audit_cache_hits_total", "Audit result cache hits.", lambda: DEFAULT_AUDIT_CACHE.hits),
+        ("qadms_audit_cache_misses_total", "Audit result cache misses.", lambda: DEFAULT_AUDIT_CACHE.misses),
+        ("qadms_color_cache_hits_total", "Color literal cache hits.", lambda: DEFAULT_COLOR_CACHE.hits),
+        ("qadms_color_cache_misses_total", "Color literal cache misses.", lambda: DEFAULT_COLOR_CACHE.misses),
+        ("qadms_cpu_executor_completed_total", "CPU executor tasks finished.", lambda: DEFAULT_CPU_EXECUTOR.completed),
+        (
+            "qadms_cpu_executor_rejected_total",
+            "Requests shed because the CPU executor queue was full.",
+            lambda: DEFAULT_CPU_EXECUTOR.rejected,
+        ),
+        (
+            "qadms_cpu_executor_queue_wait_seconds_total",
+            "Time CPU executor tasks spent queued.",
+            lambda: DEFAULT_CPU_EXECUTOR.queue_wait_seconds,
+        ),
+    )
+    for name, help_text, read in gauges:
+        DEFAULT_METRICS.register_gauge(name, help_text, read)
+    for name, help_text, read in counters:
+        DEFAULT_METRICS.register_counter(name, help_text, read)
 
 
 def create_app() -> "FastAPI":
-    if FastAPI is None or JSONResponse is None or CORSMiddleware is None:
+    if FastAPI is None or Response is None or CORSMiddleware is None:
         raise RuntimeError(
             "fastapi is not installed. Install fastapi and uvicorn to run the HTTP API wrapper."
         )
 
-    app = FastAPI(title="QADMS API", version="0.1.0")
+    @asynccontextmanager
+    async def lifespan(_: "FastAPI"):
+        yield
+        DEFAULT_AUDIT_JOB_QUEUE.shutdown(wait=False)
+        DEFAULT_BATCH_POOL.shutdown(wait=False)
+        DEFAULT_RULE_REGISTRY.shutdown(wait=False)
+        DEFAULT_CPU_EXECUTOR.shutdown(wait=False)
+
+    app = FastAPI(title="QADMS API", version="0.1.0", lifespan=lifespan)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -30,85 +152,237 @@ def create_app() -> "FastAPI":
         allow_headers=["*"],
     )
 
+    _register_runtime_metrics()
+
     @app.get("/health")
-    def health() -> dict[str, str]:
+    async def health() -> dict[str, str]:
         return {"status": "ok"}
 
-    @app.post("/api/v1/sources/{source_id}/tokens/import/figma")
-    def import_figma_tokens(
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> "Response":
+        return Response(content=DEFAULT_METRICS.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    @app.post(
+        "/api/v1/sources/{source_id}/tokens/import/figma",
+        openapi_extra=_json_body("Figma/Tokens Studio export JSON"),
+    )
+    async def import_figma_tokens(
+        request: Request,
         source_id: str = Path(..., description="Design source identifier"),
-        payload: dict = Body(..., description="Figma/Tokens Studio export JSON"),
-    ) -> JSONResponse:
-        status_code, response = post_tokens_import_figma(
-            source_id=source_id,
-            request_body=json.dumps(payload).encode("utf-8"),
+    ) -> "Response":
+        request_body, rejected = await _read_body(request)
+        if rejected is not None:
+            return rejected
+        status_code, response = await _offload(
+            post_tokens_import_figma, source_id=source_id, request_body=request_body
         )
-        return JSONResponse(status_code=status_code, content=response)
+        return _json_response(status_code, response)
 
-    @app.post("/api/v1/sources/{source_id}/audits/rules")
-    def run_rule_audit(
+    @app.post(
+        "/api/v1/sources/{source_id}/tokens/import/figma/modes",
+        openapi_extra=_json_body("`base` export plus per-mode override exports under `modes`"),
+    )
+    async def import_figma_token_modes(
+        request: Request,
         source_id: str = Path(..., description="Design source identifier"),
-        payload: dict = Body(..., description="Figma/Tokens Studio export JSON"),
-    ) -> JSONResponse:
-        status_code, response = post_rule_audit(
-            source_id=source_id,
-            request_body=json.dumps(payload).encode("utf-8"),
+    ) -> "Response":
+        request_body, rejected = await _read_body(request)
+        if rejected is not None:
+            return rejected
+        status_code, response = await _offload(
+            post_tokens_import_figma_modes, source_id=source_id, request_body=request_body
         )
-        return JSONResponse(status_code=status_code, content=response)
+        return _json_response(status_code, response)
 
-    @app.post("/api/v1/sources/{source_id}/audits/report")
-    def export_rule_report(
+    @app.post(
+        "/api/v1/sources/{source_id}/audits/rules",
+        openapi_extra=_json_body("Figma/Tokens Studio export JSON"),
+    )
+    async def run_rule_audit(
+        request: Request,
         source_id: str = Path(..., description="Design source identifier"),
-        payload: dict = Body(..., description="Figma/Tokens Studio export JSON"),
-    ) -> JSONResponse:
-        status_code, response = post_rule_report(
-            source_id=source_id,
-            request_body=json.dumps(payload).encode("utf-8"),
+        run_async: bool = Query(False, alias="async", description="Enqueue the audit and return a job id"),
+        timings: bool = Query(False, description="Include per-stage and per-rule timings in the response"),
+        mode: str = Query("full", description="`full`, or `delta` to re-run only rule scopes changed since the last delta audit"),
+        rules: str | None = Query(None, description="Comma-separated rule ids to run; defaults to every rule"),
+    ) -> "Response":
+        request_body, rejected = await _read_body(request)
+        if rejected is not None:
+            return rejected
+        if _wants_ndjson(request) and not run_async and mode == "full":
+            status_code, response = await _offload(
+                post_rule_audit_stream, source_id=source_id, request_body=request_body, rules=_rule_ids(rules)
+            )
+            return _stream_or_json(status_code, response)
+        if run_async:
+            status_code, response = post_rule_audit_job(
+                source_id=source_id,
+                request_body=request_body,
+                include_timings=timings,
+                mode=mode,
+                rules=_rule_ids(rules),
+            )
+        else:
+            status_code, response = await _offload(
+                post_rule_audit,
+                source_id=source_id,
+                request_body=request_body,
+                include_timings=timings,
+                mode=mode,
+                rules=_rule_ids(rules),
+            )
+        return _json_response(status_code, response, timed=True)
+
+    @app.post(
+        "/api/v1/audits/batch",
+        openapi_extra=_json_body("`sources` array of `{source_id, payload}` or `{source_id, version_id}` entries"),
+    )
+    async def run_batch_audit(request: Request) -> "Response":
+        request_body, rejected = await _read_body(request)
+        if rejected is not None:
+            return rejected
+        status_code, response = await _offload(post_batch_audit, request_body=request_body)
+        return _stream_or_json(status_code, response, offload=False)
+
+    @app.get("/api/v1/jobs/{job_id}")
+    async def get_rule_audit_job(
+        job_id: str = Path(..., description="Audit job identifier"),
+    ) -> "Response":
+        status_code, response = get_audit_job(job_id=job_id)
+        return _json_response(status_code, response)
+
+    @app.get("/api/v1/sources/{source_id}/versions/{from_version_id}/diff/{to_version_id}")
+    async def diff_token_versions(
+        source_id: str = Path(..., description="Design source identifier"),
+        from_version_id: str = Path(..., description="Base token version"),
+        to_version_id: str = Path(..., description="Token version compared against the base"),
+    ) -> "Response":
+        status_code, response = await _offload(
+            get_version_diff, source_id=source_id, from_version_id=from_version_id, to_version_id=to_version_id
         )
-        return JSONResponse(status_code=status_code, content=response)
+        return _json_response(status_code, response)
 
-    @app.post("/api/v1/sources/{source_id}/storybook/import")
-    def import_storybook_source(
+    @app.get("/api/v1/sources/{source_id}/audits/{audit_id}/violations")
+    async def list_audit_violations(
         source_id: str = Path(..., description="Design source identifier"),
-        payload: dict = Body(..., description="Storybook source metadata and component stories"),
-    ) -> JSONResponse:
-        status_code, response = post_storybook_source_import(
+        audit_id: str = Path(..., description="Audit identifier returned by the rule audit"),
+        severity: str | None = Query(None, description="Comma-separated severities"),
+        category: str | None = Query(None, description="Comma-separated categories"),
+        rule_id: str | None = Query(None, description="Comma-separated rule ids"),
+        code: str | None = Query(None, description="Comma-separated violation codes"),
+        path_prefix: str | None = Query(None, description="Token path prefix, e.g. `color.text`"),
+        q: str | None = Query(None, description="Full-text search over titles, descriptions and paths"),
+        cursor: str | None = Query(None, description="Opaque cursor from a previous page"),
+        limit: str | None = Query(None, description="Page size (1-500, default 50)"),
+    ) -> "Response":
+        query = {
+            "severity": severity,
+            "category": category,
+            "rule_id": rule_id,
+            "code": code,
+            "path_prefix": path_prefix,
+            "q": q,
+            "cursor": cursor,
+            "limit": limit,
+        }
+        status_code, response = get_audit_violations(
             source_id=source_id,
-            request_body=json.dumps(payload).encode("utf-8"),
+            audit_id=audit_id,
+            query={key: value for key, value in query.items() if value is not None},
         )
-        return JSONResponse(status_code=status_code, content=response)
+        return _json_response(status_code, response)
 
-    @app.post("/api/v1/sources/{source_id}/audits/visual-diff")
-    def run_visual_diff_audit(
+    @app.post(
+        "/api/v1/sources/{source_id}/audits/modes",
+        openapi_extra=_json_body("`base` export plus per-mode override exports under `modes`"),
+    )
+    async def run_rule_mode_audit(
+        request: Request,
         source_id: str = Path(..., description="Design source identifier"),
-        payload: dict = Body(..., description="Visual diff baseline/current snapshot references"),
-    ) -> JSONResponse:
-        status_code, response = post_visual_diff_audit(
-            source_id=source_id,
-            request_body=json.dumps(payload).encode("utf-8"),
+        rules: str | None = Query(None, description="Comma-separated rule ids to run; defaults to every rule"),
+    ) -> "Response":
+        request_body, rejected = await _read_body(request)
+        if rejected is not None:
+            return rejected
+        status_code, response = await _offload(
+            post_rule_mode_audit, source_id=source_id, request_body=request_body, rules=_rule_ids(rules)
         )
-        return JSONResponse(status_code=status_code, content=response)
+        return _json_response(status_code, response, timed=True)
 
-    @app.post("/api/v1/sources/{source_id}/violations/explain")
-    def explain_violation(
+    @app.post(
+        "/api/v1/sources/{source_id}/audits/report",
+        openapi_extra=_json_body("Figma/Tokens Studio export JSON"),
+    )
+    async def export_rule_report(
+        request: Request,
         source_id: str = Path(..., description="Design source identifier"),
-        payload: dict = Body(..., description="Violation payload for LLM explanation contract"),
-    ) -> JSONResponse:
-        status_code, response = post_violation_explain(
-            source_id=source_id,
-            request_body=json.dumps(payload).encode("utf-8"),
+        rules: str | None = Query(None, description="Comma-separated rule ids to run; defaults to every rule"),
+    ) -> "Response":
+        request_body, rejected = await _read_body(request)
+        if rejected is not None:
+            return rejected
+        handler = post_rule_report_stream if _wants_ndjson(request) else post_rule_report
+        status_code, response = await _offload(
+            handler, source_id=source_id, request_body=request_body, rules=_rule_ids(rules)
         )
-        return JSONResponse(status_code=status_code, content=response)
+        return _stream_or_json(status_code, response)
 
-    @app.post("/api/v1/sources/{source_id}/violations/fix-suggest")
-    def suggest_violation_fix(
+    @app.post(
+        "/api/v1/sources/{source_id}/storybook/import",
+        openapi_extra=_json_body("Storybook source metadata and component stories"),
+    )
+    async def import_storybook_source(
+        request: Request,
         source_id: str = Path(..., description="Design source identifier"),
-        payload: dict = Body(..., description="Violation payload for LLM fix-suggestion contract"),
-    ) -> JSONResponse:
-        status_code, response = post_violation_fix_suggest(
-            source_id=source_id,
-            request_body=json.dumps(payload).encode("utf-8"),
+    ) -> "Response":
+        request_body, rejected = await _read_body(request)
+        if rejected is not None:
+            return rejected
+        status_code, response = post_storybook_source_import(source_id=source_id, request_body=request_body)
+        return _json_response(status_code, response)
+
+    @app.post(
+        "/api/v1/sources/{source_id}/audits/visual-diff",
+        openapi_extra=_json_body("Visual diff baseline/current snapshot references"),
+    )
+    async def run_visual_diff_audit(
+        request: Request,
+        source_id: str = Path(..., description="Design source identifier"),
+    ) -> "Response":
+        request_body, rejected = await _read_body(request)
+        if rejected is not None:
+            return rejected
+        status_code, response = await _offload(
+            post_visual_diff_audit, source_id=source_id, request_body=request_body
         )
-        return JSONResponse(status_code=status_code, content=response)
+        return _json_response(status_code, response)
+
+    @app.post(
+        "/api/v1/sources/{source_id}/violations/explain",
+        openapi_extra=_json_body("Violation payload for LLM explanation contract"),
+    )
+    async def explain_violation(
+        request: Request,
+        source_id: str = Path(..., description="Design source identifier"),
+    ) -> "Response":
+        request_body, rejected = await _read_body(request)
+        if rejected is not None:
+            return rejected
+        status_code, response = post_violation_explain(source_id=source_id, request_body=request_body)
+        return _json_response(status_code, response)
+
+    @app.post(
+        "/api/v1/sources/{source_id}/violations/fix-suggest",
+        openapi_extra=_json_body("Violation payload for LLM fix-suggestion contract"),
+    )
+    async def suggest_violation_fix(
+        request: Request,
+        source_id: str = Path(..., description="Design source identifier"),
+    ) -> "Response":
+        request_body, rejected = await _read_body(request)
+        if rejected is not None:
+            return rejected
+        status_code, response = post_violation_fix_suggest(source_id=source_id, request_body=request_body)
+        return _json_response(status_code, response)
 
     return app
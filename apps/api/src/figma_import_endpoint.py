@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 import hashlib
-import json
 from pathlib import Path
 from typing import Any
 
+from packages.contracts import CanonicalTokenModel
 from packages.rules.figma_adapter import normalize_figma_export
+from packages.rules.mode_tokens import ModePayloadError, ModeTokenSet, split_mode_payload
 
 from .error_envelope import error_response
 from .import_mapping import map_import_response
 from .persistence import DEFAULT_IMPORT_STORE, TokenImportStore
+from .request_limits import DEFAULT_REQUEST_LIMITS, LimitExceeded, RequestLimits, parse_json_body
 
 OPENAPI_CONTRACT_PATH = Path(__file__).resolve().parents[1] / "contracts" / "figma-import.openapi.yaml"
 
@@ -18,6 +20,7 @@ def post_tokens_import_figma(
     source_id: str,
     request_body: bytes,
     import_store: TokenImportStore | None = None,
+    limits: RequestLimits | None = None,
 ) -> tuple[int, dict[str, Any]]:
     """Framework-agnostic handler for POST /api/v1/sources/{source_id}/tokens/import/figma."""
     if not source_id or not source_id.strip():
@@ -27,17 +30,14 @@ def post_tokens_import_figma(
             message="Path parameter `source_id` must be a non-empty string.",
         )
 
-    try:
-        payload = json.loads(request_body.decode("utf-8"))
-    except (UnicodeDecodeError, json.JSONDecodeError):
-        return error_response(
-            status_code=400,
-            code="invalid_json",
-            message="Request body must be valid UTF-8 JSON.",
-        )
+    limits = limits if limits is not None else DEFAULT_REQUEST_LIMITS
+    payload, error = parse_json_body(request_body, limits)
+    if error is not None:
+        return error
 
     try:
         token_version, validation = normalize_figma_export(payload)
+        limits.check_tokens(len(token_version.tokens))
         storage = import_store or DEFAULT_IMPORT_STORE
         storage.upsert_source(source_id=source_id, source_type="figma")
 
@@ -48,6 +48,7 @@ def post_tokens_import_figma(
             token_source=token_version.source,
             token_counts=token_version.token_counts(),
             validation_valid=validation.valid,
+            tokens=token_version.tokens,
         )
 
         response = map_import_response(
@@ -58,6 +59,89 @@ def post_tokens_import_figma(
         )
         status_code = 200 if validation.valid else 422
         return status_code, response.to_dict()
+    except LimitExceeded as exc:
+        return exc.response()
+    except Exception:
+        return error_response(
+            status_code=500,
+            code="internal_error",
+            message="Unexpected server error while processing token import.",
+        )
+
+
+def post_tokens_import_figma_modes(
+    source_id: str,
+    request_body: bytes,
+    import_store: TokenImportStore | None = None,
+    limits: RequestLimits | None = None,
+) -> tuple[int, dict[str, Any]]:
+    """Framework-agnostic handler for POST /api/v1/sources/{source_id}/tokens/import/figma/modes.
+
+    Stores one token version per mode: the base export with that mode's
+    overrides merged in. The base is normalized once for every mode.
+    """
+    if not source_id or not source_id.strip():
+        return error_response(
+            status_code=400,
+            code="invalid_source_id",
+            message="Path parameter `source_id` must be a non-empty string.",
+        )
+
+    limits = limits if limits is not None else DEFAULT_REQUEST_LIMITS
+    payload, error = parse_json_body(request_body, limits)
+    if error is not None:
+        return error
+    try:
+        base, modes = split_mode_payload(payload)
+    except ModePayloadError as exc:
+        return error_response(status_code=400, code=exc.code, message=str(exc), details=exc.details)
+
+    try:
+        token_set = ModeTokenSet(base)
+        limits.check_tokens(len(token_set.tokens))
+        views = [token_set.apply(mode, overrides) for mode, overrides in modes.items()]
+        for view in views:
+            limits.check_tokens(len(view.model.tokens))
+        storage = import_store or DEFAULT_IMPORT_STORE
+        storage.upsert_source(source_id=source_id, source_type="figma")
+
+        results = []
+        for view in views:
+            valid = token_set.validation.valid and view.validation.valid
+            persisted_version = storage.create_token_version(
+                source_id=source_id,
+                input_format="figma_json_modes",
+                # Every mode comes from the same body, so the mode name keeps deduplicating stores apart.
+                input_sha256=hashlib.sha256(request_body + b"\0" + view.mode.encode("utf-8")).hexdigest(),
+                token_source=view.model.source,
+                token_counts=view.model.token_counts(),
+                validation_valid=valid,
+                tokens=view.model.tokens,
+            )
+            results.append(
+                {
+                    "mode": view.mode,
+                    "version_id": persisted_version.version_id,
+                    "imported_at": persisted_version.imported_at,
+                    "token_counts": persisted_version.token_counts,
+                    "override_count": view.override_count,
+                    "changed_token_count": len(view.changed_paths),
+                    "validation": view.validation.to_dict(),
+                }
+            )
+
+        response = {
+            "source_id": source_id,
+            "base": {
+                "token_counts": CanonicalTokenModel(source="figma_export", tokens=token_set.tokens).token_counts(),
+                "validation": token_set.validation.to_dict(),
+            },
+            "modes": results,
+        }
+        valid = token_set.validation.valid and all(view.validation.valid for view in views)
+        return (200 if valid else 422), response
+    except LimitExceeded as exc:
+        return exc.response()
     except Exception:
         return error_response(
             status_code=500,
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+# Histogram buckets (seconds) for stage wall time.
+WALL_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@dataclass
+class StageTiming:
+    stage: str
+    rule_id: str | None = None
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    token_count: int | None = None
+    violation_count: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {"stage": self.stage}
+        if self.rule_id is not None:
+            payload["rule_id"] = self.rule_id
+        payload["wall_ms"] = round(self.wall_seconds * 1000, 3)
+        payload["cpu_ms"] = round(self.cpu_seconds * 1000, 3)
+        if self.token_count is not None:
+            payload["token_count"] = self.token_count
+        if self.violation_count is not None:
+            payload["violation_count"] = self.violation_count
+        return payload
+
+
+@dataclass
+class AuditTimings:
+    """Stage-by-stage wall and CPU time for one audit.
+
+    CPU time is per thread, so concurrent requests on a thread pool do not
+    inflate each other's numbers. Rule stages can overlap, so the total wall
+    time is the time elapsed since the timings were created rather than the
+    sum of the stages.
+    """
+
+    stages: list[StageTiming] = field(default_factory=list)
+    cache_hit: bool = False
+    started_at: float = field(default_factory=time.perf_counter, repr=False)
+
+    @contextmanager
+    def stage(self, name: str, rule_id: str | None = None) -> Iterator[StageTiming]:
+        timing = StageTiming(stage=name, rule_id=rule_id)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield timing
+        finally:
+            timing.wall_seconds = time.perf_counter() - wall_start
+            timing.cpu_seconds = time.thread_time() - cpu_start
+            self.stages.append(timing)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "cache_hit": self.cache_hit,
+            "total_wall_ms": round((time.perf_counter() - self.started_at) * 1000, 3),
+            "total_cpu_ms": round(sum(stage.cpu_seconds for stage in self.stages) * 1000, 3),
+            "stages": [stage.to_dict() for stage in self.stages],
+        }
+
+
+@dataclass
+class _StageMetrics:
+    count: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    tokens: int = 0
+    violations: int = 0
+    buckets: list[int] = field(default_factory=lambda: [0] * len(WALL_TIME_BUCKETS))
+
+
+def _labels(**labels: str | None) -> str:
+    pairs = [f'{key}="{_escape_label(value)}"' for key, value in labels.items() if value is not None]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """Process-wide audit metrics rendered in the Prometheus text exposition format."""
+
+    def __init__(self) -> None:
+        self._stages: dict[tuple[str, str | None], _StageMetrics] = {}
+        self._audits: dict[str, int] = {"hit": 0, "miss": 0}
+        # name -> (Prometheus type, help text, reader); read when metrics are rendered.
+        self._readings: dict[str, tuple[str, str, Callable[[], float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe_audit(self, timings: AuditTimings) -> None:
+        with self._lock:
+            self._audits["hit" if timings.cache_hit else "miss"] += 1
+            for stage in timings.stages:
+                self._record_stage(stage)
+
+    def observe_stage(self, stage: StageTiming) -> None:
+        """Record a stage timed outside the audit handler, e.g. encoding the HTTP response."""
+        with self._lock:
+            self._record_stage(stage)
+
+    def _record_stage(self, stage: StageTiming) -> None:
+        metrics = self._stages.setdefault((stage.stage, stage.rule_id), _StageMetrics())
+        metrics.count += 1
+        metrics.wall_seconds += stage.wall_seconds
+        metrics.cpu_seconds += stage.cpu_seconds
+        metrics.tokens += stage.token_count or 0
+        metrics.violations += stage.violation_count or 0
+        for idx, bound in enumerate(WALL_TIME_BUCKETS):
+            if stage.wall_seconds <= bound:
+                metrics.buckets[idx] += 1
+
+    def register_gauge(self, name: str, help_text: str, read: Callable[[], float]) -> None:
+        """Add (or replace) a gauge whose value is read when metrics are rendered."""
+        with self._lock:
+            self._readings[name] = ("gauge", help_text, read)
+
+    def register_counter(self, name: str, help_text: str, read: Callable[[], float]) -> None:
+        """Add (or replace) a counter read from a monotonically increasing total, e.g. cache hits."""
+        if not name.endswith("_total"):
+            raise ValueError(f"Counter `{name}` must end in `_total`.")
+        with self._lock:
+            self._readings[name] = ("counter", help_text, read)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._audits = {"hit": 0, "miss": 0}
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            stages = sorted(self._stages.items(), key=lambda item: (item[0][0], item[0][1] or ""))
+            audits = dict(self._audits)
+            readings = sorted(self._readings.items())
+
+        lines = [
+            "# HELP qadms_audit_requests_total Rule audits served, by result cache outcome.",
+            "# TYPE qadms_audit_requests_total counter",
+        ]
+        lines.extend(f"qadms_audit_requests_total{_labels(cache=outcome)} {count}" for outcome, count in audits.items())
+
+        lines += [
+            "# HELP qadms_audit_stage_wall_seconds Wall time per audit stage and rule.",
+            "# TYPE qadms_audit_stage_wall_seconds histogram",
+        ]
+        for (stage, rule_id), metrics in stages:
+            for bound, count in zip(WALL_TIME_BUCKETS, metrics.buckets):
+                labels = _labels(stage=stage, rule_id=rule_id, le=_format_number(bound))
+                lines.append(f"qadms_audit_stage_wall_seconds_bucket{labels} {count}")
+            labels = _labels(stage=stage, rule_id=rule_id, le="+Inf")
+            lines.append(f"qadms_audit_stage_wall_seconds_bucket{labels} {metrics.count}")
+            labels = _labels(stage=stage, rule_id=rule_id)
+            lines.append(f"qadms_audit_stage_wall_seconds_sum{labels} {_format_number(metrics.wall_seconds)}")
+            lines.append(f"qadms_audit_stage_wall_seconds_count{labels} {metrics.count}")
+
+        for name, attribute, help_text in (
+            ("qadms_audit_stage_cpu_seconds_total", "cpu_seconds", "CPU time per audit stage and rule."),
+            ("qadms_audit_stage_tokens_total", "tokens", "Tokens processed per audit stage and rule."),
+            ("qadms_audit_stage_violations_total", "violations", "Violations produced per audit stage and rule."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (stage, rule_id), metrics in stages:
+                value = getattr(metrics, attribute)
+                lines.append(f"{name}{_labels(stage=stage, rule_id=rule_id)} {_format_number(value)}")
+
+        for name, (kind, help_text, read) in readings:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {_format_number(read())}"]
+        return "\n".join(lines) + "\n"
+
+
+DEFAULT_METRICS = MetricsRegistry()
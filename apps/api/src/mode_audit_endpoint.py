@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Sequence
+from uuid import uuid4
+
+from packages.rules.mode_tokens import ModePayloadError, ModeTokenSet, split_mode_payload
+
+from .audit_store import DEFAULT_AUDIT_STORE, InMemoryAuditStore, StoredAudit
+from .error_envelope import error_response
+from .instrumentation import DEFAULT_METRICS, AuditTimings, MetricsRegistry
+from .request_limits import DEFAULT_REQUEST_LIMITS, LimitExceeded, RequestLimits, parse_json_body
+from .rule_audit_endpoint import (
+    _build_violation_payload,
+    _normalization_summary,
+    _rule_selection_error,
+    _select_rules,
+    _sort_violations,
+    _summarize_violations,
+)
+
+
+def post_rule_mode_audit(
+    source_id: str,
+    request_body: bytes,
+    audit_store: InMemoryAuditStore | None = None,
+    metrics: MetricsRegistry | None = None,
+    rules: Sequence[str] | None = None,
+    limits: RequestLimits | None = None,
+) -> tuple[int, dict[str, Any]]:
+    """Framework-agnostic handler for POST /api/v1/sources/{source_id}/audits/modes.
+
+    The base export is normalized and audited once; each mode then re-runs
+    only the rule scopes its overrides touch. Every mode's audit is stored
+    under its own `audit_id` for the violations query.
+    """
+    if not source_id or not source_id.strip():
+        return error_response(
+            status_code=400,
+            code="invalid_source_id",
+            message="Path parameter `source_id` must be a non-empty string.",
+        )
+    rules_error = _rule_selection_error(rules)
+    if rules_error is not None:
+        return rules_error
+    limits = limits if limits is not None else DEFAULT_REQUEST_LIMITS
+    timings = AuditTimings()
+    with timings.stage("parse"):
+        payload, error = parse_json_body(request_body, limits)
+    if error is not None:
+        return error
+    try:
+        base, modes = split_mode_payload(payload)
+    except ModePayloadError as exc:
+        return error_response(status_code=400, code=exc.code, message=str(exc), details=exc.details)
+
+    evaluated_at = datetime.now(tz=timezone.utc).isoformat()
+    results: list[dict[str, Any]] = []
+    try:
+        with timings.stage("normalization") as stage:
+            token_set = ModeTokenSet(base)
+            stage.token_count = len(token_set.tokens)
+        limits.check_tokens(len(token_set.tokens))
+
+        evaluations = token_set.evaluate(modes, _select_rules(rules))
+        for mode in modes:
+            with timings.stage("mode") as stage:
+                evaluation = next(evaluations)
+                view = evaluation.view
+                limits.check_tokens(len(view.model.tokens))
+                violations: list[dict[str, Any]] = []
+                for rule_evaluation in evaluation.evaluations:
+                    limits.check_violations(len(violations) + len(rule_evaluation.violations))
+                    for violation in rule_evaluation.violations:
+                        violations.append(_build_violation_payload(rule_evaluation.rule_id, violation))
+                _sort_violations(violations)
+                stage.token_count = len(view.changed_paths)
+                stage.violation_count = len(violations)
+
+            results.append(
+                {
+                    "mode": mode,
+                    "audit_id": str(uuid4()),
+                    "override_count": view.override_count,
+                    "changed_token_count": len(view.changed_paths),
+                    "normalization": _normalization_summary(view.validation),
+                    "summary": _summarize_violations(violations),
+                    "violations": violations,
+                }
+            )
+    except LimitExceeded as exc:
+        return exc.response()
+    except Exception:
+        return error_response(
+            status_code=500,
+            code="internal_error",
+            message="Unexpected server error while running mode audit.",
+        )
+
+    (metrics if metrics is not None else DEFAULT_METRICS).observe_audit(timings)
+    store = audit_store if audit_store is not None else DEFAULT_AUDIT_STORE
+    for result in results:
+        store.save_audit(
+            StoredAudit(
+                source_id=source_id,
+                audit_id=result["audit_id"],
+                evaluated_at=evaluated_at,
+                violations=result["violations"],
+            )
+        )
+    return 200, {
+        "source_id": source_id,
+        "evaluated_at": evaluated_at,
+        "normalization": _normalization_summary(token_set.validation),
+        "summary": {
+            "mode_count": len(results),
+            "total_violations": sum(result["summary"]["total_violations"] for result in results),
+            "by_mode": {result["mode"]: result["summary"]["total_violations"] for result in results},
+        },
+        "modes": results,
+    }
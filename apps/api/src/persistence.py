@@ -1,10 +1,51 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from array import array
 from datetime import datetime, timezone
-from typing import Protocol
+from pathlib import Path
+from typing import Any, Hashable, Iterable, Iterator, Protocol, Sequence
 from uuid import uuid4
 
-from packages.contracts import SourceRecord, TokenVersionRecord
+from packages.contracts import CanonicalToken, SourceRecord, TokenVersionRecord
+from packages.contracts.serialization import loads
+
+# Tokens are stored once under a 128-bit BLAKE2b digest of their canonical encoding. A version's
+# manifest lists its tokens in path order: digests in memory, integer token ids in SQLite.
+TOKEN_DIGEST_SIZE = 16
+
+# The canonical encoding always uses the stdlib encoder, so digests do not depend on whether orjson
+# is installed. Sorted keys make object values that differ only in key order hash the same; NaN and
+# Infinity are refused rather than written as non-JSON literals or silently turned into null.
+_TOKEN_ENCODER = json.JSONEncoder(ensure_ascii=False, allow_nan=False, sort_keys=True, separators=(",", ":"))
+
+
+def encode_token(token: CanonicalToken) -> bytes:
+    return _TOKEN_ENCODER.encode(
+        [token.group, token.path, token.name, token.token_type, token.value, token.source]
+    ).encode("utf-8")
+
+
+def decode_token(data: bytes) -> CanonicalToken:
+    return CanonicalToken(*loads(data))
+
+
+def token_digest(encoded: bytes) -> bytes:
+    return hashlib.blake2b(encoded, digest_size=TOKEN_DIGEST_SIZE).digest()
+
+
+def split_manifest(manifest: bytes) -> list[bytes]:
+    return [manifest[offset : offset + TOKEN_DIGEST_SIZE] for offset in range(0, len(manifest), TOKEN_DIGEST_SIZE)]
+
+
+def _unpack_manifest(manifest: bytes) -> array:
+    token_ids = array("q")
+    token_ids.frombytes(manifest)
+    return token_ids
 
 
 class TokenImportStore(Protocol):
@@ -20,8 +61,24 @@ class TokenImportStore(Protocol):
         token_source: str,
         token_counts: dict[str, int],
         validation_valid: bool,
+        tokens: Sequence[CanonicalToken] | None = None,
     ) -> TokenVersionRecord:
-        """Create and return a persisted token version record."""
+        """Create and return a persisted token version record, storing its canonical `tokens` when given."""
+
+    def get_version(self, version_id: str) -> TokenVersionRecord | None:
+        """Return a token version record by id, if present."""
+
+    def get_version_tokens(self, version_id: str) -> list[CanonicalToken] | None:
+        """Return a version's canonical tokens in path order, or None when they were not stored."""
+
+    def get_version_manifest(self, version_id: str) -> Sequence[Hashable] | None:
+        """Return opaque per-token keys in path order; equal keys mean identical tokens."""
+
+    def get_tokens_by_key(self, keys: Iterable[Hashable]) -> dict[Hashable, CanonicalToken]:
+        """Return the tokens for manifest keys from `get_version_manifest`."""
+
+    def list_versions_for_source(self, source_id: str) -> list[TokenVersionRecord]:
+        """Return a source's token versions, oldest first."""
 
 
 class InMemoryTokenImportStore:
@@ -29,7 +86,11 @@ class InMemoryTokenImportStore:
 
     def __init__(self) -> None:
         self._sources: dict[str, SourceRecord] = {}
-        self._versions: list[TokenVersionRecord] = []
+        self._versions: dict[str, TokenVersionRecord] = {}
+        self._versions_by_source: dict[str, list[TokenVersionRecord]] = {}
+        # Content-addressed: versions that share a token share the object.
+        self._tokens: dict[bytes, CanonicalToken] = {}
+        self._manifests: dict[str, bytes] = {}
 
     @staticmethod
     def _now_iso() -> str:
@@ -60,6 +121,7 @@ class InMemoryTokenImportStore:
         token_source: str,
         token_counts: dict[str, int],
         validation_valid: bool,
+        tokens: Sequence[CanonicalToken] | None = None,
     ) -> TokenVersionRecord:
         record = TokenVersionRecord(
             version_id=str(uuid4()),
@@ -71,11 +133,348 @@ class InMemoryTokenImportStore:
             token_counts=dict(token_counts),
             validation_valid=validation_valid,
         )
-        self._versions.append(record)
+        self._versions[record.version_id] = record
+        self._versions_by_source.setdefault(source_id, []).append(record)
+        if tokens is not None:
+            digests = []
+            for token in tokens:
+                digest = token_digest(encode_token(token))
+                self._tokens.setdefault(digest, token)
+                digests.append(digest)
+            self._manifests[record.version_id] = b"".join(digests)
         return record
 
+    def get_version(self, version_id: str) -> TokenVersionRecord | None:
+        return self._versions.get(version_id)
+
+    def get_version_tokens(self, version_id: str) -> list[CanonicalToken] | None:
+        digests = self.get_version_manifest(version_id)
+        if digests is None:
+            return None
+        return [self._tokens[digest] for digest in digests]
+
+    def get_version_manifest(self, version_id: str) -> list[bytes] | None:
+        manifest = self._manifests.get(version_id)
+        return split_manifest(manifest) if manifest is not None else None
+
+    def get_tokens_by_key(self, keys: Iterable[bytes]) -> dict[bytes, CanonicalToken]:
+        return {digest: self._tokens[digest] for digest in keys}
+
     def list_versions_for_source(self, source_id: str) -> list[TokenVersionRecord]:
-        return [version for version in self._versions if version.source_id == source_id]
+        return list(self._versions_by_source.get(source_id, []))
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS design_sources (
+    source_id TEXT PRIMARY KEY,
+    source_type TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_design_sources_updated_at ON design_sources (updated_at);
+
+CREATE TABLE IF NOT EXISTS token_source_versions (
+    version_id TEXT PRIMARY KEY,
+    source_id TEXT NOT NULL REFERENCES design_sources (source_id),
+    imported_at TEXT NOT NULL,
+    input_format TEXT NOT NULL,
+    input_sha256 TEXT NOT NULL,
+    token_source TEXT NOT NULL,
+    token_counts TEXT NOT NULL,
+    validation_valid INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_token_source_versions_source_imported
+    ON token_source_versions (source_id, imported_at DESC);
+CREATE INDEX IF NOT EXISTS idx_token_source_versions_valid ON token_source_versions (validation_valid);
+
+CREATE TABLE IF NOT EXISTS canonical_tokens (
+    token_id INTEGER PRIMARY KEY,
+    token_hash BLOB NOT NULL UNIQUE,
+    token BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS token_version_manifests (
+    version_id TEXT PRIMARY KEY REFERENCES token_source_versions (version_id),
+    token_count INTEGER NOT NULL,
+    manifest BLOB NOT NULL
+);
+"""
+
+SQLITE_DEDUPE_INDEX = """
+CREATE UNIQUE INDEX IF NOT EXISTS uq_token_source_versions_source_sha
+    ON token_source_versions (source_id, input_sha256);
+"""
+
+# Manifest ids closer than this are read with one range scan; the rows in between are skipped.
+_MANIFEST_RANGE_GAP = 256
+
+_VERSION_COLUMNS = (
+    "version_id, source_id, imported_at, input_format, input_sha256, token_source, token_counts, validation_valid"
+)
+
+
+class SqliteTokenImportStore:
+    """Durable `TokenImportStore` backed by SQLite using the persistence contract schema.
+
+    Runs in WAL mode with one connection per thread so concurrent readers do not
+    block the writer. With `dedupe=True`, re-importing the same bytes for a source
+    returns the existing version instead of creating a new one.
+    """
+
+    def __init__(self, db_path: str | Path, *, dedupe: bool = False) -> None:
+        self.db_path = str(db_path)
+        self.dedupe = dedupe
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        connection = self._connection()
+        with connection:
+            connection.executescript(SQLITE_SCHEMA)
+            if dedupe:
+                connection.executescript(SQLITE_DEDUPE_INDEX)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def close(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    @staticmethod
+    def _now_iso() -> str:
+        return datetime.now(tz=timezone.utc).isoformat()
+
+    @staticmethod
+    def _row_to_version(row: tuple[Any, ...]) -> TokenVersionRecord:
+        return TokenVersionRecord(
+            version_id=row[0],
+            source_id=row[1],
+            imported_at=row[2],
+            input_format=row[3],
+            input_sha256=row[4],
+            token_source=row[5],
+            token_counts=json.loads(row[6]),
+            validation_valid=bool(row[7]),
+        )
+
+    def upsert_source(self, source_id: str, source_type: str = "figma") -> SourceRecord:
+        now = self._now_iso()
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT INTO design_sources (source_id, source_type, created_at, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (source_id) DO UPDATE SET updated_at = excluded.updated_at",
+                (source_id, source_type, now, now),
+            )
+            row = connection.execute(
+                "SELECT source_id, source_type, created_at, updated_at FROM design_sources WHERE source_id = ?",
+                (source_id,),
+            ).fetchone()
+        return SourceRecord(source_id=row[0], source_type=row[1], created_at=row[2], updated_at=row[3])
+
+    def create_token_version(
+        self,
+        *,
+        source_id: str,
+        input_format: str,
+        input_sha256: str,
+        token_source: str,
+        token_counts: dict[str, int],
+        validation_valid: bool,
+        tokens: Sequence[CanonicalToken] | None = None,
+    ) -> TokenVersionRecord:
+        return self.create_token_versions(
+            [
+                {
+                    "source_id": source_id,
+                    "input_format": input_format,
+                    "input_sha256": input_sha256,
+                    "token_source": token_source,
+                    "token_counts": token_counts,
+                    "validation_valid": validation_valid,
+                    "tokens": tokens,
+                }
+            ]
+        )[0]
+
+    def create_token_versions(self, versions: Iterable[dict[str, Any]]) -> list[TokenVersionRecord]:
+        """Insert many version records in a single transaction (sources must already exist).
+
+        Versions with a `tokens` entry also get a manifest; only tokens not
+        already stored are written, so near-identical versions cost little more
+        than their manifests.
+        """
+        versions = list(versions)
+        records = [
+            TokenVersionRecord(
+                version_id=str(uuid4()),
+                source_id=version["source_id"],
+                imported_at=self._now_iso(),
+                input_format=version["input_format"],
+                input_sha256=version["input_sha256"],
+                token_source=version["token_source"],
+                token_counts=dict(version["token_counts"]),
+                validation_valid=bool(version["validation_valid"]),
+            )
+            for version in versions
+        ]
+        verb = "INSERT OR IGNORE" if self.dedupe else "INSERT"
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                f"{verb} INTO token_source_versions ({_VERSION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        record.version_id,
+                        record.source_id,
+                        record.imported_at,
+                        record.input_format,
+                        record.input_sha256,
+                        record.token_source,
+                        json.dumps(record.token_counts, sort_keys=True),
+                        int(record.validation_valid),
+                    )
+                    for record in records
+                ],
+            )
+            if self.dedupe:
+                records = [self._find_by_hash(record.source_id, record.input_sha256) or record for record in records]
+            for record, version in zip(records, versions):
+                if version.get("tokens") is not None:
+                    self._save_manifest(connection, record, version["tokens"])
+        return records
+
+    def _save_manifest(
+        self, connection: sqlite3.Connection, record: TokenVersionRecord, tokens: Sequence[CanonicalToken]
+    ) -> None:
+        """Store the tokens this database has not seen and the version's manifest of token ids.
+
+        Digests of the source's previous version are loaded with range scans,
+        so a near-identical import only inserts or looks up the tokens that
+        changed.
+        """
+        exists = connection.execute(
+            "SELECT 1 FROM token_version_manifests WHERE version_id = ?", (record.version_id,)
+        ).fetchone()
+        if exists:
+            return  # A deduplicated re-import; the existing version already has its manifest.
+
+        known = self._previous_token_ids(connection, record)
+        token_ids = array("q")
+        for token in tokens:
+            encoded = encode_token(token)
+            digest = token_digest(encoded)
+            token_id = known.get(digest)
+            if token_id is None:
+                cursor = connection.execute(
+                    "INSERT OR IGNORE INTO canonical_tokens (token_hash, token) VALUES (?, ?)", (digest, encoded)
+                )
+                if cursor.rowcount:
+                    token_id = cursor.lastrowid
+                else:
+                    token_id = connection.execute(
+                        "SELECT token_id FROM canonical_tokens WHERE token_hash = ?", (digest,)
+                    ).fetchone()[0]
+                known[digest] = token_id
+            token_ids.append(token_id)
+        connection.execute(
+            "INSERT INTO token_version_manifests (version_id, token_count, manifest) VALUES (?, ?, ?)",
+            (record.version_id, len(token_ids), token_ids.tobytes()),
+        )
+
+    def _previous_token_ids(self, connection: sqlite3.Connection, record: TokenVersionRecord) -> dict[bytes, int]:
+        row = connection.execute(
+            "SELECT m.manifest FROM token_version_manifests m "
+            "JOIN token_source_versions v ON v.version_id = m.version_id "
+            "WHERE v.source_id = ? AND m.version_id != ? ORDER BY v.imported_at DESC, v.rowid DESC LIMIT 1",
+            (record.source_id, record.version_id),
+        ).fetchone()
+        if row is None:
+            return {}
+        hashes = self._read_tokens(connection, _unpack_manifest(row[0]), "token_hash")
+        return {digest: token_id for token_id, digest in hashes}
+
+    @staticmethod
+    def _read_tokens(
+        connection: sqlite3.Connection, token_ids: Iterable[int], column: str
+    ) -> Iterator[tuple[int, Any]]:
+        """`(token_id, column)` rows covering each id, read with as few range scans over the primary key as possible."""
+        wanted = sorted(set(token_ids))
+        start = 0
+        while start < len(wanted):
+            end = start
+            while end + 1 < len(wanted) and wanted[end + 1] - wanted[end] <= _MANIFEST_RANGE_GAP:
+                end += 1
+            yield from connection.execute(
+                f"SELECT token_id, {column} FROM canonical_tokens WHERE token_id BETWEEN ? AND ?",
+                (wanted[start], wanted[end]),
+            )
+            start = end + 1
+
+    def _find_by_hash(self, source_id: str, input_sha256: str) -> TokenVersionRecord | None:
+        row = self._connection().execute(
+            f"SELECT {_VERSION_COLUMNS} FROM token_source_versions WHERE source_id = ? AND input_sha256 = ?",
+            (source_id, input_sha256),
+        ).fetchone()
+        return self._row_to_version(row) if row else None
+
+    def get_version(self, version_id: str) -> TokenVersionRecord | None:
+        row = self._connection().execute(
+            f"SELECT {_VERSION_COLUMNS} FROM token_source_versions WHERE version_id = ?",
+            (version_id,),
+        ).fetchone()
+        return self._row_to_version(row) if row else None
+
+    def get_version_tokens(self, version_id: str) -> list[CanonicalToken] | None:
+        token_ids = self.get_version_manifest(version_id)
+        if token_ids is None:
+            return None
+        decoded = self.get_tokens_by_key(token_ids)
+        return [decoded[token_id] for token_id in token_ids]
+
+    def get_version_manifest(self, version_id: str) -> array | None:
+        row = self._connection().execute(
+            "SELECT manifest FROM token_version_manifests WHERE version_id = ?", (version_id,)
+        ).fetchone()
+        return _unpack_manifest(row[0]) if row is not None else None
+
+    def get_tokens_by_key(self, keys: Iterable[int]) -> dict[int, CanonicalToken]:
+        wanted = set(keys)
+        # Rows between ids of interest come back from the range scans too; only the wanted ones are decoded.
+        return {
+            token_id: decode_token(data)
+            for token_id, data in self._read_tokens(self._connection(), wanted, "token")
+            if token_id in wanted
+        }
+
+    def list_versions_for_source(self, source_id: str, limit: int | None = None) -> list[TokenVersionRecord]:
+        """Oldest first, like the in-memory store; `limit` keeps only the most recent versions."""
+        rows = self._connection().execute(
+            f"SELECT {_VERSION_COLUMNS} FROM token_source_versions WHERE source_id = ? "
+            "ORDER BY imported_at DESC, rowid DESC LIMIT ?",
+            (source_id, -1 if limit is None else limit),
+        ).fetchall()
+        return [self._row_to_version(row) for row in reversed(rows)]
+
+
+def _default_import_store() -> TokenImportStore:
+    db_path = os.environ.get("QADMS_SQLITE_PATH")
+    if db_path:
+        return SqliteTokenImportStore(db_path, dedupe=os.environ.get("QADMS_SQLITE_DEDUPE") == "1")
+    return InMemoryTokenImportStore()
 
 
-DEFAULT_IMPORT_STORE = InMemoryTokenImportStore()
+DEFAULT_IMPORT_STORE = _default_import_store()
@@ -0,0 +1,598 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import io
+import struct
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional runtime dependency
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional runtime dependency
+    Image = None
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+DATA_URI_PREFIX = "data:image/png;base64,"
+FILE_REF_PREFIX = "file://"
+DEFAULT_TILE_SIZE = 16
+MAX_REPORTED_REGIONS = 100
+# Side of the blocks the dense anti-aliasing pass visits; blocks without changed pixels are skipped.
+AA_BLOCK_SIZE = 32
+# Above this many changed pixels per visited block, block-wise array passes beat per-pixel gathers.
+DENSE_PIXELS_PER_BLOCK = 16
+# Pixels of context around each block: candidates need their neighbours' neighbours.
+_AA_MARGIN = 2
+
+# The 8 neighbours of a pixel, used for anti-aliasing detection.
+_NEIGHBOUR_OFFSETS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
+# One offset of each opposite pair: comparing a pixel to these covers every neighbour pair once.
+_HALF_OFFSETS = [(0, 1), (1, -1), (1, 0), (1, 1)]
+# YIQ luma weights, as used by pixelmatch.
+_LUMA_WEIGHTS = (0.29889531, 0.58662247, 0.11448223)
+# PNG color type -> channels per pixel (bit depth 8).
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot reference cannot be loaded or decoded as a PNG."""
+
+
+def is_available() -> bool:
+    return np is not None
+
+
+def load_png_snapshot(snapshot: str, snapshot_root: Path | None = None) -> bytes | None:
+    """Return PNG bytes for an image snapshot reference, or None for plain string snapshots.
+
+    Accepts `data:image/png;base64,...`, bare base64 PNG data and `file://` refs.
+    File refs resolve against `snapshot_root` and may not escape it.
+    """
+    if snapshot.startswith(FILE_REF_PREFIX):
+        if snapshot_root is None:
+            raise SnapshotError("File snapshot refs are disabled; configure a snapshot root.")
+        root = snapshot_root.resolve()
+        path = (root / snapshot[len(FILE_REF_PREFIX) :].lstrip("/")).resolve()
+        if not path.is_relative_to(root):
+            raise SnapshotError("File snapshot ref resolves outside the snapshot root.")
+        try:
+            data = path.read_bytes()
+        except OSError as exc:
+            raise SnapshotError(f"File snapshot ref could not be read: {exc.strerror}.") from exc
+        if not data.startswith(PNG_SIGNATURE):
+            raise SnapshotError("File snapshot ref is not a PNG image.")
+        return data
+
+    encoded = snapshot[len(DATA_URI_PREFIX) :] if snapshot.startswith(DATA_URI_PREFIX) else snapshot
+    try:
+        data = base64.b64decode(encoded, validate=True)
+    except (binascii.Error, ValueError):
+        data = b""
+    if data.startswith(PNG_SIGNATURE):
+        return data
+    if snapshot.startswith(DATA_URI_PREFIX):
+        raise SnapshotError("Data URI snapshot is not a base64-encoded PNG image.")
+    return None
+
+
+def decode_png(data: bytes) -> Any:
+    """Decode PNG bytes into an (height, width, 4) uint8 RGBA array."""
+    if Image is not None:
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                return np.asarray(image.convert("RGBA"))
+        except (OSError, ValueError, Image.DecompressionBombError) as exc:
+            raise SnapshotError(f"PNG snapshot could not be decoded: {exc}") from exc
+    return _decode_png_stdlib(data)
+
+
+def _decode_png_stdlib(data: bytes) -> Any:
+    # Fallback for 8-bit, non-interlaced PNGs when Pillow is not installed.
+    if not data.startswith(PNG_SIGNATURE):
+        raise SnapshotError("PNG snapshot has an invalid signature.")
+    offset = len(PNG_SIGNATURE)
+    header: tuple[int, ...] | None = None
+    palette = b""
+    transparency = b""
+    idat = bytearray()
+    while offset + 8 <= len(data):
+        length, kind = struct.unpack(">I4s", data[offset : offset + 8])
+        chunk = data[offset + 8 : offset + 8 + length]
+        offset += 12 + length
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", chunk)
+        elif kind == b"PLTE":
+            palette = chunk
+        elif kind == b"tRNS":
+            transparency = chunk
+        elif kind == b"IDAT":
+            idat += chunk
+        elif kind == b"IEND":
+            break
+    if header is None:
+        raise SnapshotError("PNG snapshot is missing its IHDR chunk.")
+
+    width, height, bit_depth, color_type, _, _, interlace = header
+    if bit_depth != 8 or interlace or color_type not in _PNG_CHANNELS:
+        raise SnapshotError("Only 8-bit non-interlaced PNGs are supported without Pillow.")
+    channels = _PNG_CHANNELS[color_type]
+    try:
+        raw = zlib.decompress(bytes(idat))
+    except zlib.error as exc:
+        raise SnapshotError(f"PNG snapshot could not be decoded: {exc}") from exc
+    stride = width * channels
+    if len(raw) != height * (stride + 1):
+        raise SnapshotError("PNG snapshot image data has an unexpected length.")
+
+    rows = np.frombuffer(raw, dtype=np.uint8).reshape(height, stride + 1)
+    pixels = _unfilter_rows(rows[:, 0], rows[:, 1:], channels).reshape(height, width, channels)
+
+    if color_type == 3:
+        table = np.full((256, 4), 255, dtype=np.uint8)
+        colors = np.frombuffer(palette, dtype=np.uint8).reshape(-1, 3)
+        table[: len(colors), :3] = colors
+        alphas = np.frombuffer(transparency, dtype=np.uint8)
+        table[: len(alphas), 3] = alphas
+        return table[pixels[..., 0]]
+
+    rgba = np.empty((height, width, 4), dtype=np.uint8)
+    if channels in (1, 2):
+        rgba[..., :3] = pixels[..., :1]
+    else:
+        rgba[..., :3] = pixels[..., :3]
+    rgba[..., 3] = pixels[..., -1] if channels in (2, 4) else 255
+    return rgba
+
+
+def _unfilter_rows(filters: Any, filtered: Any, bpp: int) -> Any:
+    if not filters.any():
+        return filtered
+    out = np.empty_like(filtered)
+    previous = np.zeros(filtered.shape[1], dtype=np.uint8)
+    for y, kind in enumerate(filters.tolist()):
+        row = filtered[y]
+        if kind == 0:
+            out[y] = row
+        elif kind == 1:
+            out[y] = np.cumsum(row.reshape(-1, bpp), axis=0, dtype=np.uint8).reshape(-1)
+        elif kind == 2:
+            out[y] = row + previous
+        elif kind in (3, 4):
+            out[y] = _unfilter_sequential(kind, row.tolist(), previous.tolist(), bpp)
+        else:
+            raise SnapshotError(f"PNG snapshot uses unknown row filter {kind}.")
+        previous = out[y]
+    return out
+
+
+def _unfilter_sequential(kind: int, row: list[int], previous: list[int], bpp: int) -> list[int]:
+    # Average and Paeth depend on the reconstructed byte to the left, so they cannot be vectorized per row.
+    recon = [0] * len(row)
+    for idx, value in enumerate(row):
+        left = recon[idx - bpp] if idx >= bpp else 0
+        up = previous[idx]
+        if kind == 3:
+            recon[idx] = (value + ((left + up) >> 1)) & 0xFF
+            continue
+        upper_left = previous[idx - bpp] if idx >= bpp else 0
+        estimate = left + up - upper_left
+        dist_left, dist_up, dist_upper_left = abs(estimate - left), abs(estimate - up), abs(estimate - upper_left)
+        if dist_left <= dist_up and dist_left <= dist_upper_left:
+            predictor = left
+        elif dist_up <= dist_upper_left:
+            predictor = up
+        else:
+            predictor = upper_left
+        recon[idx] = (value + predictor) & 0xFF
+    return recon
+
+
+def encode_mask_png(mask: Any) -> bytes:
+    """Encode a boolean mask as a 1-bit grayscale PNG (changed pixels are white)."""
+    height, width = mask.shape
+    packed = np.packbits(mask, axis=1)
+    rows = np.zeros((height, packed.shape[1] + 1), dtype=np.uint8)
+    rows[:, 1:] = packed
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    return (
+        PNG_SIGNATURE
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 1, 0, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows.tobytes(), 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+@dataclass
+class ChangedRegion:
+    x: int
+    y: int
+    width: int
+    height: int
+    changed_pixels: int
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "x": self.x,
+            "y": self.y,
+            "width": self.width,
+            "height": self.height,
+            "changed_pixels": self.changed_pixels,
+        }
+
+
+@dataclass
+class PixelDiffResult:
+    width: int
+    height: int
+    changed_pixels: int
+    antialiased_pixels: int
+    regions: list[ChangedRegion]
+    mask: Any = field(repr=False)
+
+    @property
+    def total_pixels(self) -> int:
+        return self.width * self.height
+
+    @property
+    def diff_ratio(self) -> float:
+        return self.changed_pixels / max(self.total_pixels, 1)
+
+
+def diff_images(
+    baseline: Any,
+    current: Any,
+    *,
+    color_tolerance: int = 0,
+    detect_antialiasing: bool = True,
+    tile_size: int = DEFAULT_TILE_SIZE,
+) -> PixelDiffResult:
+    """Compare two RGBA arrays pixel by pixel.
+
+    A pixel changes when any channel differs by more than `color_tolerance`.
+    With `detect_antialiasing`, changed pixels that look like anti-aliasing in
+    either image are counted separately (see `_antialiased`). Pixels outside
+    the overlap of differently sized images always count as changed.
+    """
+    height = max(baseline.shape[0], current.shape[0])
+    width = max(baseline.shape[1], current.shape[1])
+    overlap_h = min(baseline.shape[0], current.shape[0])
+    overlap_w = min(baseline.shape[1], current.shape[1])
+    base = np.ascontiguousarray(baseline[:overlap_h, :overlap_w])
+    curr = np.ascontiguousarray(current[:overlap_h, :overlap_w])
+
+    # Exact comparison on packed RGBA words first; channel work only where pixels differ.
+    changed = base.view(np.uint32)[..., 0] != curr.view(np.uint32)[..., 0]
+    blocks = np.count_nonzero(_tile_counts(changed, AA_BLOCK_SIZE)[1])
+    if np.count_nonzero(changed) > DENSE_PIXELS_PER_BLOCK * blocks:
+        changed, antialiased = _diff_dense(base, curr, changed, color_tolerance, detect_antialiasing)
+    else:
+        changed, antialiased = _diff_sparse(base, curr, changed, color_tolerance, detect_antialiasing)
+
+    mask = np.ones((height, width), dtype=bool)
+    mask[:overlap_h, :overlap_w] = changed
+    changed_pixels = int(np.count_nonzero(mask))
+    return PixelDiffResult(
+        width=width,
+        height=height,
+        changed_pixels=changed_pixels,
+        antialiased_pixels=antialiased,
+        regions=_changed_regions(mask, tile_size) if changed_pixels else [],
+        mask=mask,
+    )
+
+
+def _diff_sparse(base: Any, curr: Any, changed: Any, tolerance: int, antialiasing: bool) -> tuple[Any, int]:
+    ys, xs = np.nonzero(changed)
+    if tolerance > 0 and len(ys):
+        delta = np.abs(base[ys, xs].astype(np.int16) - curr[ys, xs].astype(np.int16)).max(axis=1)
+        keep = delta > tolerance
+        changed[ys[~keep], xs[~keep]] = False
+        ys, xs = ys[keep], xs[keep]
+    return _drop_antialiased(base, curr, changed, ys, xs, antialiasing)
+
+
+def _diff_dense(base: Any, curr: Any, changed: Any, tolerance: int, antialiasing: bool) -> tuple[Any, int]:
+    if tolerance > 0:
+        # max - min is the absolute channel delta without leaving uint8.
+        changed &= (np.maximum(base, curr) - np.minimum(base, curr)).max(axis=2) > tolerance
+    if not antialiasing:
+        return changed, 0
+    aa = _antialiased_dense(base, curr, changed)
+    return changed & ~aa, int(np.count_nonzero(aa))
+
+
+def _drop_antialiased(base: Any, curr: Any, changed: Any, ys: Any, xs: Any, antialiasing: bool) -> tuple[Any, int]:
+    if not antialiasing or not len(ys):
+        return changed, 0
+    aa = _antialiased(base, curr, ys, xs) | _antialiased(curr, base, ys, xs)
+    changed[ys[aa], xs[aa]] = False
+    return changed, int(np.count_nonzero(aa))
+
+
+def _luma(pixels: Any) -> Any:
+    """Brightness of RGBA pixels blended onto white."""
+    alpha = pixels[..., 3]
+    luma = np.zeros(pixels.shape[:-1], dtype=np.float32)
+    if alpha.min(initial=255) == 255:
+        # Opaque pixels: blending is the identity, so skip the float alpha pass.
+        for channel, weight in enumerate(_LUMA_WEIGHTS):
+            luma += weight * pixels[..., channel].astype(np.float32)
+        return luma
+    alpha = alpha.astype(np.float32) / 255
+    for channel, weight in enumerate(_LUMA_WEIGHTS):
+        luma += weight * (255 + (pixels[..., channel].astype(np.float32) - 255) * alpha)
+    return luma
+
+
+def _on_border(ys: Any, xs: Any, height: int, width: int) -> Any:
+    return (ys == 0) | (xs == 0) | (ys == height - 1) | (xs == width - 1)
+
+
+def _neighbours(ys: Any, xs: Any, height: int, width: int) -> Iterator[tuple[Any, Any, Any]]:
+    """(in bounds, clipped ys, clipped xs) for each of the 8 neighbours of the given pixels."""
+    for dy, dx in _NEIGHBOUR_OFFSETS:
+        ny, nx = ys + dy, xs + dx
+        inside = (ny >= 0) & (ny < height) & (nx >= 0) & (nx < width)
+        yield inside, np.clip(ny, 0, height - 1), np.clip(nx, 0, width - 1)
+
+
+def _has_many_siblings(words: Any, ys: Any, xs: Any) -> Any:
+    """True where at least 3 neighbours have exactly the pixel's value (the image border counts as one)."""
+    height, width = words.shape
+    centre = words[ys, xs]
+    siblings = _on_border(ys, xs, height, width).astype(np.int8)
+    for inside, ny, nx in _neighbours(ys, xs, height, width):
+        siblings += inside & (words[ny, nx] == centre)
+    return siblings > 2
+
+
+def _extreme_neighbours(luma_at: Callable[[Any, Any], Any], ys: Any, xs: Any, height: int, width: int) -> tuple:
+    """(equal-brightness count, darkest delta, brightest delta, darkest ys/xs, brightest ys/xs).
+
+    The count includes 1 for pixels on the image border. Deltas start at 0, and
+    ties go to the first neighbour in `_NEIGHBOUR_OFFSETS` order, as in pixelmatch.
+    """
+    centre = luma_at(ys, xs)
+    zeroes = _on_border(ys, xs, height, width).astype(np.int8)
+    low = np.zeros(len(ys), dtype=np.float32)
+    high = np.zeros(len(ys), dtype=np.float32)
+    low_y, low_x, high_y, high_x = ys, xs, ys, xs
+    for inside, ny, nx in _neighbours(ys, xs, height, width):
+        delta = luma_at(ny, nx) - centre
+        zeroes += inside & (delta == 0)
+        darker = inside & (delta < low)
+        brighter = inside & (delta > high)
+        low, low_y, low_x = np.where(darker, delta, low), np.where(darker, ny, low_y), np.where(darker, nx, low_x)
+        high, high_y, high_x = (
+            np.where(brighter, delta, high),
+            np.where(brighter, ny, high_y),
+            np.where(brighter, nx, high_x),
+        )
+    return zeroes, low, high, low_y, low_x, high_y, high_x
+
+
+def _antialiased(image: Any, other: Any, ys: Any, xs: Any) -> Any:
+    """pixelmatch's anti-aliasing test for the given pixels of `image`.
+
+    The pixel must sit on an edge: at most 2 neighbours (border included)
+    share its brightness, and it has both darker and brighter neighbours.
+    Its darkest or brightest neighbour must then lie inside a flat area in
+    both images, with at least 3 identical siblings in each.
+    """
+    height, width = image.shape[:2]
+    zeroes, low, high, low_y, low_x, high_y, high_x = _extreme_neighbours(
+        lambda ny, nx: _luma(image[ny, nx]), ys, xs, height, width
+    )
+    edge = (zeroes <= 2) & (low < 0) & (high > 0)
+    found = np.zeros(len(ys), dtype=bool)
+    if not edge.any():
+        return found
+    picked = np.nonzero(edge)[0]
+    words, other_words = image.view(np.uint32)[..., 0], other.view(np.uint32)[..., 0]
+    flat = np.zeros(len(picked), dtype=bool)
+    for ey, ex in ((low_y[picked], low_x[picked]), (high_y[picked], high_x[picked])):
+        flat |= _has_many_siblings(words, ey, ex) & _has_many_siblings(other_words, ey, ex)
+    found[picked] = flat
+    return found
+
+
+def _offset_slices(height: int, width: int, dy: int, dx: int) -> tuple[tuple[slice, slice], tuple[slice, slice]]:
+    """Slices selecting every pixel that has a neighbour at (dy, dx), and those neighbours."""
+    centre = (slice(max(0, -dy), height - max(0, dy)), slice(max(0, -dx), width - max(0, dx)))
+    neighbour = (slice(max(0, dy), height + min(0, dy)), slice(max(0, dx), width + min(0, dx)))
+    return centre, neighbour
+
+
+def _equal_neighbours(values: Any, border: Any, valid: Any = None) -> Any:
+    """Per pixel, how many neighbours hold exactly its value, plus `border`.
+
+    Each comparison is made once for a pixel pair and credited to both
+    pixels; pairs involving a pixel outside `valid` never count.
+    """
+    counts = border.copy()
+    for dy, dx in _HALF_OFFSETS:
+        centre, neighbour = _offset_slices(*values.shape, dy, dx)
+        same = values[neighbour] == values[centre]
+        if valid is not None:
+            same &= valid[neighbour] & valid[centre]
+        counts[centre] += same
+        counts[neighbour] += same
+    return counts
+
+
+def _box_reduce(values: Any, reduce: Any) -> Any:
+    """`reduce` (np.fmin, np.fmax, np.logical_or) over each pixel's 3x3 block, in two 1-D passes."""
+    out = values.copy()
+    reduce(out[:, 1:], values[:, :-1], out=out[:, 1:])
+    reduce(out[:, :-1], values[:, 1:], out=out[:, :-1])
+    rows = out.copy()
+    reduce(out[1:], rows[:-1], out=out[1:])
+    reduce(out[:-1], rows[1:], out=out[:-1])
+    return out
+
+
+def _tile_counts(mask: Any, size: int) -> tuple[Any, Any]:
+    """(mask zero-padded to whole tiles, set pixels per `size` x `size` tile).
+
+    Rows are summed first, across full-width rows, so the short per-tile
+    reductions only run on an array `size` times smaller.
+    """
+    height, width = mask.shape
+    rows, cols = -(-height // size), -(-width // size)
+    padded = np.zeros((rows * size, cols * size), dtype=bool)
+    padded[:height, :width] = mask
+    column_counts = padded.reshape(rows, size, cols * size).sum(axis=1, dtype=np.int32)
+    return padded, column_counts.reshape(rows, cols, size).sum(axis=2)
+
+
+def _flat_extremes(luma: Any, flat: Any, low: Any, high: Any, ys: Any, xs: Any) -> Any:
+    """Whether the first neighbour reaching `low` or `high` (3x3 brightness extremes) is flat.
+
+    Neighbours are visited in `_NEIGHBOUR_OFFSETS` order, so ties resolve as
+    in `_antialiased`; `luma` must be NaN wherever a neighbour does not exist.
+    """
+    width = luma.shape[1]
+    luma, flat = luma.ravel(), flat.ravel()
+    pixels = ys * width + xs
+    low, high = low[ys, xs], high[ys, xs]
+    seen_low = np.zeros(len(ys), dtype=bool)
+    seen_high = np.zeros(len(ys), dtype=bool)
+    found = np.zeros(len(ys), dtype=bool)
+    for dy, dx in _NEIGHBOUR_OFFSETS:
+        neighbours = pixels + (dy * width + dx)
+        value, neighbour_flat = luma.take(neighbours), flat.take(neighbours)
+        first_low = (value == low) & ~seen_low
+        first_high = (value == high) & ~seen_high
+        found |= (first_low | first_high) & neighbour_flat
+        seen_low |= first_low
+        seen_high |= first_high
+    return found
+
+
+def _antialiased_dense(base: Any, curr: Any, candidates: Any) -> Any:
+    """The test of `_antialiased` in either image, on whole-array passes over the blocks holding candidates.
+
+    Blocks (with a margin, so every candidate sees its neighbours' neighbours)
+    are laid side by side in one wide array. Sibling counts and 3x3
+    brightness extremes come from shifted views of it; values that wrap
+    across block seams only land in margins, which are never tested. Only
+    edge pixels with a flat neighbour are then gathered to find their first
+    darkest and brightest neighbour. Pixels outside the image have NaN
+    brightness, which no comparison matches.
+    """
+    height, width = candidates.shape
+    found = np.zeros((height, width), dtype=bool)
+    block_y, block_x = np.nonzero(_tile_counts(candidates, AA_BLOCK_SIZE)[1])
+    if not len(block_y):
+        return found
+    # Image rows and columns each block covers, margin included.
+    span = np.arange(-_AA_MARGIN, AA_BLOCK_SIZE + _AA_MARGIN)
+    block_rows, block_cols = block_y[:, None] * AA_BLOCK_SIZE + span, block_x[:, None] * AA_BLOCK_SIZE + span
+    side = len(span)
+    # Zero padding puts every block inside the arrays; `valid` marks what lies outside the image.
+    padding = (
+        (_AA_MARGIN, -(-height // AA_BLOCK_SIZE) * AA_BLOCK_SIZE - height + _AA_MARGIN),
+        (_AA_MARGIN, -(-width // AA_BLOCK_SIZE) * AA_BLOCK_SIZE - width + _AA_MARGIN),
+    )
+
+    def side_by_side(array: Any) -> Any:
+        """The blocks of `array` laid left to right: a (side, blocks * side, ...) array."""
+        padded = np.pad(array, padding + ((0, 0),) * (array.ndim - 2))
+        step_y, step_x = padded.strides[:2]
+        # [row in block, block row, block column, column in block]
+        blocks = np.lib.stride_tricks.as_strided(
+            padded,
+            shape=(side, padded.shape[0] // AA_BLOCK_SIZE, padded.shape[1] // AA_BLOCK_SIZE, side, *array.shape[2:]),
+            strides=(step_y, step_y * AA_BLOCK_SIZE, step_x * AA_BLOCK_SIZE, step_x, *padded.strides[2:]),
+            writeable=False,
+        )
+        return blocks[:, block_y, block_x].reshape(side, -1, *array.shape[2:])
+
+    def grid(row_mask: Any, col_mask: Any, combine: Any) -> Any:
+        return combine(row_mask.T[:, :, None], col_mask[None, :, :]).reshape(side, -1)
+
+    valid = grid((block_rows >= 0) & (block_rows < height), (block_cols >= 0) & (block_cols < width), np.logical_and)
+    border = (
+        grid((block_rows == 0) | (block_rows == height - 1), (block_cols == 0) | (block_cols == width - 1), np.logical_or)
+        & valid
+    ).astype(np.int8)
+    inner = (span >= 0) & (span < AA_BLOCK_SIZE)
+    interior = grid(np.tile(inner, (len(block_y), 1)), np.tile(inner, (len(block_y), 1)), np.logical_and)
+
+    images = [side_by_side(image) for image in (base, curr)]
+    flat = _equal_neighbours(images[0].view(np.uint32)[..., 0], border, valid) > 2
+    flat &= _equal_neighbours(images[1].view(np.uint32)[..., 0], border, valid) > 2
+    pending = side_by_side(candidates) & valid & interior
+    # Without a flat neighbour neither extreme can pass; on noisy images this ends the test here.
+    pending &= _box_reduce(flat, np.logical_or)
+    if not pending.any():
+        return found
+
+    aa = np.zeros(pending.shape, dtype=bool)
+    for image in images:
+        luma = _luma(image)
+        luma[~valid] = np.nan
+        low, high = _box_reduce(luma, np.fmin), _box_reduce(luma, np.fmax)
+        edge = pending & (low < luma) & (luma < high)
+        edge &= _equal_neighbours(luma, border) <= 2
+        ys, xs = np.nonzero(edge)
+        aa[ys, xs] |= _flat_extremes(luma, flat, low, high, ys, xs)
+
+    ys, xs = np.nonzero(aa)
+    blocks, xs = np.divmod(xs, side)
+    found[block_rows[blocks, ys], block_cols[blocks, xs]] = True
+    return found
+
+
+def _changed_regions(mask: Any, tile_size: int) -> list[ChangedRegion]:
+    """Bounding boxes of 4-connected groups of tiles that contain changed pixels."""
+    padded, counts = _tile_counts(mask, tile_size)
+    # Extents are only needed for occupied tiles, so only those are copied out.
+    occupied_rows, occupied_cols = np.nonzero(counts)
+    rows, cols = counts.shape
+    tiles = padded.reshape(rows, tile_size, cols, tile_size).swapaxes(1, 2)[occupied_rows, occupied_cols]
+    row_hits = tiles.any(axis=2)
+    col_hits = tiles.any(axis=1)
+    offsets = np.arange(tile_size)
+    top, bottom, left, right = (np.zeros(counts.shape, dtype=np.int64) for _ in range(4))
+    top[occupied_rows, occupied_cols] = np.where(row_hits, offsets, tile_size).min(axis=1) + occupied_rows * tile_size
+    bottom[occupied_rows, occupied_cols] = np.where(row_hits, offsets, -1).max(axis=1) + occupied_rows * tile_size
+    left[occupied_rows, occupied_cols] = np.where(col_hits, offsets, tile_size).min(axis=1) + occupied_cols * tile_size
+    right[occupied_rows, occupied_cols] = np.where(col_hits, offsets, -1).max(axis=1) + occupied_cols * tile_size
+
+    occupied = set(zip(occupied_rows.tolist(), occupied_cols.tolist()))
+    regions: list[ChangedRegion] = []
+    while occupied:
+        stack = [occupied.pop()]
+        component = []
+        while stack:
+            row, col = stack.pop()
+            component.append((row, col))
+            for neighbour in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+                if neighbour in occupied:
+                    occupied.remove(neighbour)
+                    stack.append(neighbour)
+        tile_rows, tile_cols = (np.array(axis) for axis in zip(*component))
+        x0, y0 = int(left[tile_rows, tile_cols].min()), int(top[tile_rows, tile_cols].min())
+        x1, y1 = int(right[tile_rows, tile_cols].max()), int(bottom[tile_rows, tile_cols].max())
+        regions.append(
+            ChangedRegion(
+                x=x0,
+                y=y0,
+                width=x1 - x0 + 1,
+                height=y1 - y0 + 1,
+                changed_pixels=int(counts[tile_rows, tile_cols].sum()),
+            )
+        )
+    regions.sort(key=lambda region: (-region.changed_pixels, region.y, region.x))
+    return regions
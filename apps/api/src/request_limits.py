@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+from dataclasses import dataclass
+from typing import Any
+
+from .error_envelope import error_response
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional runtime dependency
+    np = None
+
+# Everything except quotes and brackets is dropped before the nesting depth is measured.
+_NOT_STRUCTURAL = bytes(sorted(set(range(256)) - set(b'"[]{}')))
+_OPEN = frozenset(b"[{")
+
+if np is not None:
+    _QUOTE_STEP = np.zeros(256, dtype=np.int8)
+    _QUOTE_STEP[ord('"')] = 1
+    _BRACKET_STEP = np.zeros(256, dtype=np.int8)
+    _BRACKET_STEP[[ord("["), ord("{")]] = 1
+    _BRACKET_STEP[[ord("]"), ord("}")]] = -1
+
+
+class LimitExceeded(Exception):
+    """A request crossed one of the `RequestLimits`; `response()` renders the error envelope."""
+
+    def __init__(self, status_code: int, code: str, message: str, details: dict[str, Any]) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+        self.details = details
+
+    def response(self) -> tuple[int, dict[str, Any]]:
+        return error_response(status_code=self.status_code, code=self.code, message=str(self), details=self.details)
+
+
+@dataclass(frozen=True)
+class RequestLimits:
+    """Caps that reject oversized or pathological inputs before they reach the rule stack."""
+
+    max_body_bytes: int = 32 * 1024 * 1024
+    max_json_depth: int = 64
+    max_tokens: int = 250_000
+    max_violations: int = 500_000
+
+    @classmethod
+    def from_env(cls) -> RequestLimits:
+        defaults = cls()
+        return cls(
+            max_body_bytes=int(os.environ.get("QADMS_MAX_BODY_BYTES", defaults.max_body_bytes)),
+            max_json_depth=int(os.environ.get("QADMS_MAX_JSON_DEPTH", defaults.max_json_depth)),
+            max_tokens=int(os.environ.get("QADMS_MAX_TOKENS", defaults.max_tokens)),
+            max_violations=int(os.environ.get("QADMS_MAX_VIOLATIONS", defaults.max_violations)),
+        )
+
+    def check_body_size(self, size: int) -> None:
+        if size > self.max_body_bytes:
+            raise LimitExceeded(
+                413,
+                "request_too_large",
+                f"Request body exceeds {self.max_body_bytes} bytes.",
+                {"max_body_bytes": self.max_body_bytes, "body_bytes": size},
+            )
+
+    def check_body(self, request_body: bytes) -> None:
+        """Size and nesting checks that run before the body is parsed."""
+        self.check_body_size(len(request_body))
+        depth = json_depth(request_body)
+        if depth > self.max_json_depth:
+            raise LimitExceeded(
+                422,
+                "json_too_deep",
+                f"JSON nesting exceeds {self.max_json_depth} levels.",
+                {"max_json_depth": self.max_json_depth, "json_depth": depth},
+            )
+
+    def check_tokens(self, count: int) -> None:
+        if count > self.max_tokens:
+            raise LimitExceeded(
+                422,
+                "too_many_tokens",
+                f"Export normalizes to more than {self.max_tokens} tokens.",
+                {"max_tokens": self.max_tokens, "token_count": count},
+            )
+
+    def check_violations(self, count: int) -> None:
+        if count > self.max_violations:
+            raise LimitExceeded(
+                422,
+                "too_many_violations",
+                f"Audit produced more than {self.max_violations} violations.",
+                {"max_violations": self.max_violations},
+            )
+
+
+DEFAULT_REQUEST_LIMITS = RequestLimits.from_env()
+
+
+def json_depth(body: bytes) -> int:
+    """Deepest array/object nesting in a JSON document, measured without parsing it.
+
+    Escaped backslashes and quotes are removed, then everything but quotes and
+    brackets; adjacent quote pairs go next, so in typical exports only the
+    brackets remain. Brackets inside strings are not counted. Malformed input
+    gives a meaningless depth; parsing reports the real error.
+    """
+    if b"\\" in body:
+        body = body.replace(b"\\\\", b"").replace(b'\\"', b"")
+    structural = body.translate(None, _NOT_STRUCTURAL).replace(b'""', b"")
+    if not structural:
+        return 0
+
+    if np is not None:
+        codes = np.frombuffer(structural, dtype=np.uint8)
+        steps = _BRACKET_STEP[codes]
+        if b'"' in structural:
+            steps[(np.cumsum(_QUOTE_STEP[codes], dtype=np.int32) & 1).astype(bool)] = 0
+        return max(int(np.cumsum(steps, dtype=np.int32).max()), 0)
+
+    depth = deepest = 0
+    in_string = False
+    for code in structural:
+        if code == 34:
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif code in _OPEN:
+            depth += 1
+            deepest = max(deepest, depth)
+        else:
+            depth -= 1
+    return deepest
+
+
+def _reject_constant(name: str) -> Any:
+    # `NaN` and `Infinity` are not JSON; the stdlib accepts them, orjson and stored tokens do not.
+    raise ValueError(f"{name} is not valid JSON")
+
+
+def _finite_float(text: str) -> float:
+    # Literals like `1e400` are valid JSON but overflow to infinity, which tokens cannot store either.
+    value = float(text)
+    if not math.isfinite(value):
+        raise ValueError(f"{text} is out of range for a double")
+    return value
+
+
+def parse_json_body(
+    request_body: bytes, limits: RequestLimits | None = None
+) -> tuple[Any, tuple[int, dict[str, Any]] | None]:
+    """(payload, None), or (None, error envelope) for oversized, too deeply nested or malformed bodies."""
+    try:
+        (limits if limits is not None else DEFAULT_REQUEST_LIMITS).check_body(request_body)
+    except LimitExceeded as exc:
+        return None, exc.response()
+    try:
+        return json.loads(request_body.decode("utf-8"), parse_constant=_reject_constant, parse_float=_finite_float), None
+    except (UnicodeDecodeError, ValueError):
+        return None, error_response(
+            status_code=400,
+            code="invalid_json",
+            message="Request body must be valid UTF-8 JSON.",
+        )
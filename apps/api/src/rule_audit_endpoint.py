@@ -1,31 +1,36 @@
 from __future__ import annotations
 
-import json
 from collections import Counter
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterator, Sequence
 from uuid import uuid4
 
-from packages.rules import (
-    evaluate_a11y_contrast,
-    evaluate_tokens_naming,
-    evaluate_tokens_scale,
-    evaluate_tokens_semantic_coverage,
-    normalize_figma_export,
-)
+from packages.contracts import RuleEvaluation
+from packages.rules import normalize_figma_export, normalize_figma_export_stream
+from packages.rules.delta_audit import DeltaAuditState
+from packages.rules.registry import DEFAULT_RULE_REGISTRY, RuleSpec, UnknownRuleError
 
+from .audit_cache import DEFAULT_AUDIT_CACHE, AuditResultCache
+from .audit_store import (
+    DEFAULT_AUDIT_STORE,
+    DEFAULT_DELTA_STATE_STORE,
+    DeltaStateStore,
+    InMemoryAuditStore,
+    StoredAudit,
+)
 from .error_envelope import error_response
+from .instrumentation import DEFAULT_METRICS, AuditTimings, MetricsRegistry, StageTiming
+from .request_limits import DEFAULT_REQUEST_LIMITS, LimitExceeded, RequestLimits, parse_json_body
+
+# Bump whenever rule logic or the audit payload shape changes so cached results are not reused.
+RULESET_VERSION = "2026.10.3"
 
-RULE_CATEGORY = {
-    "TOKENS_NAMING": "tokens",
-    "TOKENS_SCALE": "tokens",
-    "TOKENS_SEMANTIC_COVERAGE": "tokens",
-    "A11Y_CONTRAST": "a11y",
-}
+# `delta` re-runs only the rule scopes touched by tokens that changed since the source's last delta audit.
+AUDIT_MODES = ("full", "delta")
 
 
 def _build_violation_payload(rule_id: str, violation: Any) -> dict[str, Any]:
-    category = RULE_CATEGORY.get(rule_id, "other")
+    category = DEFAULT_RULE_REGISTRY.category(rule_id)
     return {
         "violation_id": violation.violation_id,
         "rule_id": violation.rule_id,
@@ -39,19 +44,71 @@ def _build_violation_payload(rule_id: str, violation: Any) -> dict[str, Any]:
     }
 
 
-def _evaluate_rules(payload: Any):
-    canonical, validation = normalize_figma_export(payload)
-    evaluations = [
-        evaluate_tokens_naming(canonical),
-        evaluate_tokens_scale(canonical),
-        evaluate_tokens_semantic_coverage(canonical),
-        evaluate_a11y_contrast(canonical),
-    ]
+def _select_rules(rule_ids: Sequence[str] | None) -> list[RuleSpec]:
+    return DEFAULT_RULE_REGISTRY.select(rule_ids)
+
+
+def _ruleset_key(rule_ids: Sequence[str] | None) -> str:
+    """Cache namespace: the ruleset version plus the rule selection when it is not every rule."""
+    if rule_ids is None or set(rule_ids) >= set(DEFAULT_RULE_REGISTRY.rule_ids):
+        return RULESET_VERSION
+    return f"{RULESET_VERSION}+{','.join(sorted(set(rule_ids)))}"
+
+
+def _rule_selection_error(rule_ids: Sequence[str] | None) -> tuple[int, dict[str, Any]] | None:
+    if rule_ids is not None and not rule_ids:
+        return error_response(
+            status_code=400,
+            code="invalid_rules",
+            message="Query parameter `rules` must name at least one rule.",
+            details={"available_rules": list(DEFAULT_RULE_REGISTRY.rule_ids)},
+        )
+    try:
+        _select_rules(rule_ids)
+    except UnknownRuleError as exc:
+        return error_response(
+            status_code=400,
+            code="unknown_rule",
+            message=str(exc),
+            details={"unknown_rules": exc.rule_ids, "available_rules": list(DEFAULT_RULE_REGISTRY.rule_ids)},
+        )
+    return None
+
+
+def _evaluate_rules(
+    payload: Any,
+    timings: AuditTimings | None = None,
+    delta_state: DeltaAuditState | None = None,
+    rule_ids: Sequence[str] | None = None,
+    limits: RequestLimits | None = None,
+):
+    timings = timings if timings is not None else AuditTimings()
+    limits = limits if limits is not None else DEFAULT_REQUEST_LIMITS
+    specs = _select_rules(rule_ids)
+    with timings.stage("normalization") as stage:
+        canonical, validation = normalize_figma_export(payload)
+        stage.token_count = len(canonical.tokens)
+    limits.check_tokens(len(canonical.tokens))
+
     violations: list[dict[str, Any]] = []
-    for evaluation in evaluations:
-        for violation in evaluation.violations:
-            violations.append(_build_violation_payload(evaluation.rule_id, violation))
+    if delta_state is not None:
+        with timings.stage("delta") as stage:
+            for evaluation in delta_state.evaluate(canonical):
+                limits.check_violations(len(violations) + len(evaluation.violations))
+                for violation in evaluation.violations:
+                    violations.append(_build_violation_payload(evaluation.rule_id, violation))
+            stage.token_count = len(delta_state.last_delta) if delta_state.last_delta is not None else 0
+            stage.violation_count = len(violations)
+    else:
+        _evaluate_all_rules(canonical, violations, timings, specs, limits)
+
+    with timings.stage("sort") as stage:
+        _sort_violations(violations)
+        stage.violation_count = len(violations)
+    return canonical, validation, violations
 
+
+def _sort_violations(violations: list[dict[str, Any]]) -> None:
     violations.sort(
         key=lambda item: (
             item["severity"],
@@ -61,70 +118,205 @@ def _evaluate_rules(payload: Any):
             item["violation_id"],
         )
     )
-    return canonical, validation, violations
 
 
-def post_rule_audit(source_id: str, request_body: bytes) -> tuple[int, dict[str, Any]]:
+def _iter_rule_evaluations(canonical: Any, timings: AuditTimings, specs: list[RuleSpec]) -> Iterator[RuleEvaluation]:
+    """Schedule the selected rules and yield their evaluations in registry order.
+
+    Rule stages are recorded in that order too; their times are measured in
+    the worker that ran the rule, so consumer time is never attributed to them.
+    """
+    with timings.stage("index") as stage:
+        precomputed = DEFAULT_RULE_REGISTRY.prepare(canonical, specs)
+        index = precomputed.get("index")
+        stage.token_count = len(index.entries) if index is not None else 0
+
+    for run in DEFAULT_RULE_REGISTRY.iter_runs(canonical, specs, precomputed):
+        timings.stages.append(
+            StageTiming(
+                stage="rule",
+                rule_id=run.spec.rule_id,
+                wall_seconds=run.wall_seconds,
+                cpu_seconds=run.cpu_seconds,
+                token_count=len(canonical.tokens),
+                violation_count=len(run.evaluation.violations),
+            )
+        )
+        yield run.evaluation
+
+
+def _evaluate_all_rules(
+    canonical: Any,
+    violations: list[dict[str, Any]],
+    timings: AuditTimings,
+    specs: list[RuleSpec],
+    limits: RequestLimits,
+) -> None:
+    for evaluation in _iter_rule_evaluations(canonical, timings, specs):
+        limits.check_violations(len(violations) + len(evaluation.violations))
+        for violation in evaluation.violations:
+            violations.append(_build_violation_payload(evaluation.rule_id, violation))
+
+
+def _build_audit_result(
+    payload: Any,
+    timings: AuditTimings | None = None,
+    delta_state: DeltaAuditState | None = None,
+    rule_ids: Sequence[str] | None = None,
+    limits: RequestLimits | None = None,
+) -> dict[str, Any]:
+    canonical, validation, violations = _evaluate_rules(payload, timings, delta_state, rule_ids, limits)
+    return {
+        "normalization": _normalization_summary(validation),
+        "summary": _summarize_violations(violations),
+        "violations": violations,
+    }
+
+
+def _normalization_summary(validation: Any) -> dict[str, Any]:
+    return {
+        "valid": validation.valid,
+        "error_count": len(validation.errors),
+        "warning_count": len(validation.warnings),
+    }
+
+
+def _summarize_violations(violations: list[dict[str, Any]]) -> dict[str, Any]:
+    return _audit_summary(
+        len(violations),
+        Counter(violation["severity"] for violation in violations),
+        Counter(violation["category"] for violation in violations),
+        Counter(violation["rule_id"] for violation in violations),
+    )
+
+
+def _audit_summary(
+    total: int, severity_counts: dict[str, int], category_counts: dict[str, int], rule_counts: dict[str, int]
+) -> dict[str, Any]:
+    return {
+        "total_violations": total,
+        "by_severity": {
+            "low": severity_counts.get("low", 0),
+            "medium": severity_counts.get("medium", 0),
+            "high": severity_counts.get("high", 0),
+            "critical": severity_counts.get("critical", 0),
+        },
+        "by_category": {
+            "tokens": category_counts.get("tokens", 0),
+            "a11y": category_counts.get("a11y", 0),
+            "other": category_counts.get("other", 0),
+        },
+        "by_rule": dict(sorted(rule_counts.items())),
+    }
+
+
+def post_rule_audit(
+    source_id: str,
+    request_body: bytes,
+    audit_cache: AuditResultCache | None = None,
+    audit_store: InMemoryAuditStore | None = None,
+    include_timings: bool = False,
+    metrics: MetricsRegistry | None = None,
+    mode: str = "full",
+    delta_store: DeltaStateStore | None = None,
+    rules: Sequence[str] | None = None,
+    limits: RequestLimits | None = None,
+) -> tuple[int, dict[str, Any]]:
     if not source_id or not source_id.strip():
         return error_response(
             status_code=400,
             code="invalid_source_id",
             message="Path parameter `source_id` must be a non-empty string.",
         )
-
-    try:
-        payload = json.loads(request_body.decode("utf-8"))
-    except (UnicodeDecodeError, json.JSONDecodeError):
+    if mode not in AUDIT_MODES:
         return error_response(
             status_code=400,
-            code="invalid_json",
-            message="Request body must be valid UTF-8 JSON.",
+            code="invalid_audit_mode",
+            message="Query parameter `mode` must be one of: " + ", ".join(AUDIT_MODES) + ".",
+            details={"mode": mode},
         )
-
+    rules_error = _rule_selection_error(rules)
+    if rules_error is not None:
+        return rules_error
+    limits = limits if limits is not None else DEFAULT_REQUEST_LIMITS
     try:
-        canonical, validation, violations = _evaluate_rules(payload)
-        severity_counts = Counter(violation["severity"] for violation in violations)
-        category_counts = Counter(violation["category"] for violation in violations)
-        rule_counts = Counter(violation["rule_id"] for violation in violations)
-
-        response = {
-            "source_id": source_id,
-            "audit_id": str(uuid4()),
-            "evaluated_at": datetime.now(tz=timezone.utc).isoformat(),
-            "normalization": {
-                "valid": validation.valid,
-                "error_count": len(validation.errors),
-                "warning_count": len(validation.warnings),
-            },
-            "summary": {
-                "total_violations": len(violations),
-                "by_severity": {
-                    "low": severity_counts.get("low", 0),
-                    "medium": severity_counts.get("medium", 0),
-                    "high": severity_counts.get("high", 0),
-                    "critical": severity_counts.get("critical", 0),
-                },
-                "by_category": {
-                    "tokens": category_counts.get("tokens", 0),
-                    "a11y": category_counts.get("a11y", 0),
-                    "other": category_counts.get("other", 0),
-                },
-                "by_rule": dict(sorted(rule_counts.items())),
-            },
-            "violations": violations,
-        }
-        return 200, response
-    except Exception:
-        return error_response(
-            status_code=500,
-            code="internal_error",
-            message="Unexpected server error while running rule audit.",
+        limits.check_body_size(len(request_body))
+    except LimitExceeded as exc:
+        return exc.response()
+
+    timings = AuditTimings()
+    cache = audit_cache if audit_cache is not None else DEFAULT_AUDIT_CACHE
+    with timings.stage("cache_lookup"):
+        cache_key = cache.make_key(request_body, _ruleset_key(rules))
+        # Delta audits always run so they report their delta and advance the source's state; their
+        # result is still stored, since it equals the full audit of the same body.
+        result = cache.get(cache_key) if mode != "delta" else None
+    delta: dict[str, Any] | None = None
+    if result is not None:
+        timings.cache_hit = True
+    else:
+        with timings.stage("parse"):
+            payload, error = parse_json_body(request_body, limits)
+        if error is not None:
+            return error
+
+        try:
+            if mode == "delta":
+                state = (delta_store if delta_store is not None else DEFAULT_DELTA_STATE_STORE).state_for(
+                    source_id, _select_rules(rules)
+                )
+                with state.lock:
+                    result = _build_audit_result(payload, timings, state, rules, limits)
+                    delta = state.last_delta.to_dict() if state.last_delta is not None else None
+            else:
+                result = _build_audit_result(payload, timings, rule_ids=rules, limits=limits)
+            with timings.stage("cache_store") as stage:
+                cache.put(cache_key, result)
+                stage.violation_count = len(result["violations"])
+        except LimitExceeded as exc:
+            return exc.response()
+        except Exception:
+            return error_response(
+                status_code=500,
+                code="internal_error",
+                message="Unexpected server error while running rule audit.",
+            )
+
+    response = {
+        "source_id": source_id,
+        "audit_id": str(uuid4()),
+        "evaluated_at": datetime.now(tz=timezone.utc).isoformat(),
+        **result,
+    }
+    if mode == "delta":
+        response["delta"] = delta
+    if include_timings:
+        response["timings"] = timings.to_dict()
+    (metrics if metrics is not None else DEFAULT_METRICS).observe_audit(timings)
+    store = audit_store if audit_store is not None else DEFAULT_AUDIT_STORE
+    store.save_audit(
+        StoredAudit(
+            source_id=source_id,
+            audit_id=response["audit_id"],
+            evaluated_at=response["evaluated_at"],
+            violations=result["violations"],
         )
+    )
+    return 200, response
 
 
-def post_rule_report(source_id: str, request_body: bytes) -> tuple[int, dict[str, Any]]:
+def post_rule_report(
+    source_id: str,
+    request_body: bytes,
+    audit_cache: AuditResultCache | None = None,
+    audit_store: InMemoryAuditStore | None = None,
+    rules: Sequence[str] | None = None,
+    limits: RequestLimits | None = None,
+) -> tuple[int, dict[str, Any]]:
     """Export report.json payload (same structure as audit) for download."""
-    audit_status, audit_response = post_rule_audit(source_id, request_body)
+    audit_status, audit_response = post_rule_audit(
+        source_id, request_body, audit_cache=audit_cache, audit_store=audit_store, rules=rules, limits=limits
+    )
     if audit_status != 200:
         return audit_status, audit_response
 
@@ -136,3 +328,125 @@ def post_rule_report(source_id: str, request_body: bytes) -> tuple[int, dict[str
         "violations": audit_response["violations"],
     }
     return 200, report
+
+
+def _stream_audit_records(
+    header: dict[str, Any],
+    canonical: Any,
+    timings: AuditTimings,
+    metrics: MetricsRegistry | None,
+    specs: list[RuleSpec],
+    limits: RequestLimits,
+) -> Iterator[dict[str, Any]]:
+    yield header
+    severity_counts: Counter[str] = Counter()
+    category_counts: Counter[str] = Counter()
+    rule_counts: Counter[str] = Counter()
+    try:
+        for evaluation in _iter_rule_evaluations(canonical, timings, specs):
+            limits.check_violations(sum(rule_counts.values()) + len(evaluation.violations))
+            for violation in evaluation.violations:
+                record = _build_violation_payload(evaluation.rule_id, violation)
+                severity_counts[record["severity"]] += 1
+                category_counts[record["category"]] += 1
+                rule_counts[record["rule_id"]] += 1
+                yield {"type": "violation", **record}
+    except LimitExceeded as exc:
+        _, envelope = exc.response()
+        yield {"type": "error", **envelope}
+        return
+    except Exception:
+        _, envelope = error_response(
+            status_code=500,
+            code="internal_error",
+            message="Unexpected server error while running rule audit.",
+        )
+        yield {"type": "error", **envelope}
+        return
+
+    total = sum(rule_counts.values())
+    yield {"type": "summary", **_audit_summary(total, severity_counts, category_counts, rule_counts)}
+    (metrics if metrics is not None else DEFAULT_METRICS).observe_audit(timings)
+
+
+def _start_stream(
+    source_id: str, request_body: bytes, timings: AuditTimings, rules: Sequence[str] | None, limits: RequestLimits
+):
+    """Validate and normalize up front so request errors still get a plain error envelope."""
+    if not source_id or not source_id.strip():
+        return error_response(
+            status_code=400,
+            code="invalid_source_id",
+            message="Path parameter `source_id` must be a non-empty string.",
+        ), None
+    rules_error = _rule_selection_error(rules)
+    if rules_error is not None:
+        return rules_error, None
+    try:
+        limits.check_body(request_body)
+        # Tokenizes the raw bytes directly; the payload is never materialized as a dict.
+        with timings.stage("normalization") as stage:
+            canonical, validation = normalize_figma_export_stream(request_body)
+            stage.token_count = len(canonical.tokens)
+        limits.check_tokens(len(canonical.tokens))
+    except LimitExceeded as exc:
+        return exc.response(), None
+    except ValueError:
+        return error_response(
+            status_code=400,
+            code="invalid_json",
+            message="Request body must be valid UTF-8 JSON.",
+        ), None
+    return None, (canonical, validation)
+
+
+def post_rule_audit_stream(
+    source_id: str,
+    request_body: bytes,
+    metrics: MetricsRegistry | None = None,
+    rules: Sequence[str] | None = None,
+    limits: RequestLimits | None = None,
+) -> tuple[int, dict[str, Any] | Iterator[dict[str, Any]]]:
+    """NDJSON variant of `post_rule_audit`: a header, violations as each rule produces them, then the summary.
+
+    Violations arrive in rule order rather than the sorted order of the JSON
+    response, and streamed audits are neither cached nor indexed for the
+    violations query, so memory stays flat however many violations there are.
+    """
+    timings = AuditTimings()
+    limits = limits if limits is not None else DEFAULT_REQUEST_LIMITS
+    error, normalized = _start_stream(source_id, request_body, timings, rules, limits)
+    if error is not None:
+        return error
+    canonical, validation = normalized
+    header = {
+        "type": "header",
+        "source_id": source_id,
+        "audit_id": str(uuid4()),
+        "evaluated_at": datetime.now(tz=timezone.utc).isoformat(),
+        "normalization": _normalization_summary(validation),
+    }
+    return 200, _stream_audit_records(header, canonical, timings, metrics, _select_rules(rules), limits)
+
+
+def post_rule_report_stream(
+    source_id: str,
+    request_body: bytes,
+    metrics: MetricsRegistry | None = None,
+    rules: Sequence[str] | None = None,
+    limits: RequestLimits | None = None,
+) -> tuple[int, dict[str, Any] | Iterator[dict[str, Any]]]:
+    """NDJSON variant of `post_rule_report`, with the same record layout as `post_rule_audit_stream`."""
+    timings = AuditTimings()
+    limits = limits if limits is not None else DEFAULT_REQUEST_LIMITS
+    error, normalized = _start_stream(source_id, request_body, timings, rules, limits)
+    if error is not None:
+        return error
+    canonical, _ = normalized
+    header = {
+        "type": "header",
+        "source_id": source_id,
+        "audit_id": str(uuid4()),
+        "generated_at": datetime.now(tz=timezone.utc).isoformat(),
+    }
+    return 200, _stream_audit_records(header, canonical, timings, metrics, _select_rules(rules), limits)
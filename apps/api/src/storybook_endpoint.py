@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone
 from typing import Any
 from uuid import uuid4
 
 from .error_envelope import error_response
+from .request_limits import parse_json_body
 
 _STORYBOOK_IMPORTS: dict[str, list[dict[str, Any]]] = {}
 
@@ -34,14 +34,9 @@ def post_storybook_source_import(source_id: str, request_body: bytes) -> tuple[i
             message="Path parameter `source_id` must be a non-empty string.",
         )
 
-    try:
-        payload = json.loads(request_body.decode("utf-8"))
-    except (UnicodeDecodeError, json.JSONDecodeError):
-        return error_response(
-            status_code=400,
-            code="invalid_json",
-            message="Request body must be valid UTF-8 JSON.",
-        )
+    payload, error = parse_json_body(request_body)
+    if error is not None:
+        return error
 
     if not isinstance(payload, dict):
         return error_response(
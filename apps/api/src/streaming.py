@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Iterable, Iterator
+
+from packages.contracts.serialization import dumps
+
+from .instrumentation import MetricsRegistry, StageTiming
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Stage name under which response encoding is reported to the metrics registry.
+SERIALIZE_STAGE = "serialize"
+
+
+def encode_json(content: Any, metrics: MetricsRegistry | None = None) -> bytes:
+    """Encode a response body, recording the time as a `serialize` stage when `metrics` is given."""
+    if metrics is None:
+        return dumps(content)
+    timing = StageTiming(stage=SERIALIZE_STAGE)
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    body = dumps(content)
+    timing.wall_seconds = time.perf_counter() - wall_start
+    timing.cpu_seconds = time.thread_time() - cpu_start
+    metrics.observe_stage(timing)
+    return body
+
+
+def iter_ndjson(records: Iterable[dict[str, Any]], metrics: MetricsRegistry | None = None) -> Iterator[bytes]:
+    """Encode records as newline-delimited JSON, one chunk per record.
+
+    With `metrics`, the encoding time of every record is summed into one
+    `serialize` stage, recorded when the stream ends or is closed early. Time
+    spent producing records is not included.
+    """
+    if metrics is None:
+        for record in records:
+            yield dumps(record) + b"\n"
+        return
+    timing = StageTiming(stage=SERIALIZE_STAGE)
+    try:
+        for record in records:
+            # Chunks may be pulled on different threads, so each record is timed on its own.
+            wall_start = time.perf_counter()
+            cpu_start = time.thread_time()
+            chunk = dumps(record) + b"\n"
+            timing.wall_seconds += time.perf_counter() - wall_start
+            timing.cpu_seconds += time.thread_time() - cpu_start
+            yield chunk
+    finally:
+        metrics.observe_stage(timing)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from typing import Any
+
+from packages.contracts import CanonicalToken
+from packages.rules.version_diff import diff_versions
+
+from .audit_cache import AuditResultCache
+from .cpu_executor import gc_paused
+from .error_envelope import error_response
+from .persistence import DEFAULT_IMPORT_STORE, TokenImportStore
+
+# Versions are immutable, so a diff between two of them never goes stale.
+DEFAULT_DIFF_CACHE = AuditResultCache(max_entries=128)
+
+
+def _token_entry(token: CanonicalToken) -> dict[str, Any]:
+    return {"path": token.path, "group": token.group, "token_type": token.token_type, "value": token.value}
+
+
+def get_version_diff(
+    source_id: str,
+    from_version_id: str,
+    to_version_id: str,
+    import_store: TokenImportStore | None = None,
+    diff_cache: AuditResultCache | None = None,
+) -> tuple[int, dict[str, Any]]:
+    """Framework-agnostic handler for GET /api/v1/sources/{source_id}/versions/{a}/diff/{b}.
+
+    Tokens identical in both versions are skipped by comparing manifest keys, so
+    only the tokens that differ are loaded and merged.
+    """
+    if not source_id or not source_id.strip():
+        return error_response(
+            status_code=400,
+            code="invalid_source_id",
+            message="Path parameter `source_id` must be a non-empty string.",
+        )
+
+    store = import_store if import_store is not None else DEFAULT_IMPORT_STORE
+    for version_id in (from_version_id, to_version_id):
+        version = store.get_version(version_id)
+        if version is None or version.source_id != source_id:
+            return error_response(
+                status_code=404,
+                code="version_not_found",
+                message=f"No token version `{version_id}` found for source `{source_id}`.",
+            )
+
+    cache = diff_cache if diff_cache is not None else DEFAULT_DIFF_CACHE
+    cache_key = f"diff:{from_version_id}:{to_version_id}"
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return 200, cached
+
+    manifests = []
+    for version_id in (from_version_id, to_version_id):
+        manifest = store.get_version_manifest(version_id)
+        if manifest is None:
+            return error_response(
+                status_code=422,
+                code="version_tokens_unavailable",
+                message=f"Token version `{version_id}` has no stored tokens to diff.",
+                details={"version_id": version_id},
+            )
+        manifests.append(manifest)
+
+    old_keys, new_keys = manifests
+    old_set, new_set = set(old_keys), set(new_keys)
+    only_old = [key for key in old_keys if key not in new_set]
+    only_new = [key for key in new_keys if key not in old_set]
+    # Everything loaded and built from here on lives until the response is returned.
+    with gc_paused():
+        tokens = store.get_tokens_by_key(only_old + only_new)
+        diff = diff_versions([tokens[key] for key in only_old], [tokens[key] for key in only_new])
+        response = {
+            "source_id": source_id,
+            "from_version_id": from_version_id,
+            "to_version_id": to_version_id,
+            "summary": {
+                "added": len(diff.added),
+                "removed": len(diff.removed),
+                "renamed": len(diff.renamed),
+                "changed": len(diff.changed),
+                "unchanged": len(old_keys) - len(only_old) + diff.unchanged,
+            },
+            "added": [_token_entry(token) for token in diff.added],
+            "removed": [_token_entry(token) for token in diff.removed],
+            "renamed": [
+                {
+                    "from_path": old.path,
+                    "to_path": new.path,
+                    "group": new.group,
+                    "token_type": new.token_type,
+                    "value": new.value,
+                }
+                for old, new in diff.renamed
+            ],
+            "changed": [
+                {
+                    "path": new.path,
+                    "group": new.group,
+                    "from": {"token_type": old.token_type, "value": old.value},
+                    "to": {"token_type": new.token_type, "value": new.value},
+                }
+                for old, new in diff.changed
+            ],
+        }
+    cache.put(cache_key, response)
+    return 200, response
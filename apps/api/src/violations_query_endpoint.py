@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from bisect import bisect_right
+from typing import Any
+
+from .audit_store import DEFAULT_AUDIT_STORE, INDEXED_FIELDS, InMemoryAuditStore
+from .error_envelope import error_response
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 500
+CURSOR_PREFIX = "v1:"
+
+
+def _encode_cursor(position: int) -> str:
+    return base64.urlsafe_b64encode(f"{CURSOR_PREFIX}{position}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> int | None:
+    try:
+        decoded = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if not decoded.startswith(CURSOR_PREFIX) or not decoded[len(CURSOR_PREFIX) :].isdigit():
+        return None
+    return int(decoded[len(CURSOR_PREFIX) :])
+
+
+def _split_values(raw: str) -> list[str]:
+    return [value.strip() for value in raw.split(",") if value.strip()]
+
+
+def get_audit_violations(
+    source_id: str,
+    audit_id: str,
+    query: dict[str, str] | None = None,
+    audit_store: InMemoryAuditStore | None = None,
+) -> tuple[int, dict[str, Any]]:
+    """Framework-agnostic handler for GET /api/v1/sources/{source_id}/audits/{audit_id}/violations.
+
+    Supported query keys: `severity`, `category`, `rule_id`, `code` (comma-separated
+    values are OR-ed), `path_prefix`, `q` (full-text word-prefix search), `cursor`
+    and `limit`. Filters are AND-ed and results keep the audit's sort order.
+    """
+    if not source_id or not source_id.strip():
+        return error_response(
+            status_code=400,
+            code="invalid_source_id",
+            message="Path parameter `source_id` must be a non-empty string.",
+        )
+
+    store = audit_store or DEFAULT_AUDIT_STORE
+    audit = store.get_audit(source_id, audit_id)
+    if audit is None:
+        return error_response(
+            status_code=404,
+            code="audit_not_found",
+            message=f"No stored audit `{audit_id}` for source `{source_id}`.",
+        )
+
+    query = query or {}
+    raw_limit = query.get("limit")
+    try:
+        limit = int(raw_limit) if raw_limit else DEFAULT_PAGE_LIMIT
+    except ValueError:
+        limit = 0
+    if limit < 1 or limit > MAX_PAGE_LIMIT:
+        return error_response(
+            status_code=400,
+            code="invalid_query",
+            message=f"`limit` must be an integer between 1 and {MAX_PAGE_LIMIT}.",
+        )
+
+    after: int | None = None
+    if query.get("cursor"):
+        after = _decode_cursor(query["cursor"])
+        if after is None:
+            return error_response(
+                status_code=400,
+                code="invalid_query",
+                message="`cursor` is not a valid pagination cursor.",
+            )
+
+    index = audit.index
+    filters: dict[str, Any] = {}
+    matches: set[int] | None = None
+    for name in INDEXED_FIELDS:
+        values = _split_values(query.get(name, ""))
+        if values:
+            filters[name] = values
+            field_matches = index.match_field(name, values)
+            matches = field_matches if matches is None else matches & field_matches
+
+    path_prefix = query.get("path_prefix")
+    if path_prefix:
+        filters["path_prefix"] = path_prefix
+        path_matches = index.match_path_prefix(path_prefix)
+        matches = path_matches if matches is None else matches & path_matches
+
+    search = query.get("q")
+    if search:
+        filters["q"] = search
+        search_matches = index.match_search(search)
+        if search_matches is not None:
+            matches = search_matches if matches is None else matches & search_matches
+
+    positions: range | list[int] = range(len(index)) if matches is None else sorted(matches)
+    start = bisect_right(positions, after) if after is not None else 0
+    page = positions[start : start + limit]
+    has_more = start + limit < len(positions)
+
+    return 200, {
+        "source_id": source_id,
+        "audit_id": audit_id,
+        "evaluated_at": audit.evaluated_at,
+        "filters": filters,
+        "total": len(positions),
+        "count": len(page),
+        "next_cursor": _encode_cursor(page[-1]) if has_more else None,
+        "violations": [index.violations[position] for position in page],
+    }
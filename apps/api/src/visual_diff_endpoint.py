@@ -1,11 +1,20 @@
 from __future__ import annotations
 
-import json
+import base64
+import os
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
+from . import pixel_diff
 from .error_envelope import error_response
+from .request_limits import parse_json_body
+
+SNAPSHOT_ROOT = Path(os.environ["QADMS_SNAPSHOT_ROOT"]) if os.environ.get("QADMS_SNAPSHOT_ROOT") else None
+ARTIFACT_DIR = (
+    Path(os.environ["QADMS_VISUAL_DIFF_ARTIFACT_DIR"]) if os.environ.get("QADMS_VISUAL_DIFF_ARTIFACT_DIR") else None
+)
 
 
 def _now_iso() -> str:
@@ -14,11 +23,76 @@ def _now_iso() -> str:
 
 def _diff_bytes(baseline: bytes, current: bytes) -> int:
     min_len = min(len(baseline), len(current))
-    mismatch = sum(1 for idx in range(min_len) if baseline[idx] != current[idx])
+    if not min_len:
+        return max(len(baseline), len(current))
+    # XOR as big integers so the comparison runs in C; equal bytes become zero bytes.
+    xor = int.from_bytes(baseline[:min_len], "big") ^ int.from_bytes(current[:min_len], "big")
+    mismatch = min_len - xor.to_bytes(min_len, "big").count(0)
     mismatch += abs(len(baseline) - len(current))
     return mismatch
 
 
+def _write_mask_artifact(diff_id: str, mask_png: bytes) -> str:
+    if ARTIFACT_DIR is None:
+        return pixel_diff.DATA_URI_PREFIX + base64.b64encode(mask_png).decode("ascii")
+    ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+    path = ARTIFACT_DIR / f"{diff_id}.png"
+    path.write_bytes(mask_png)
+    return path.resolve().as_uri()
+
+
+def _pixel_diff_response(
+    source_id: str,
+    payload: dict[str, Any],
+    baseline_png: bytes,
+    current_png: bytes,
+    threshold: float,
+    color_tolerance: int,
+    antialiasing: bool,
+) -> tuple[int, dict[str, Any]]:
+    try:
+        baseline = pixel_diff.decode_png(baseline_png)
+        current = pixel_diff.decode_png(current_png)
+    except pixel_diff.SnapshotError as exc:
+        return error_response(status_code=400, code="invalid_snapshot", message=str(exc))
+
+    result = pixel_diff.diff_images(
+        baseline,
+        current,
+        color_tolerance=color_tolerance,
+        detect_antialiasing=antialiasing,
+    )
+    diff_id = str(uuid4())
+    passed = result.diff_ratio <= threshold
+
+    response = {
+        "source_id": source_id,
+        "diff_id": diff_id,
+        "evaluated_at": _now_iso(),
+        "status": "pass" if passed else "fail",
+        "summary": {
+            "mode": "pixel",
+            "baseline_size": [int(baseline.shape[1]), int(baseline.shape[0])],
+            "current_size": [int(current.shape[1]), int(current.shape[0])],
+            "total_pixels": result.total_pixels,
+            "changed_pixels": result.changed_pixels,
+            "antialiased_pixels": result.antialiased_pixels,
+            "diff_ratio": round(result.diff_ratio, 6),
+            "threshold": threshold,
+            "color_tolerance": color_tolerance,
+            "region_count": len(result.regions),
+        },
+        "regions": [region.to_dict() for region in result.regions[: pixel_diff.MAX_REPORTED_REGIONS]],
+        "artifacts": {
+            "baseline_ref": payload.get("baseline_ref", "inline://baseline"),
+            "current_ref": payload.get("current_ref", "inline://current"),
+            "diff_ref": f"inline://diff/{source_id}/{result.changed_pixels}",
+            "diff_mask": _write_mask_artifact(diff_id, pixel_diff.encode_mask_png(result.mask)),
+        },
+    }
+    return 200, response
+
+
 def post_visual_diff_audit(source_id: str, request_body: bytes) -> tuple[int, dict[str, Any]]:
     if not source_id or not source_id.strip():
         return error_response(
@@ -27,14 +101,9 @@ def post_visual_diff_audit(source_id: str, request_body: bytes) -> tuple[int, di
             message="Path parameter `source_id` must be a non-empty string.",
         )
 
-    try:
-        payload = json.loads(request_body.decode("utf-8"))
-    except (UnicodeDecodeError, json.JSONDecodeError):
-        return error_response(
-            status_code=400,
-            code="invalid_json",
-            message="Request body must be valid UTF-8 JSON.",
-        )
+    payload, error = parse_json_body(request_body)
+    if error is not None:
+        return error
 
     if not isinstance(payload, dict):
         return error_response(
@@ -66,6 +135,45 @@ def post_visual_diff_audit(source_id: str, request_body: bytes) -> tuple[int, di
             message="`threshold` must be a number between 0 and 1.",
         )
 
+    color_tolerance = payload.get("color_tolerance", 0)
+    if isinstance(color_tolerance, bool) or not isinstance(color_tolerance, int) or not 0 <= color_tolerance <= 255:
+        return error_response(
+            status_code=400,
+            code="invalid_visual_diff_payload",
+            message="`color_tolerance` must be an integer between 0 and 255.",
+        )
+
+    antialiasing = payload.get("antialiasing", True)
+    if not isinstance(antialiasing, bool):
+        return error_response(
+            status_code=400,
+            code="invalid_visual_diff_payload",
+            message="`antialiasing` must be a boolean.",
+        )
+
+    try:
+        baseline_png = pixel_diff.load_png_snapshot(baseline_snapshot, SNAPSHOT_ROOT)
+        current_png = pixel_diff.load_png_snapshot(current_snapshot, SNAPSHOT_ROOT)
+    except pixel_diff.SnapshotError as exc:
+        return error_response(status_code=400, code="invalid_snapshot", message=str(exc))
+
+    if (baseline_png is None) != (current_png is None):
+        return error_response(
+            status_code=400,
+            code="invalid_visual_diff_payload",
+            message="`baseline_snapshot` and `current_snapshot` must both be PNG images or both be plain strings.",
+        )
+    if baseline_png is not None and current_png is not None:
+        if not pixel_diff.is_available():
+            return error_response(
+                status_code=501,
+                code="pixel_diff_unavailable",
+                message="Pixel diffs require numpy; install apps/api/requirements.txt.",
+            )
+        return _pixel_diff_response(
+            source_id, payload, baseline_png, current_png, float(threshold), color_tolerance, antialiasing
+        )
+
     baseline_bytes = baseline_snapshot.encode("utf-8")
     current_bytes = current_snapshot.encode("utf-8")
     changed_bytes = _diff_bytes(baseline_bytes, current_bytes)
@@ -79,6 +187,7 @@ def post_visual_diff_audit(source_id: str, request_body: bytes) -> tuple[int, di
         "evaluated_at": _now_iso(),
         "status": "pass" if passed else "fail",
         "summary": {
+            "mode": "bytes",
             "baseline_bytes": len(baseline_bytes),
             "current_bytes": len(current_bytes),
             "changed_bytes": changed_bytes,
@@ -0,0 +1,26 @@
+"""QADMS command-line tools.
+
+Usage:
+    python -m apps.cli audit design/tokens/ 'snapshots/**/*.json' --fail-on high
+"""
+
+from __future__ import annotations
+
+import sys
+
+from .audit import main as audit_main
+
+COMMANDS = {"audit": audit_main}
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in COMMANDS:
+        print(__doc__.strip(), file=sys.stderr)
+        print(f"\ncommands: {', '.join(COMMANDS)}", file=sys.stderr)
+        return 2
+    return COMMANDS[argv[0]](argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
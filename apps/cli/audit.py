@@ -0,0 +1,195 @@
+"""Audit token exports on disk without going through the HTTP API.
+
+Usage:
+    python -m apps.cli audit exports/                       # every *.json below a directory
+    python -m apps.cli audit 'history/**/tokens.json' a.json --rules A11Y_CONTRAST
+    python -m apps.cli audit exports/ --fail-on high --summary-only > results.ndjson
+
+Writes one NDJSON `result` line per file, in input order, then a `summary` line.
+Exits with 1 when a violation at or above `--fail-on` was found, 2 when a file
+could not be read or parsed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import mmap
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, Sequence
+
+from apps.api.src.rule_audit_endpoint import _build_audit_result
+from packages.contracts.serialization import dumps, loads
+from packages.rules.registry import DEFAULT_RULE_REGISTRY, UnknownRuleError
+
+SEVERITIES = ("low", "medium", "high", "critical")
+CATEGORIES = ("tokens", "a11y", "other")
+GLOB_CHARS = frozenset("*?[")
+
+# Files handed to a worker per round trip; keeps IPC overhead small for directories of small exports.
+CHUNK_SIZE = 16
+
+
+def expand_inputs(inputs: Iterable[str]) -> list[str]:
+    """Files, directories (every `*.json` below them) and globs, de-duplicated in the given order."""
+    paths: dict[str, None] = {}
+    for item in inputs:
+        if GLOB_CHARS & set(item):
+            matches = sorted(glob.glob(item, recursive=True))
+            paths.update(dict.fromkeys(match for match in matches if os.path.isfile(match)))
+        elif os.path.isdir(item):
+            paths.update(dict.fromkeys(str(path) for path in sorted(Path(item).rglob("*.json")) if path.is_file()))
+        else:
+            paths[item] = None
+    return list(paths)
+
+
+def load_export(path: str) -> Any:
+    """Parse a JSON file through a read-only memory map instead of copying it into a buffer first."""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            raise ValueError("File is empty.")
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            return loads(view)
+
+
+def audit_file(path: str, rule_ids: Sequence[str] | None, include_violations: bool = True) -> dict[str, Any]:
+    record: dict[str, Any] = {"type": "result", "path": path}
+    try:
+        payload = load_export(path)
+    except OSError as exc:
+        record["error"] = {"code": "unreadable_file", "message": exc.strerror or str(exc)}
+        return record
+    except ValueError as exc:
+        record["error"] = {"code": "invalid_json", "message": str(exc)}
+        return record
+
+    result = _build_audit_result(payload, rule_ids=rule_ids)
+    record["normalization"] = result["normalization"]
+    record["summary"] = result["summary"]
+    if include_violations:
+        record["violations"] = result["violations"]
+    return record
+
+
+def _init_worker() -> None:
+    # Files are already spread across processes; running each file's rules on threads would only contend.
+    DEFAULT_RULE_REGISTRY.max_workers = 1
+
+
+def iter_audits(
+    paths: list[str],
+    rule_ids: Sequence[str] | None = None,
+    include_violations: bool = True,
+    workers: int = 1,
+) -> Iterator[dict[str, Any]]:
+    """Audit `paths` across `workers` processes and yield their records in input order."""
+    args = ([rule_ids] * len(paths), [include_violations] * len(paths))
+    if workers <= 1 or len(paths) <= 1:
+        _init_worker()
+        yield from map(audit_file, paths, *args)
+        return
+
+    # Spawned workers match the batch audit pool and avoid forking a process that may run threads.
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker
+    ) as executor:
+        chunksize = max(1, min(CHUNK_SIZE, len(paths) // (workers * 4)))
+        yield from executor.map(audit_file, paths, *args, chunksize=chunksize)
+
+
+class AuditTotals:
+    """Running cross-file counts, so the summary never needs every result in memory."""
+
+    def __init__(self) -> None:
+        self.file_count = 0
+        self.failed = 0
+        self.total_violations = 0
+        self.by_severity = dict.fromkeys(SEVERITIES, 0)
+        self.by_category = dict.fromkeys(CATEGORIES, 0)
+        self.by_rule: dict[str, int] = {}
+
+    def add(self, record: dict[str, Any]) -> None:
+        self.file_count += 1
+        if "error" in record:
+            self.failed += 1
+            return
+        summary = record["summary"]
+        self.total_violations += summary["total_violations"]
+        for key, count in summary["by_severity"].items():
+            self.by_severity[key] = self.by_severity.get(key, 0) + count
+        for key, count in summary["by_category"].items():
+            self.by_category[key] = self.by_category.get(key, 0) + count
+        for key, count in summary["by_rule"].items():
+            self.by_rule[key] = self.by_rule.get(key, 0) + count
+
+    def reached(self, severity: str) -> bool:
+        threshold = SEVERITIES.index(severity)
+        return any(self.by_severity.get(level, 0) for level in SEVERITIES[threshold:])
+
+    def to_dict(self, elapsed_seconds: float) -> dict[str, Any]:
+        return {
+            "type": "summary",
+            "file_count": self.file_count,
+            "audited": self.file_count - self.failed,
+            "failed": self.failed,
+            "total_violations": self.total_violations,
+            "by_severity": self.by_severity,
+            "by_category": self.by_category,
+            "by_rule": dict(sorted(self.by_rule.items())),
+            "elapsed_seconds": round(elapsed_seconds, 3),
+            "files_per_minute": round(self.file_count * 60 / elapsed_seconds) if elapsed_seconds > 0 else None,
+        }
+
+
+def run_audit(
+    paths: list[str],
+    out: BinaryIO,
+    rule_ids: Sequence[str] | None = None,
+    include_violations: bool = True,
+    workers: int = 1,
+) -> AuditTotals:
+    started = time.perf_counter()
+    totals = AuditTotals()
+    for record in iter_audits(paths, rule_ids, include_violations, workers):
+        totals.add(record)
+        out.write(dumps(record) + b"\n")
+    out.write(dumps(totals.to_dict(time.perf_counter() - started)) + b"\n")
+    out.flush()
+    return totals
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m apps.cli audit", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("inputs", nargs="+", help="Export files, directories or glob patterns (quote `**` globs)")
+    parser.add_argument("--rules", help="Comma-separated rule ids to run; defaults to every rule")
+    parser.add_argument("--fail-on", choices=SEVERITIES, help="Exit 1 when a violation of this severity or higher is found")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: CPU count)")
+    parser.add_argument("--summary-only", action="store_true", help="Omit per-file violation lists from result lines")
+    args = parser.parse_args(argv)
+
+    rule_ids = None
+    if args.rules is not None:
+        rule_ids = [rule_id.strip() for rule_id in args.rules.split(",") if rule_id.strip()]
+        try:
+            DEFAULT_RULE_REGISTRY.select(rule_ids or None)
+        except UnknownRuleError as exc:
+            parser.error(f"{exc}. Available rules: {', '.join(DEFAULT_RULE_REGISTRY.rule_ids)}")
+        if not rule_ids:
+            parser.error("--rules must name at least one rule.")
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        parser.error("No input files matched.")
+
+    totals = run_audit(paths, sys.stdout.buffer, rule_ids, not args.summary_only, args.workers)
+    if args.fail_on is not None and totals.reached(args.fail_on):
+        return 1
+    return 2 if totals.failed else 0
@@ -0,0 +1 @@
+"""Synthetic export generators and throughput/memory benchmarks for QADMS."""
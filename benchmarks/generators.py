@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import colorsys
+import random
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional runtime dependency
+    np = None
+
+COLOR_FORMATS = ("hex", "hex8", "rgb", "rgba", "hsl")
+VIOLATION_KINDS = ("naming", "scale", "contrast", "semantic")
+
+# Share of generated tokens per Tokens Studio group.
+GROUP_WEIGHTS = (("color", 0.5), ("spacing", 0.25), ("typography", 0.15), ("radius", 0.1))
+_BRANCH_SEGMENTS = ("base", "core", "brand", "neutral", "alpha", "beta", "gamma", "delta")
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """Shape of a synthetic export.
+
+    `size` is the number of tokens, `depth` the number of path segments below
+    the group, and `violation_fraction` the share of tokens built to trip a
+    rule (naming, scale, contrast or semantic coverage, in rotation).
+    """
+
+    size: int = 1000
+    depth: int = 3
+    color_formats: tuple[str, ...] = ("hex",)
+    violation_fraction: float = 0.1
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.size < 1 or self.depth < 1:
+            raise ValueError("ExportSpec size and depth must be positive.")
+        if not 0 <= self.violation_fraction <= 1:
+            raise ValueError("ExportSpec violation_fraction must be between 0 and 1.")
+        unknown = set(self.color_formats) - set(COLOR_FORMATS)
+        if not self.color_formats or unknown:
+            raise ValueError(f"ExportSpec color_formats must be drawn from {COLOR_FORMATS}.")
+
+
+def format_color(rgb: tuple[int, int, int], color_format: str) -> str:
+    red, green, blue = rgb
+    if color_format == "hex":
+        return f"#{red:02x}{green:02x}{blue:02x}"
+    if color_format == "hex8":
+        return f"#{red:02x}{green:02x}{blue:02x}ff"
+    if color_format == "rgb":
+        return f"rgb({red}, {green}, {blue})"
+    if color_format == "rgba":
+        return f"rgba({red}, {green}, {blue}, 1)"
+    hue, lightness, saturation = colorsys.rgb_to_hls(red / 255, green / 255, blue / 255)
+    return f"hsl({round(hue * 360)}, {round(saturation * 100)}%, {round(lightness * 100)}%)"
+
+
+def _dark(rng: random.Random) -> tuple[int, int, int]:
+    return (rng.randrange(0, 48), rng.randrange(0, 48), rng.randrange(0, 48))
+
+
+def _light(rng: random.Random) -> tuple[int, int, int]:
+    return (rng.randrange(240, 256), rng.randrange(240, 256), rng.randrange(240, 256))
+
+
+def _set_path(root: dict[str, Any], segments: list[str], leaf: dict[str, Any]) -> None:
+    node = root
+    for segment in segments[:-1]:
+        node = node.setdefault(segment, {})
+    node[segments[-1]] = leaf
+
+
+def _pick_group(rng: random.Random) -> str:
+    roll = rng.random()
+    for group, weight in GROUP_WEIGHTS:
+        roll -= weight
+        if roll < 0:
+            return group
+    return GROUP_WEIGHTS[-1][0]
+
+
+def generate_tokens_studio_export(spec: ExportSpec) -> dict[str, Any]:
+    """Tokens Studio-style grouped JSON with `spec.size` leaf tokens."""
+    rng = random.Random(spec.seed)
+    payload: dict[str, Any] = {group: {} for group, _ in GROUP_WEIGHTS}
+    violation_count = 0
+
+    for idx in range(spec.size):
+        group = _pick_group(rng)
+        violating = rng.random() < spec.violation_fraction
+        kind = VIOLATION_KINDS[violation_count % len(VIOLATION_KINDS)] if violating else None
+        violation_count += violating
+        color_format = spec.color_formats[idx % len(spec.color_formats)]
+        branch = [rng.choice(_BRANCH_SEGMENTS) for _ in range(spec.depth - 1)]
+        leaf_name = f"t{idx}"
+
+        if kind == "naming":
+            leaf_name = f"Token {idx}"
+        if kind in ("contrast", "semantic"):
+            group = "color"
+        if kind == "scale" and group not in ("spacing", "typography"):
+            group = "spacing"
+
+        if group == "color":
+            # Text sits on light backgrounds, so dark text passes and light text fails contrast.
+            role = "semantic" if kind == "semantic" else rng.choice(("text", "bg"))
+            if kind == "contrast":
+                role = "text"
+            if role == "semantic":
+                segments = ["button", *branch[1:], leaf_name]
+                rgb = _dark(rng)
+            else:
+                segments = [role, *branch[1:], leaf_name]
+                rgb = _light(rng) if role == "bg" or kind == "contrast" else _dark(rng)
+            leaf = {"$value": format_color(rgb, color_format), "$type": "color"}
+        elif kind == "scale":
+            segments = [*branch, leaf_name]
+            leaf = {"$value": rng.choice(("auto", "-4", "0")), "$type": "dimension"}
+        else:
+            segments = [*branch, leaf_name]
+            leaf = {"$value": str(4 * rng.randrange(1, 33)), "$type": "dimension"}
+        _set_path(payload[group], segments, leaf)
+
+    return {group: tokens for group, tokens in payload.items() if tokens}
+
+
+def generate_theme_config_export(spec: ExportSpec) -> dict[str, Any]:
+    """FigmaDMS `theme-config.json` shape with `spec.size` entries in `colors[]`."""
+    rng = random.Random(spec.seed)
+    colors = []
+    for idx in range(spec.size):
+        violating = rng.random() < spec.violation_fraction
+        name = f"Text {idx}" if idx % 2 else f"Surface {idx}"
+        rgb = _light(rng) if violating or not idx % 2 else _dark(rng)
+        color_format = spec.color_formats[idx % len(spec.color_formats)]
+        entry: dict[str, Any] = {"name": name, "variable": f"--color-{idx}"}
+        entry["hsl" if color_format == "hsl" else "hex"] = format_color(rgb, color_format)
+        colors.append(entry)
+    return {"colors": colors, "uiTokens": {"radius": 12, "fontSize": 16}}
+
+
+def _encode_rgba_png(pixels: Any) -> bytes:
+    height, width = pixels.shape[:2]
+    rows = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    rows[:, 1:] = pixels.reshape(height, width * 4)
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    return (
+        _PNG_SIGNATURE
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows.tobytes(), 1))
+        + chunk(b"IEND", b"")
+    )
+
+
+def generate_png_pair(width: int, height: int, changed_fraction: float = 0.01, seed: int = 0) -> tuple[bytes, bytes]:
+    """Baseline/current PNG screenshots of a striped UI mock; the current one has a changed block."""
+    if np is None:
+        raise RuntimeError("numpy is required to generate PNG snapshots.")
+    rng = np.random.default_rng(seed)
+    baseline = np.full((height, width, 4), 250, dtype=np.uint8)
+    for top in range(0, height, 48):
+        baseline[top : top + 12, 16 : width - 16, :3] = rng.integers(0, 80, 3, dtype=np.uint8)
+    current = baseline.copy()
+    block = int((width * height * changed_fraction) ** 0.5)
+    if block:
+        current[height // 3 : height // 3 + block, width // 3 : width // 3 + block, :3] = (220, 38, 38)
+    return _encode_rgba_png(baseline), _encode_rgba_png(current)
@@ -0,0 +1,309 @@
+"""Run the QADMS benchmark suite and gate it against a stored baseline.
+
+Throughput is gated relative to a fixed pure-Python reference case measured in the same run, so a
+baseline recorded on one machine still applies on a faster or slower one.
+
+Usage:
+    python -m benchmarks.run                      # run and compare against benchmarks/baseline.json
+    python -m benchmarks.run --update-baseline    # record a new baseline
+    python -m benchmarks.run --only rule --size 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from apps.api.src.audit_cache import AuditResultCache
+from apps.api.src.audit_store import InMemoryAuditStore
+from apps.api.src.instrumentation import MetricsRegistry
+from apps.api.src.rule_audit_endpoint import post_rule_audit, post_rule_report
+from apps.api.src.visual_diff_endpoint import post_visual_diff_audit
+from benchmarks.generators import (
+    COLOR_FORMATS,
+    ExportSpec,
+    generate_png_pair,
+    generate_theme_config_export,
+    generate_tokens_studio_export,
+)
+from packages.rules import build_token_index, normalize_figma_export
+from packages.rules.registry import DEFAULT_RULE_REGISTRY
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+# 2: throughput is compared as `relative_throughput`, a multiple of the reference case's.
+BASELINE_VERSION = 2
+REFERENCE_CASE = "reference.python"
+REFERENCE_RECORDS = 2000
+MIN_SAMPLE_SECONDS = 0.02
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    unit: str
+    items: int
+    run: Callable[[], Any]
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    unit: str
+    items: int
+    best_seconds: float
+    peak_kib: float
+    reference_throughput: float | None = None
+
+    @property
+    def throughput(self) -> float:
+        return self.items / self.best_seconds if self.best_seconds > 0 else float("inf")
+
+    def to_dict(self) -> dict[str, Any]:
+        result = {
+            "unit": self.unit,
+            "items": self.items,
+            "best_seconds": round(self.best_seconds, 6),
+            "throughput": round(self.throughput, 1),
+            "peak_kib": round(self.peak_kib, 1),
+        }
+        if self.reference_throughput:
+            result["relative_throughput"] = round(self.throughput / self.reference_throughput, 6)
+        return result
+
+
+def reference_case() -> BenchmarkCase:
+    """Fixed interpreter-bound work (JSON round trip, sort, string building) that tracks machine speed."""
+    records = [
+        {"path": f"color.group{index % 37}.token{index}", "value": f"#{index * 2654435761 % 0xFFFFFF:06x}"}
+        for index in range(REFERENCE_RECORDS)
+    ]
+
+    def run() -> Any:
+        decoded = json.loads(json.dumps(records))
+        decoded.sort(key=lambda record: (record["value"], record["path"]))
+        return "".join(f"{record['path']}={record['value']};" for record in decoded)
+
+    return BenchmarkCase(REFERENCE_CASE, "records", REFERENCE_RECORDS, run)
+
+
+def build_cases(size: int, depth: int, violation_fraction: float, image_size: tuple[int, int]) -> list[BenchmarkCase]:
+    spec = ExportSpec(size=size, depth=depth, color_formats=COLOR_FORMATS, violation_fraction=violation_fraction)
+    studio = generate_tokens_studio_export(spec)
+    theme = generate_theme_config_export(ExportSpec(size=max(size // 10, 1), violation_fraction=violation_fraction))
+    studio_body = json.dumps(studio).encode("utf-8")
+    canonical, _ = normalize_figma_export(studio)
+    index = build_token_index(canonical)
+    token_count = len(canonical.tokens)
+
+    def audit(handler: Callable[..., Any]) -> Callable[[], Any]:
+        # A fresh cache per run measures the full pipeline instead of cache hits.
+        return lambda: handler(
+            "bench-source", studio_body, audit_cache=AuditResultCache(), audit_store=InMemoryAuditStore()
+        )
+
+    cases = [
+        BenchmarkCase("normalize.tokens_studio", "tokens", token_count, lambda: normalize_figma_export(studio)),
+        BenchmarkCase("normalize.theme_config", "tokens", len(theme["colors"]), lambda: normalize_figma_export(theme)),
+        BenchmarkCase("index", "tokens", token_count, lambda: build_token_index(canonical)),
+    ]
+    for spec in DEFAULT_RULE_REGISTRY.select():
+        cases.append(
+            BenchmarkCase(
+                f"rule.{spec.rule_id}", "tokens", token_count, lambda evaluate=spec.evaluate: evaluate(canonical, index)
+            )
+        )
+    cases.append(
+        BenchmarkCase(
+            "audit.post_rule_audit",
+            "tokens",
+            token_count,
+            lambda: post_rule_audit(
+                "bench-source",
+                studio_body,
+                audit_cache=AuditResultCache(),
+                audit_store=InMemoryAuditStore(),
+                metrics=MetricsRegistry(),
+            ),
+        )
+    )
+    cases.append(BenchmarkCase("audit.post_rule_report", "tokens", token_count, audit(post_rule_report)))
+
+    try:
+        baseline_png, current_png = generate_png_pair(*image_size)
+    except RuntimeError:
+        return cases
+    diff_body = json.dumps(
+        {
+            "baseline_snapshot": base64.b64encode(baseline_png).decode("ascii"),
+            "current_snapshot": base64.b64encode(current_png).decode("ascii"),
+            "threshold": 0.05,
+        }
+    ).encode("utf-8")
+    cases.append(
+        BenchmarkCase(
+            "visual_diff.pixel",
+            "pixels",
+            image_size[0] * image_size[1],
+            lambda: post_visual_diff_audit("bench-source", diff_body),
+        )
+    )
+    return cases
+
+
+def _time_per_run(run: Callable[[], Any], loops: int) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(loops):
+        run()
+    return (time.perf_counter() - start) / loops
+
+
+def _loops_for(run: Callable[[], Any]) -> int:
+    """Runs per timed sample so that short cases are not dominated by timer and scheduler noise."""
+    start = time.perf_counter()
+    run()  # also the warm-up
+    return max(1, int(MIN_SAMPLE_SECONDS / max(time.perf_counter() - start, 1e-9)))
+
+
+def measure(case: BenchmarkCase, repeat: int, reference: BenchmarkCase | None = None) -> BenchmarkResult:
+    """Best time per run over `repeat` samples.
+
+    With a `reference`, its samples are interleaved with the case's, so both see the same machine
+    load and the ratio of their throughputs stays stable on a noisy host.
+    """
+    loops = _loops_for(case.run)
+    reference_loops = _loops_for(reference.run) if reference is not None else 0
+    best = reference_best = float("inf")
+    for _ in range(repeat):
+        if reference is not None:
+            reference_best = min(reference_best, _time_per_run(reference.run, reference_loops))
+        best = min(best, _time_per_run(case.run, loops))
+
+    # Peak memory gets its own run: tracemalloc slows allocation-heavy code down too much to time it.
+    gc.collect()
+    tracemalloc.start()
+    try:
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    reference_throughput = reference.items / reference_best if reference is not None else None
+    return BenchmarkResult(case.name, case.unit, case.items, best, peak / 1024, reference_throughput)
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    *,
+    throughput_tolerance: float,
+    memory_tolerance: float,
+) -> list[str]:
+    """Return one message per case that regressed beyond the tolerances.
+
+    Throughput is compared as a multiple of the reference case's throughput in the same run.
+    """
+    failures = []
+    for name, result in sorted(results.items()):
+        expected = baseline.get(name)
+        if name == REFERENCE_CASE or expected is None or expected.get("items") != result["items"]:
+            continue
+        if "relative_throughput" in result and "relative_throughput" in expected:
+            floor = expected["relative_throughput"] * (1 - throughput_tolerance)
+            if result["relative_throughput"] < floor:
+                failures.append(
+                    f"{name}: {result['relative_throughput']:.4f}x reference throughput is below "
+                    f"{floor:.4f}x (baseline {expected['relative_throughput']:.4f}x)"
+                )
+        ceiling = expected["peak_kib"] * (1 + memory_tolerance)
+        if result["peak_kib"] > ceiling:
+            failures.append(
+                f"{name}: peak {result['peak_kib']:.1f} KiB is above {ceiling:.1f} (baseline {expected['peak_kib']:.1f})"
+            )
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=2000, help="Tokens in the generated Tokens Studio export")
+    parser.add_argument("--depth", type=int, default=3, help="Path segments below each group")
+    parser.add_argument("--violation-fraction", type=float, default=0.1)
+    parser.add_argument("--image-size", default="1920x1080", help="Visual diff snapshot size, WIDTHxHEIGHT")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case; the fastest counts")
+    parser.add_argument("--only", default="", help="Run only cases whose name starts with this prefix")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed throughput drop (fraction)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.2, help="Allowed peak memory growth (fraction)")
+    parser.add_argument("--output", type=Path, help="Also write the JSON results here")
+    args = parser.parse_args(argv)
+
+    width, height = (int(part) for part in args.image_size.lower().split("x"))
+    cases = [
+        case
+        for case in build_cases(args.size, args.depth, args.violation_fraction, (width, height))
+        if case.name.startswith(args.only)
+    ]
+
+    # Every case's throughput is gated relative to the reference, sampled alongside it.
+    reference = reference_case()
+    reference_result = measure(reference, args.repeat)
+    results: dict[str, dict[str, Any]] = {REFERENCE_CASE: reference_result.to_dict()}
+    print(f"{REFERENCE_CASE:<40} {reference_result.throughput:>14,.0f} records/s")
+    for case in cases:
+        result = measure(case, args.repeat, reference)
+        results[case.name] = result.to_dict()
+        print(
+            f"{case.name:<40} {result.throughput:>14,.0f} {case.unit}/s"
+            f" {result.best_seconds * 1000:>10.2f} ms {result.peak_kib:>12,.0f} KiB peak"
+        )
+
+    report = {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "parameters": {
+            "size": args.size,
+            "depth": args.depth,
+            "violation_fraction": args.violation_fraction,
+            "image_size": args.image_size,
+        },
+        "cases": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("version") != BASELINE_VERSION:
+        print("Baseline uses an older format; run with --update-baseline to record a new one.")
+        return 0
+    if baseline.get("parameters") != report["parameters"]:
+        print("Baseline was recorded with different parameters; skipping the regression gate.")
+        return 0
+    failures = compare(
+        results,
+        baseline.get("cases", {}),
+        throughput_tolerance=args.tolerance,
+        memory_tolerance=args.memory_tolerance,
+    )
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from typing import Any
 
+from .serialization import dataclass_encoder
+
 
 @dataclass
 class SourceRecord:
@@ -12,7 +14,7 @@ class SourceRecord:
     updated_at: str
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return _encode_source(self)
 
 
 @dataclass
@@ -27,4 +29,8 @@ class TokenVersionRecord:
     validation_valid: bool
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return _encode_version(self)
+
+
+_encode_source = dataclass_encoder(SourceRecord)
+_encode_version = dataclass_encoder(TokenVersionRecord)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from typing import Any, Literal
 
+from .serialization import dataclass_encoder
+
 RuleStatus = Literal["pass", "fail"]
 Severity = Literal["low", "medium", "high", "critical"]
 
@@ -19,7 +21,10 @@ class RuleViolation:
     fix_hint: dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return _encode_violation(self)
+
+
+_encode_violation = dataclass_encoder(RuleViolation)
 
 
 @dataclass
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+from dataclasses import fields
+from operator import attrgetter
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional runtime dependency
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+_ENCODERS: dict[type, Callable[[Any], dict[str, Any]]] = {}
+
+
+def dataclass_encoder(cls: type) -> Callable[[Any], dict[str, Any]]:
+    """Shallow `to_dict` for a flat dataclass, built once per class.
+
+    Unlike `dataclasses.asdict` nothing is deep-copied: nested dicts and lists
+    (evidence, token counts, values) are shared with the instance, so callers
+    must treat the result as read-only or copy what they mutate.
+    """
+    encoder = _ENCODERS.get(cls)
+    if encoder is None:
+        names = tuple(field.name for field in fields(cls))
+        getter = attrgetter(*names)
+        if len(names) == 1:
+            encoder = lambda obj: {names[0]: getter(obj)}  # noqa: E731
+        else:
+            encoder = lambda obj: dict(zip(names, getter(obj)))  # noqa: E731
+        _ENCODERS[cls] = encoder
+    return encoder
+
+
+def dumps(value: Any, sort_keys: bool = False) -> bytes:
+    """Compact UTF-8 JSON, via orjson when installed; `sort_keys` makes the bytes independent of dict order."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SORT_KEYS if sort_keys else None)
+        except TypeError:
+            # Integers beyond 64 bits and other values orjson rejects still encode with the stdlib.
+            pass
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys).encode("utf-8")
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
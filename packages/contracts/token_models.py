@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
+import sys
+from dataclasses import dataclass, field
 from typing import Any
 
+from .serialization import dataclass_encoder
+
 
 @dataclass
 class ValidationIssue:
@@ -10,6 +13,9 @@ class ValidationIssue:
     message: str
 
 
+_encode_issue = dataclass_encoder(ValidationIssue)
+
+
 @dataclass
 class ValidationReport:
     valid: bool = True
@@ -26,13 +32,24 @@ class ValidationReport:
     def to_dict(self) -> dict[str, Any]:
         return {
             "valid": self.valid,
-            "errors": [asdict(issue) for issue in self.errors],
-            "warnings": [asdict(issue) for issue in self.warnings],
+            "errors": [_encode_issue(issue) for issue in self.errors],
+            "warnings": [_encode_issue(issue) for issue in self.warnings],
         }
 
 
-@dataclass
+# Longer string values are rarely repeated, so interning them would only grow the intern table.
+MAX_INTERNED_VALUE_LENGTH = 64
+
+
+@dataclass(slots=True, init=False)
 class CanonicalToken:
+    """One normalized token.
+
+    Slotted, and the low-cardinality fields (group, type, source, and short
+    string values such as color literals) are interned so large exports share
+    one copy of each instead of one per token.
+    """
+
     group: str
     path: str
     name: str
@@ -40,8 +57,25 @@ class CanonicalToken:
     value: Any
     source: str = "figma_export"
 
+    # Written out rather than generated with a __post_init__: stores decode every token they read
+    # through here, and inlining the interning takes about a third off each construction.
+    def __init__(
+        self, group: str, path: str, name: str, token_type: str, value: Any, source: str = "figma_export"
+    ) -> None:
+        self.group = sys.intern(group) if type(group) is str else group
+        self.path = path
+        self.name = name
+        self.token_type = sys.intern(token_type) if type(token_type) is str else token_type
+        self.value = (
+            sys.intern(value) if type(value) is str and len(value) <= MAX_INTERNED_VALUE_LENGTH else value
+        )
+        self.source = sys.intern(source) if type(source) is str else source
+
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return _encode_token(self)
+
+
+_encode_token = dataclass_encoder(CanonicalToken)
 
 
 @dataclass
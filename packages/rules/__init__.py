@@ -2,16 +2,26 @@
 
 from .a11y_contrast_rule import evaluate_a11y_contrast
 from .demo_rule import evaluate_token_coverage
-from .figma_adapter import normalize_figma_export
+from .figma_adapter import build_tokens_studio_export, normalize_figma_export
+from .figma_stream_adapter import normalize_figma_export_stream
+from .token_aliases import AliasResolver, resolve_token_aliases
+from .token_index import IndexedToken, TokenIndex, build_token_index
 from .tokens_naming_rule import evaluate_tokens_naming
 from .tokens_scale_rule import evaluate_tokens_scale
 from .tokens_semantic_coverage_rule import evaluate_tokens_semantic_coverage
 
 __all__ = [
+    "AliasResolver",
+    "IndexedToken",
+    "TokenIndex",
+    "build_token_index",
+    "build_tokens_studio_export",
     "evaluate_a11y_contrast",
     "evaluate_token_coverage",
     "evaluate_tokens_naming",
     "evaluate_tokens_semantic_coverage",
     "evaluate_tokens_scale",
     "normalize_figma_export",
+    "normalize_figma_export_stream",
+    "resolve_token_aliases",
 ]
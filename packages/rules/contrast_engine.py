@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+from packages.rules.token_values import relative_luminance
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional runtime dependency
+    np = None
+
+RGB = tuple[int, int, int]
+
+# Below this many text x background pairs the NumPy setup cost outweighs the win.
+VECTORIZE_MIN_PAIRS = 256
+# Upper bound on contrast matrix cells materialized at once (~32 MB of float64).
+MAX_BLOCK_CELLS = 4_000_000
+
+
+def contrast_matrix(text_rgbs: Sequence[RGB], bg_rgbs: Sequence[RGB]) -> list[list[float]]:
+    """Rounded contrast ratio for every text (row) x background (column) pair."""
+    return luminance_contrast_matrix(_luminances(text_rgbs), _luminances(bg_rgbs))
+
+
+def luminance_contrast_matrix(text_lums: Sequence[float], bg_lums: Sequence[float]) -> list[list[float]]:
+    """`contrast_matrix` over relative luminances, e.g. the ones the color literal cache stores."""
+    if np is not None and len(text_lums) * len(bg_lums) >= VECTORIZE_MIN_PAIRS:
+        text_array = np.asarray(text_lums, dtype=np.float64)
+        bg_array = np.asarray(bg_lums, dtype=np.float64)
+        return [[round(ratio, 3) for ratio in row] for row in _ratio_block(text_array, bg_array).tolist()]
+    return [[_ratio(text_l, bg_l) for bg_l in bg_lums] for text_l in text_lums]
+
+
+def min_contrast_per_row(text_rgbs: Sequence[RGB], bg_rgbs: Sequence[RGB]) -> list[tuple[float, int]]:
+    """Lowest rounded contrast ratio per text color and the first background index reaching it.
+
+    Matches a left-to-right scan that keeps the first background with a strictly
+    lower rounded ratio, which is what `evaluate_a11y_contrast` reports.
+    """
+    return min_luminance_contrast_per_row(_luminances(text_rgbs), _luminances(bg_rgbs))
+
+
+def min_luminance_contrast_per_row(text_lums: Sequence[float], bg_lums: Sequence[float]) -> list[tuple[float, int]]:
+    """`min_contrast_per_row` over relative luminances."""
+    if not bg_lums:
+        raise ValueError("At least one background color is required.")
+    if np is not None and len(text_lums) * len(bg_lums) >= VECTORIZE_MIN_PAIRS:
+        return _min_contrast_numpy(text_lums, bg_lums)
+    return _min_contrast_python(text_lums, bg_lums)
+
+
+def _luminances(rgbs: Sequence[RGB]) -> list[float]:
+    return [relative_luminance(rgb) for rgb in rgbs]
+
+
+def _ratio(l1: float, l2: float) -> float:
+    lighter = max(l1, l2)
+    darker = min(l1, l2)
+    return round((lighter + 0.05) / (darker + 0.05), 3)
+
+
+def _min_contrast_python(text_lums: Sequence[float], bg_lum: Sequence[float]) -> list[tuple[float, int]]:
+    results: list[tuple[float, int]] = []
+    for text_l in text_lums:
+        best_ratio = _ratio(text_l, bg_lum[0])
+        best_index = 0
+        for bg_index in range(1, len(bg_lum)):
+            ratio = _ratio(text_l, bg_lum[bg_index])
+            if ratio < best_ratio:
+                best_ratio, best_index = ratio, bg_index
+        results.append((best_ratio, best_index))
+    return results
+
+
+def _ratio_block(text_lum, bg_lum):
+    text_col = text_lum[:, None]
+    bg_row = bg_lum[None, :]
+    return (np.maximum(text_col, bg_row) + 0.05) / (np.minimum(text_col, bg_row) + 0.05)
+
+
+def _min_contrast_numpy(text_lums: Sequence[float], bg_lums: Sequence[float]) -> list[tuple[float, int]]:
+    text_lum = np.asarray(text_lums, dtype=np.float64)
+    bg_lum = np.asarray(bg_lums, dtype=np.float64)
+    rows_per_block = max(1, MAX_BLOCK_CELLS // len(bg_lums))
+    results: list[tuple[float, int]] = []
+
+    for start in range(0, len(text_lum), rows_per_block):
+        block = _ratio_block(text_lum[start : start + rows_per_block], bg_lum)
+        row_minimums = block.min(axis=1)
+        for row, row_min in zip(block, row_minimums.tolist()):
+            best_ratio = round(row_min, 3)
+            # Rounding can tie several backgrounds; the scan keeps the first one.
+            for bg_index in np.flatnonzero(row <= row_min + 0.001).tolist():
+                if round(float(row[bg_index]), 3) == best_ratio:
+                    results.append((best_ratio, bg_index))
+                    break
+    return results
@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field, replace
+from typing import Any, Iterable, Sequence
+
+from packages.contracts import CanonicalToken, CanonicalTokenModel, RuleEvaluation, RuleViolation
+from packages.rules.a11y_contrast_rule import RULE_ID as CONTRAST_RULE_ID
+from packages.rules.a11y_contrast_rule import evaluate_contrast_row, is_background_entry, is_text_entry
+from packages.rules.contrast_engine import luminance_contrast_matrix, min_luminance_contrast_per_row
+from packages.rules.registry import DEFAULT_RULE_REGISTRY, RuleSpec
+from packages.rules.token_index import COLOR_GROUP, IndexedToken, index_token
+from packages.rules.tokens_naming_rule import RULE_ID as NAMING_RULE_ID
+from packages.rules.tokens_naming_rule import evaluate_token_naming
+from packages.rules.tokens_scale_rule import RULE_ID as SCALE_RULE_ID
+from packages.rules.tokens_scale_rule import TARGET_GROUPS, evaluate_scale_group
+from packages.rules.tokens_semantic_coverage_rule import RULE_ID as SEMANTIC_RULE_ID
+from packages.rules.tokens_semantic_coverage_rule import evaluate_semantic_root, semantic_scope
+
+# Batches larger than this rebuild sorted path lists instead of bisecting item by item.
+_BULK_UPDATE_THRESHOLD = 64
+# Rules whose results are kept per scope; any other selected rule is re-run in full when tokens change.
+SCOPED_RULE_IDS = (NAMING_RULE_ID, SCALE_RULE_ID, SEMANTIC_RULE_ID, CONTRAST_RULE_ID)
+
+
+@dataclass
+class TokenDelta:
+    """Paths that differ between two canonical models; `full` marks a from-scratch evaluation."""
+
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    full: bool = False
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "full": self.full,
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "changed": len(self.changed),
+        }
+
+
+def is_path_sorted(tokens: Sequence[CanonicalToken]) -> bool:
+    """True when paths are strictly increasing, i.e. sorted and unique."""
+    return all(tokens[idx].path < tokens[idx + 1].path for idx in range(len(tokens) - 1))
+
+
+def diff_tokens(old: Sequence[CanonicalToken], new: Sequence[CanonicalToken]) -> TokenDelta:
+    """Sorted merge of two strictly path-ordered token lists."""
+    delta = TokenDelta()
+    old_idx = new_idx = 0
+    while old_idx < len(old) and new_idx < len(new):
+        old_token, new_token = old[old_idx], new[new_idx]
+        if old_token.path == new_token.path:
+            if old_token != new_token:
+                delta.changed.append(new_token.path)
+            old_idx += 1
+            new_idx += 1
+        elif old_token.path < new_token.path:
+            delta.removed.append(old_token.path)
+            old_idx += 1
+        else:
+            delta.added.append(new_token.path)
+            new_idx += 1
+    delta.removed.extend(token.path for token in old[old_idx:])
+    delta.added.extend(token.path for token in new[new_idx:])
+    return delta
+
+
+def _update_sorted(paths: list[str], removed: set[str], added: Iterable[str]) -> list[str]:
+    added = sorted(added)
+    if len(removed) + len(added) > _BULK_UPDATE_THRESHOLD:
+        # Two sorted runs: Timsort merges them in linear time.
+        return sorted([path for path in paths if path not in removed] + added)
+    for path in removed:
+        position = bisect_left(paths, path)
+        if position < len(paths) and paths[position] == path:
+            del paths[position]
+    for path in added:
+        insort(paths, path)
+    return paths
+
+
+def _renumber(rule_id: str, scopes: Iterable[list[RuleViolation]]) -> list[RuleViolation]:
+    """Flatten scope results into rule order, copying only violations whose id shifted.
+
+    Copies are written back to their scope so the next audit reuses them; the
+    violation objects themselves are never mutated.
+    """
+    violations: list[RuleViolation] = []
+    for scope in scopes:
+        for position, violation in enumerate(scope):
+            violation_id = f"{rule_id}:{len(violations) + 1}"
+            if violation.violation_id != violation_id:
+                violation = scope[position] = replace(violation, violation_id=violation_id)
+            violations.append(violation)
+    return violations
+
+
+def full_evaluations(canonical: CanonicalTokenModel, specs: Sequence[RuleSpec] | None = None) -> list[RuleEvaluation]:
+    """Evaluate `specs` (default: every registered rule) from scratch, in order."""
+    specs = list(specs) if specs is not None else DEFAULT_RULE_REGISTRY.select()
+    precomputed = DEFAULT_RULE_REGISTRY.prepare(canonical, specs)
+    return [spec.evaluate(canonical, *(precomputed[name] for name in spec.requires)) for spec in specs]
+
+
+class DeltaAuditState:
+    """Rule results for one source, kept per scope and updated from token deltas.
+
+    `evaluate` diffs a new canonical model against the previous one and re-runs
+    only the affected scopes of the selected rules: naming per token, scale per
+    group, semantic coverage per root and contrast per text row, with new or
+    changed backgrounds checked as extra columns. Selected rules without scopes
+    are re-run in full whenever tokens change. Results equal a full evaluation
+    of `specs` (default: every registered rule).
+    """
+
+    def __init__(self, specs: Sequence[RuleSpec] | None = None) -> None:
+        self.specs = list(specs) if specs is not None else DEFAULT_RULE_REGISTRY.select()
+        self.rule_ids = frozenset(spec.rule_id for spec in self.specs)
+        self._unscoped = [spec for spec in self.specs if spec.rule_id not in SCOPED_RULE_IDS]
+        self.lock = threading.Lock()
+        self.tokens: list[CanonicalToken] = []
+        self.last_delta: TokenDelta | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.tokens = []
+        self._entries: dict[str, IndexedToken] = {}
+        self._group_paths: dict[str, list[str]] = {}
+        self._naming: dict[str, list[RuleViolation]] = {}
+        self._scale: dict[str, list[RuleViolation]] = {}
+        self._root_candidates: dict[str, dict[str, str | None]] = {}
+        self._semantic: dict[str, list[RuleViolation]] = {}
+        self._text_paths: list[str] = []
+        self._bg_paths: list[str] = []
+        self._parseable_bg_paths: list[str] = []
+        self._row_minimums: dict[str, tuple[float, str]] = {}
+        self._contrast: dict[str, list[RuleViolation]] = {}
+        self._unscoped_results: dict[str, RuleEvaluation] = {}
+
+    def evaluate(self, canonical: CanonicalTokenModel) -> list[RuleEvaluation]:
+        """Evaluate the selected rules for `canonical`, reusing results for unchanged scopes."""
+        tokens = canonical.tokens
+        if not is_path_sorted(tokens):
+            # Scopes are keyed by path, so duplicate paths need the full evaluators.
+            self._reset()
+            self.last_delta = TokenDelta(added=[token.path for token in tokens], full=True)
+            return full_evaluations(canonical, self.specs)
+
+        full = not self.tokens
+        delta = diff_tokens(self.tokens, tokens)
+        delta.full = full
+        self.last_delta = delta
+        if delta:
+            self._apply(tokens, delta)
+        if delta or delta.full:
+            self._evaluate_unscoped(canonical)
+        self.tokens = list(tokens)
+        return self._assemble()
+
+    def evaluate_paths(self, canonical: CanonicalTokenModel, paths: Iterable[str]) -> list[RuleEvaluation]:
+        """`evaluate` for callers that know only `paths` can differ from the previous model.
+
+        Both models must be strictly path-sorted. The delta is read at those
+        paths instead of merging the two token lists, so its cost follows the
+        number of paths rather than the model size.
+        """
+        if not self.tokens:
+            return self.evaluate(canonical)
+        tokens = canonical.tokens
+        delta = TokenDelta()
+        for path in sorted(set(paths)):
+            old_token = self._token_at(self.tokens, path)
+            new_token = self._token_at(tokens, path)
+            if old_token is None:
+                if new_token is not None:
+                    delta.added.append(path)
+            elif new_token is None:
+                delta.removed.append(path)
+            elif old_token != new_token:
+                delta.changed.append(path)
+        self.last_delta = delta
+        if delta:
+            self._apply(tokens, delta)
+            self._evaluate_unscoped(canonical)
+        self.tokens = list(tokens)
+        return self._assemble()
+
+    @staticmethod
+    def _token_at(tokens: Sequence[CanonicalToken], path: str) -> CanonicalToken | None:
+        position = bisect_left(tokens, path, key=lambda token: token.path)
+        return tokens[position] if position < len(tokens) and tokens[position].path == path else None
+
+    def _apply(self, tokens: Sequence[CanonicalToken], delta: TokenDelta) -> None:
+        new_by_path = {token.path: token for token in tokens} if len(delta) > _BULK_UPDATE_THRESHOLD else None
+        previous: dict[str, IndexedToken] = {}
+        for path in delta.removed:
+            previous[path] = self._entries.pop(path)
+        for path in delta.changed:
+            previous[path] = self._entries[path]
+        dirty = delta.added + delta.changed
+        if new_by_path is None:
+            new_by_path = {token.path: token for token in self._tokens_at(tokens, dirty)}
+        for path in dirty:
+            self._entries[path] = index_token(new_by_path[path])
+
+        groups_removed: dict[str, set[str]] = {}
+        groups_added: dict[str, list[str]] = {}
+        for path in delta.removed:
+            groups_removed.setdefault(previous[path].token.group, set()).add(path)
+        for path in delta.added:
+            groups_added.setdefault(self._entries[path].token.group, []).append(path)
+        for group in groups_removed.keys() | groups_added.keys():
+            paths = _update_sorted(
+                self._group_paths.get(group, []), groups_removed.get(group, set()), groups_added.get(group, [])
+            )
+            if paths:
+                self._group_paths[group] = paths
+            else:
+                self._group_paths.pop(group, None)
+
+        rule_ids = self.rule_ids
+        if NAMING_RULE_ID in rule_ids:
+            self._update_naming(delta.removed, dirty)
+        if SCALE_RULE_ID in rule_ids:
+            touched_groups = {previous[path].token.group for path in previous}
+            touched_groups.update(self._entries[path].token.group for path in dirty)
+            self._update_scale(touched_groups)
+        if SEMANTIC_RULE_ID in rule_ids:
+            self._update_semantic(delta, previous)
+        if CONTRAST_RULE_ID in rule_ids:
+            self._update_contrast(delta, previous)
+
+    def _evaluate_unscoped(self, canonical: CanonicalTokenModel) -> None:
+        if self._unscoped:
+            for evaluation in full_evaluations(canonical, self._unscoped):
+                self._unscoped_results[evaluation.rule_id] = evaluation
+
+    @staticmethod
+    def _tokens_at(tokens: Sequence[CanonicalToken], paths: list[str]) -> list[CanonicalToken]:
+        paths_sorted = sorted(paths)
+        found = []
+        lo = 0
+        for path in paths_sorted:
+            lo = bisect_left(tokens, path, lo=lo, key=lambda token: token.path)
+            found.append(tokens[lo])
+        return found
+
+    def _update_naming(self, removed: list[str], dirty: list[str]) -> None:
+        for path in removed:
+            self._naming.pop(path, None)
+        for path in dirty:
+            violations = evaluate_token_naming(self._entries[path])
+            if violations:
+                self._naming[path] = violations
+            else:
+                self._naming.pop(path, None)
+
+    def _update_scale(self, groups: set[str]) -> None:
+        for group in groups & set(TARGET_GROUPS):
+            entries = [self._entries[path] for path in self._group_paths.get(group, [])]
+            violations = evaluate_scale_group(group, entries)
+            if violations:
+                self._scale[group] = violations
+            else:
+                self._scale.pop(group, None)
+
+    def _color_entry(self, path: str) -> IndexedToken | None:
+        entry = self._entries.get(path)
+        return entry if entry is not None and entry.token.group == COLOR_GROUP else None
+
+    def _update_semantic(self, delta: TokenDelta, previous: dict[str, IndexedToken]) -> None:
+        affected: set[str] = set()
+        for path, entry in previous.items():
+            scope = semantic_scope(entry) if entry.token.group == COLOR_GROUP else None
+            if scope is not None:
+                root = scope[0]
+                candidates = self._root_candidates[root]
+                del candidates[path]
+                if not candidates:
+                    del self._root_candidates[root]
+                affected.add(root)
+        for path in delta.added + delta.changed:
+            entry = self._color_entry(path)
+            scope = semantic_scope(entry) if entry is not None else None
+            if scope is not None:
+                root, state = scope
+                self._root_candidates.setdefault(root, {})[path] = state
+                affected.add(root)
+        # A token at a root path decides MISSING_BASE_STATE for that root.
+        affected.update(path for path in delta.added + delta.removed + delta.changed if path in self._root_candidates)
+
+        for root in affected:
+            candidates = self._root_candidates.get(root)
+            if not candidates:
+                self._semantic.pop(root, None)
+                continue
+            representative = self._entries[min(candidates)].token
+            states = {state for state in candidates.values() if state}
+            root_entry = self._color_entry(root)
+            violations = evaluate_semantic_root(
+                root, representative, states, root_entry.token if root_entry else None
+            )
+            if violations:
+                self._semantic[root] = violations
+            else:
+                self._semantic.pop(root, None)
+
+    def _update_contrast(self, delta: TokenDelta, previous: dict[str, IndexedToken]) -> None:
+        old_first_bg = self._bg_paths[0] if self._bg_paths else None
+        old_has_parseable = bool(self._parseable_bg_paths)
+
+        texts_removed = {path for path, entry in previous.items() if entry.token.group == COLOR_GROUP and is_text_entry(entry)}
+        bgs_removed = {path for path, entry in previous.items() if entry.token.group == COLOR_GROUP and is_background_entry(entry)}
+        parseable_removed = {path for path in bgs_removed if previous[path].rgb is not None}
+        dirty_colors = [entry for entry in map(self._color_entry, delta.added + delta.changed) if entry is not None]
+        texts_added = [entry.token.path for entry in dirty_colors if is_text_entry(entry)]
+        bg_entries_added = [entry for entry in dirty_colors if is_background_entry(entry)]
+        parseable_added = sorted(entry.token.path for entry in bg_entries_added if entry.rgb is not None)
+
+        self._text_paths = _update_sorted(self._text_paths, texts_removed, texts_added)
+        self._bg_paths = _update_sorted(self._bg_paths, bgs_removed, [entry.token.path for entry in bg_entries_added])
+        self._parseable_bg_paths = _update_sorted(self._parseable_bg_paths, parseable_removed, parseable_added)
+
+        first_bg = self._bg_paths[0] if self._bg_paths else None
+        has_parseable = bool(self._parseable_bg_paths)
+        global_change = (
+            first_bg != old_first_bg
+            or (first_bg is not None and first_bg in previous)
+            or has_parseable != old_has_parseable
+            or (not has_parseable and (bgs_removed or bg_entries_added))
+        )
+        if global_change or not self._text_paths or first_bg is None:
+            self._recompute_contrast_rows(self._text_paths, reset=True)
+            return
+
+        for path in texts_removed:
+            self._row_minimums.pop(path, None)
+            self._contrast.pop(path, None)
+
+        stale = set(texts_added)
+        stale.update(path for path, (_, worst) in self._row_minimums.items() if worst in parseable_removed)
+        if parseable_added:
+            current = [path for path in self._row_minimums if path not in stale]
+            self._merge_background_columns(current, parseable_added)
+        self._recompute_contrast_rows(sorted(stale))
+
+    def _merge_background_columns(self, text_paths: list[str], bg_paths: list[str]) -> None:
+        """Fold new background columns into existing row minimums; ties keep the earliest path."""
+        if not text_paths:
+            return
+        ratios = luminance_contrast_matrix(
+            [self._entries[path].luminance for path in text_paths],  # type: ignore[misc]
+            [self._entries[path].luminance for path in bg_paths],  # type: ignore[misc]
+        )
+        for text_path, row in zip(text_paths, ratios):
+            best_ratio = min(row)
+            best_path = bg_paths[row.index(best_ratio)]
+            ratio, worst = self._row_minimums[text_path]
+            if best_ratio < ratio or (best_ratio == ratio and best_path < worst):
+                self._row_minimums[text_path] = (best_ratio, best_path)
+                self._rebuild_contrast_row(text_path)
+
+    def _recompute_contrast_rows(self, text_paths: list[str], reset: bool = False) -> None:
+        if reset:
+            self._row_minimums = {}
+            self._contrast = {}
+            if not self._bg_paths:
+                return
+        parseable_texts = [path for path in text_paths if self._entries[path].rgb is not None]
+        if self._parseable_bg_paths and parseable_texts:
+            rows = min_luminance_contrast_per_row(
+                [self._entries[path].luminance for path in parseable_texts],  # type: ignore[misc]
+                [self._entries[path].luminance for path in self._parseable_bg_paths],  # type: ignore[misc]
+            )
+            for path, (ratio, position) in zip(parseable_texts, rows):
+                self._row_minimums[path] = (ratio, self._parseable_bg_paths[position])
+        for path in text_paths:
+            self._rebuild_contrast_row(path)
+
+    def _rebuild_contrast_row(self, text_path: str) -> None:
+        if self._parseable_bg_paths:
+            bg_tokens = [self._entries[self._bg_paths[0]].token]
+        else:
+            bg_tokens = [self._entries[path].token for path in self._bg_paths]
+        row = self._row_minimums.get(text_path)
+        row_minimum = (row[0], self._entries[row[1]].token) if row is not None else None
+        violations = evaluate_contrast_row(self._entries[text_path], bg_tokens, row_minimum)
+        if violations:
+            self._contrast[text_path] = violations
+        else:
+            self._contrast.pop(text_path, None)
+
+    def _scopes(self, rule_id: str) -> list[list[RuleViolation]]:
+        if rule_id == NAMING_RULE_ID:
+            return [self._naming[path] for path in sorted(self._naming)]
+        if rule_id == SCALE_RULE_ID:
+            return [self._scale[group] for group in TARGET_GROUPS if group in self._scale]
+        if rule_id == SEMANTIC_RULE_ID:
+            root_order = {root: min(self._root_candidates[root]) for root in self._semantic}
+            return [self._semantic[root] for root in sorted(self._semantic, key=root_order.__getitem__)]
+        return [self._contrast[path] for path in sorted(self._contrast)]
+
+    def _assemble(self) -> list[RuleEvaluation]:
+        evaluations = []
+        for spec in self.specs:
+            if spec.rule_id not in SCOPED_RULE_IDS:
+                evaluations.append(self._unscoped_results[spec.rule_id])
+                continue
+            violations = _renumber(spec.rule_id, self._scopes(spec.rule_id))
+            evaluations.append(
+                RuleEvaluation(rule_id=spec.rule_id, status="fail" if violations else "pass", violations=violations)
+            )
+        return evaluations
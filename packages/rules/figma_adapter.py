@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 import re
-from typing import Any
+from typing import Any, Iterable
 from uuid import uuid4
 
 from packages.contracts import CanonicalToken, CanonicalTokenModel, ImportResponse, ValidationReport
+from packages.rules.token_aliases import resolve_token_aliases
 
 ALLOWED_GROUPS = {"color", "spacing", "typography", "radius", "shadow"}
 ALT_GROUPS = {"colors", "uiTokens"}
@@ -23,46 +24,66 @@ def _slugify(value: str) -> str:
     return slug or "unnamed"
 
 
+# Stack marker that reports a non-string key in the same order the recursive walk did.
+_NON_STRING_KEY = object()
+
+
 def _is_leaf(node: Any) -> bool:
     return isinstance(node, dict) and ("$value" in node or "value" in node)
 
 
+def _build_leaf_token(
+    group: str, node: dict[str, Any], path: str, name: str, report: ValidationReport
+) -> CanonicalToken | None:
+    value = node.get("$value", node.get("value"))
+    token_type = node.get("$type", node.get("type", DEFAULT_GROUP_TYPES[group]))
+    if value is None:
+        report.add_error(path, "Token leaf is missing $value/value.")
+        return None
+    return CanonicalToken(
+        group=group,
+        path=path,
+        name=name,
+        token_type=str(token_type),
+        value=value,
+    )
+
+
 def _collect_tokens(
     group: str,
     node: Any,
-    segments: list[str],
+    path: str,
+    name: str | None,
     tokens: list[CanonicalToken],
     report: ValidationReport,
 ) -> None:
-    path = ".".join([group] + segments) if segments else group
-
-    if _is_leaf(node):
-        value = node.get("$value", node.get("value"))
-        token_type = node.get("$type", node.get("type", DEFAULT_GROUP_TYPES[group]))
-        if value is None:
-            report.add_error(path, "Token leaf is missing $value/value.")
-            return
-        token_name = ".".join(segments)
-        tokens.append(
-            CanonicalToken(
-                group=group,
-                path=path,
-                name=token_name,
-                token_type=str(token_type),
-                value=value,
-            )
-        )
-        return
-
-    if isinstance(node, dict):
-        for key, child in node.items():
-            if not isinstance(key, str):
-                report.add_error(path, "Token key must be a string.")
-                continue
-            _collect_tokens(group, child, [*segments, key], tokens, report)
-        return
+    """Depth-first walk with an explicit stack; `name` is None for the group root itself."""
+    stack: list[tuple[Any, str, str | None]] = [(node, path, name)]
+
+    while stack:
+        node, path, name = stack.pop()
+
+        if node is _NON_STRING_KEY:
+            report.add_error(path, "Token key must be a string.")
+            continue
+
+        if _is_leaf(node):
+            token = _build_leaf_token(group, node, path, name or "", report)
+            if token is not None:
+                tokens.append(token)
+            continue
+
+        if isinstance(node, dict):
+            children: list[tuple[Any, str, str | None]] = []
+            for key, child in node.items():
+                if not isinstance(key, str):
+                    children.append((_NON_STRING_KEY, path, name))
+                    continue
+                children.append((child, f"{path}.{key}", key if name is None else f"{name}.{key}"))
+            stack.extend(reversed(children))
+            continue
 
-    report.add_error(path, "Token branches must be objects or token leaves.")
+        report.add_error(path, "Token branches must be objects or token leaves.")
 
 
 def _collect_theme_config_tokens(
@@ -127,7 +148,12 @@ def _collect_theme_config_tokens(
     return handled
 
 
-def normalize_figma_export(payload: Any) -> tuple[CanonicalTokenModel, ValidationReport]:
+def normalize_figma_export(payload: Any, resolve_aliases: bool = True) -> tuple[CanonicalTokenModel, ValidationReport]:
+    """Canonical tokens in path order plus the validation report.
+
+    With `resolve_aliases=False`, `{path}` references are left as raw strings
+    for callers that resolve them against a larger token set.
+    """
     report = ValidationReport(valid=True)
     tokens: list[CanonicalToken] = []
 
@@ -143,7 +169,7 @@ def normalize_figma_export(payload: Any) -> tuple[CanonicalTokenModel, Validatio
             if not isinstance(node, dict):
                 report.add_error(key, "Top-level token group must be an object.")
                 continue
-            _collect_tokens(key, node, [], tokens, report)
+            _collect_tokens(key, node, key, None, tokens, report)
         else:
             if key in ALT_GROUPS and alt_format_handled:
                 continue
@@ -153,9 +179,30 @@ def normalize_figma_export(payload: Any) -> tuple[CanonicalTokenModel, Validatio
         report.add_error("$", "At least one supported token group is required.")
 
     tokens.sort(key=lambda item: item.path)
+    if resolve_aliases:
+        tokens = resolve_token_aliases(tokens, report)
     return CanonicalTokenModel(source="figma_export", tokens=tokens), report
 
 
+def build_tokens_studio_export(tokens: Iterable[CanonicalToken]) -> dict[str, Any] | None:
+    """A Tokens Studio export that normalizes back to exactly `tokens`.
+
+    Each token becomes a leaf keyed by its full name under its group. Returns
+    None when that cannot round-trip: a group that is itself a leaf, two
+    tokens sharing a path, or tokens from another source.
+    """
+    payload: dict[str, dict[str, Any]] = {}
+    count = 0
+    for token in tokens:
+        if token.source != "figma_export" or token.path != f"{token.group}.{token.name}":
+            return None
+        payload.setdefault(token.group, {})[token.name] = {"$value": token.value, "$type": token.token_type}
+        count += 1
+    if sum(len(group) for group in payload.values()) != count:
+        return None
+    return payload
+
+
 def build_import_response(source_id: str, payload: Any) -> ImportResponse:
     canonical, report = normalize_figma_export(payload)
     return ImportResponse(
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+from packages.contracts import CanonicalToken, CanonicalTokenModel, ValidationReport
+from packages.rules.figma_adapter import (
+    ALLOWED_GROUPS,
+    ALT_GROUPS,
+    _build_leaf_token,
+    _collect_theme_config_tokens,
+    _collect_tokens,
+)
+from packages.rules.json_events import ByteSource, JsonEvent, build_value, iter_json_events, skip_value
+from packages.rules.token_aliases import resolve_token_aliases
+
+# Keys whose values decide leaf-ness or feed a leaf token; they are materialized, everything else streams.
+LEAF_FIELDS = {"$value", "value", "$type", "type"}
+
+
+class _ErrorRecorder:
+    """Collects errors in walk order so they can be replayed into the final report."""
+
+    def __init__(self) -> None:
+        self.errors: list[tuple[str, str]] = []
+
+    def add_error(self, path: str, message: str) -> None:
+        self.errors.append((path, message))
+
+
+class _Frame:
+    __slots__ = ("path", "name", "key", "children")
+
+    def __init__(self, path: str, name: str | None, key: str | None) -> None:
+        self.path = path
+        self.name = name
+        self.key = key
+        # Child key -> ("value", materialized leaf field) or ("walked", (tokens, errors)).
+        # Re-assigning a duplicate key keeps its first position, like `json.loads`.
+        self.children: dict[str, tuple[str, Any]] = {}
+
+
+def _close_frame(group: str, frame: _Frame) -> tuple[list[CanonicalToken], list[tuple[str, str]]]:
+    recorder = _ErrorRecorder()
+    tokens: list[CanonicalToken] = []
+    children = frame.children
+
+    if "$value" in children or "value" in children:
+        node = {key: value for key, (kind, value) in children.items() if kind == "value"}
+        token = _build_leaf_token(group, node, frame.path, frame.name or "", recorder)  # type: ignore[arg-type]
+        return ([token] if token is not None else []), recorder.errors
+
+    for key, (kind, value) in children.items():
+        if kind == "walked":
+            child_tokens, child_errors = value
+            tokens.extend(child_tokens)
+            recorder.errors.extend(child_errors)
+            continue
+        child_name = key if frame.name is None else f"{frame.name}.{key}"
+        _collect_tokens(group, value, f"{frame.path}.{key}", child_name, tokens, recorder)  # type: ignore[arg-type]
+    return tokens, recorder.errors
+
+
+def _walk_group(group: str, events: Iterator[JsonEvent]) -> tuple[list[CanonicalToken], list[tuple[str, str]]]:
+    """Walk a group object whose `start_map` was already consumed; memory follows nesting depth."""
+    stack = [_Frame(group, None, None)]
+
+    for event, value in events:
+        frame = stack[-1]
+        if event == "end_map":
+            stack.pop()
+            result = _close_frame(group, frame)
+            if not stack:
+                return result
+            stack[-1].children[frame.key] = ("walked", result)  # type: ignore[index]
+            continue
+
+        key = value
+        child_path = f"{frame.path}.{key}"
+        first = next(events)
+        if key in LEAF_FIELDS:
+            frame.children[key] = ("value", build_value(events, first))
+        elif first[0] == "start_map":
+            stack.append(_Frame(child_path, key if frame.name is None else f"{frame.name}.{key}", key))
+        else:
+            skip_value(events, first)
+            frame.children[key] = (
+                "walked",
+                ([], [(child_path, "Token branches must be objects or token leaves.")]),
+            )
+
+    raise ValueError("Unexpected end of JSON event stream.")
+
+
+def normalize_figma_export_stream(source: ByteSource) -> tuple[CanonicalTokenModel, ValidationReport]:
+    """Normalize raw export bytes without materializing the payload as a dict.
+
+    Produces exactly what `normalize_figma_export(json.loads(source))` does and
+    raises `ValueError` for malformed JSON.
+    """
+    events = iter_json_events(source)
+    report = ValidationReport(valid=True)
+    tokens: list[CanonicalToken] = []
+
+    first = next(events)
+    if first[0] != "start_map":
+        skip_value(events, first)
+        for _ in events:
+            pass
+        report.add_error("$", "Figma export must be a JSON object.")
+        return CanonicalTokenModel(source="figma_export", tokens=[]), report
+
+    # Top-level key -> ("group", walk result) | ("invalid_group", None) | ("theme", value) | ("other", None)
+    entries: dict[str, tuple[str, Any]] = {}
+    for event, key in events:
+        if event == "end_map":
+            break
+        first = next(events)
+        if key in ALLOWED_GROUPS:
+            if first[0] == "start_map":
+                entries[key] = ("group", _walk_group(key, events))
+            else:
+                skip_value(events, first)
+                entries[key] = ("invalid_group", None)
+        elif key in ALT_GROUPS:
+            entries[key] = ("theme", build_value(events, first))
+        else:
+            skip_value(events, first)
+            entries[key] = ("other", None)
+    for _ in events:
+        pass
+
+    theme_payload = {key: value for key, (kind, value) in entries.items() if kind == "theme"}
+    alt_format_handled = _collect_theme_config_tokens(theme_payload, tokens, report)
+    found_group = False
+    for key, (kind, result) in entries.items():
+        if kind == "group":
+            found_group = True
+            group_tokens, group_errors = result
+            tokens.extend(group_tokens)
+            for path, message in group_errors:
+                report.add_error(path, message)
+        elif kind == "invalid_group":
+            found_group = True
+            report.add_error(key, "Top-level token group must be an object.")
+        else:
+            if key in ALT_GROUPS and alt_format_handled:
+                continue
+            report.add_warning(key, "Unknown top-level group ignored by canonical mapping.")
+
+    if not found_group and not alt_format_handled:
+        report.add_error("$", "At least one supported token group is required.")
+
+    tokens.sort(key=lambda item: item.path)
+    tokens = resolve_token_aliases(tokens, report)
+    return CanonicalTokenModel(source="figma_export", tokens=tokens), report
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import io
+import json
+import re
+from json.decoder import scanstring
+from json.scanner import NUMBER_RE
+from typing import Any, Iterable, Iterator
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional runtime dependency
+    ijson = None
+
+JsonEvent = tuple[str, Any]
+ByteSource = bytes | bytearray | memoryview | Iterable[bytes]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_LITERALS = (
+    ("null", "null", None),
+    ("true", "boolean", True),
+    ("false", "boolean", False),
+    ("NaN", "number", float("nan")),
+    ("Infinity", "number", float("inf")),
+    ("-Infinity", "number", float("-inf")),
+)
+
+_VALUE = 0
+_VALUE_OR_END = 1
+_KEY = 2
+_KEY_OR_END = 3
+_COLON = 4
+_COMMA_OR_END = 5
+_DONE = 6
+
+
+class _ChunkReader:
+    """Minimal file-like adapter so ijson can pull from an iterable of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            return b""
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return b""
+            self._pending = bytes(chunk)
+        if size < 0 or size >= len(self._pending):
+            data, self._pending = self._pending, b""
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+def iter_json_events(source: ByteSource) -> Iterator[JsonEvent]:
+    """Yield ijson-style `basic_parse` events for a UTF-8 JSON document.
+
+    Uses ijson (incremental, chunk by chunk) when installed; otherwise falls back
+    to a stdlib tokenizer. Either way no Python object tree is built for the
+    document. Malformed input raises `ValueError` where `json.loads` would.
+    """
+    if ijson is not None:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            reader: Any = io.BytesIO(source)
+        else:
+            reader = _ChunkReader(source)
+        try:
+            yield from ijson.basic_parse(reader, use_float=True)
+        except ijson.JSONError as exc:
+            raise ValueError(f"Invalid JSON: {exc}") from exc
+        return
+
+    data = bytes(source) if isinstance(source, (bytes, bytearray, memoryview)) else b"".join(source)
+    yield from iter_text_events(data.decode("utf-8"))
+
+
+def iter_text_events(text: str) -> Iterator[JsonEvent]:
+    """Stdlib JSON tokenizer emitting the same events and errors as `json.loads` parsing."""
+    if text.startswith("\ufeff"):
+        raise json.JSONDecodeError("Unexpected UTF-8 BOM (decode using utf-8-sig)", text, 0)
+
+    stack: list[str] = []
+    state = _VALUE
+    idx = 0
+    end = len(text)
+
+    while True:
+        idx = _WHITESPACE.match(text, idx).end()
+        if state == _DONE:
+            if idx != end:
+                raise json.JSONDecodeError("Extra data", text, idx)
+            return
+        if idx >= end:
+            raise json.JSONDecodeError("Expecting value", text, idx)
+        char = text[idx]
+
+        if state == _COLON:
+            if char != ":":
+                raise json.JSONDecodeError("Expecting ':' delimiter", text, idx)
+            idx += 1
+            state = _VALUE
+            continue
+
+        if state == _COMMA_OR_END:
+            container = stack[-1]
+            if char == ",":
+                idx += 1
+                state = _KEY if container == "{" else _VALUE
+                continue
+            if (char == "}" and container == "{") or (char == "]" and container == "["):
+                stack.pop()
+                idx += 1
+                yield ("end_map" if char == "}" else "end_array", None)
+                state = _COMMA_OR_END if stack else _DONE
+                continue
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, idx)
+
+        if state in (_KEY, _KEY_OR_END):
+            if state == _KEY_OR_END and char == "}":
+                stack.pop()
+                idx += 1
+                yield ("end_map", None)
+                state = _COMMA_OR_END if stack else _DONE
+                continue
+            if char != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, idx)
+            key, idx = scanstring(text, idx + 1)
+            yield ("map_key", key)
+            state = _COLON
+            continue
+
+        if state == _VALUE_OR_END and char == "]":
+            stack.pop()
+            idx += 1
+            yield ("end_array", None)
+            state = _COMMA_OR_END if stack else _DONE
+            continue
+
+        if char == "{":
+            stack.append("{")
+            idx += 1
+            yield ("start_map", None)
+            state = _KEY_OR_END
+            continue
+        if char == "[":
+            stack.append("[")
+            idx += 1
+            yield ("start_array", None)
+            state = _VALUE_OR_END
+            continue
+
+        if char == '"':
+            value, idx = scanstring(text, idx + 1)
+            yield ("string", value)
+        else:
+            event, idx = _scan_scalar(text, idx)
+            yield event
+        state = _COMMA_OR_END if stack else _DONE
+
+
+def _scan_scalar(text: str, idx: int) -> tuple[JsonEvent, int]:
+    for literal, event, value in _LITERALS[:3]:
+        if text.startswith(literal, idx):
+            return (event, value), idx + len(literal)
+
+    match = NUMBER_RE.match(text, idx)
+    if match is not None:
+        integer, frac, exp = match.groups()
+        if frac or exp:
+            number: int | float = float(integer + (frac or "") + (exp or ""))
+        else:
+            number = int(integer)
+        return ("number", number), match.end()
+
+    for literal, event, value in _LITERALS[3:]:
+        if text.startswith(literal, idx):
+            return (event, value), idx + len(literal)
+
+    raise json.JSONDecodeError("Expecting value", text, idx)
+
+
+def build_value(events: Iterator[JsonEvent], first: JsonEvent) -> Any:
+    """Materialize the value that starts with `first`, consuming its remaining events."""
+    event, value = first
+    if event not in ("start_map", "start_array"):
+        return value
+
+    root: Any = {} if event == "start_map" else []
+    containers: list[Any] = [root]
+    keys: list[str | None] = [None]
+
+    for event, value in events:
+        container = containers[-1]
+        if event == "map_key":
+            keys[-1] = value
+            continue
+        if event in ("end_map", "end_array"):
+            containers.pop()
+            keys.pop()
+            if not containers:
+                return root
+            continue
+
+        if event == "start_map":
+            child: Any = {}
+        elif event == "start_array":
+            child = []
+        else:
+            child = value
+
+        if isinstance(container, dict):
+            container[keys[-1]] = child
+        else:
+            container.append(child)
+        if event in ("start_map", "start_array"):
+            containers.append(child)
+            keys.append(None)
+
+    raise ValueError("Unexpected end of JSON event stream.")
+
+
+def skip_value(events: Iterator[JsonEvent], first: JsonEvent) -> None:
+    """Consume the events of the value that starts with `first` without building it."""
+    if first[0] not in ("start_map", "start_array"):
+        return
+    depth = 1
+    for event, _ in events:
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+            if depth == 0:
+                return
+    raise ValueError("Unexpected end of JSON event stream.")
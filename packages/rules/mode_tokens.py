@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Iterator, Sequence
+
+from packages.contracts import CanonicalToken, CanonicalTokenModel, RuleEvaluation, ValidationReport
+from packages.rules.delta_audit import DeltaAuditState, TokenDelta, is_path_sorted
+from packages.rules.figma_adapter import normalize_figma_export
+from packages.rules.registry import RuleSpec
+from packages.rules.token_aliases import AliasResolver
+
+
+# Marks override paths that were not in the base, so they are removed again afterwards.
+_MISSING = object()
+
+MAX_MODES = 32
+
+
+class ModePayloadError(ValueError):
+    """A mode payload that is not `{"base": {...}, "modes": {...}}`; `code` and `details` describe why."""
+
+    def __init__(self, code: str, message: str, details: dict[str, Any] | None = None) -> None:
+        super().__init__(message)
+        self.code = code
+        self.details = details or {}
+
+
+def split_mode_payload(payload: Any, max_modes: int = MAX_MODES) -> tuple[dict[str, Any], dict[str, Any]]:
+    """(base export, overrides by mode) from a parsed `{"base": {...}, "modes": {"dark": {...}}}` body."""
+    base = payload.get("base") if isinstance(payload, dict) else None
+    modes = payload.get("modes") if isinstance(payload, dict) else None
+    if not isinstance(base, dict) or not isinstance(modes, dict) or not modes:
+        raise ModePayloadError(
+            "invalid_mode_payload",
+            "Request body must contain a `base` export object and a non-empty `modes` object.",
+        )
+    if len(modes) > max_modes:
+        raise ModePayloadError(
+            "too_many_modes",
+            f"A request can cover at most {max_modes} modes.",
+            {"max_modes": max_modes, "mode_count": len(modes)},
+        )
+    invalid = [mode for mode, overrides in modes.items() if not mode.strip() or not isinstance(overrides, dict)]
+    if invalid:
+        raise ModePayloadError(
+            "invalid_mode_payload",
+            "Mode names must be non-empty and each mode's overrides must be an export object.",
+            {"invalid_modes": invalid},
+        )
+    return base, modes
+
+
+def _path_key(token: CanonicalToken) -> str:
+    return token.path
+
+
+@dataclass
+class ModeView:
+    """One mode's merged token set.
+
+    `changed_paths` lists the paths whose token differs from the base: the
+    overrides plus base aliases that resolve differently through them.
+    `validation` covers the override export and alias issues on those paths.
+    """
+
+    mode: str
+    model: CanonicalTokenModel
+    validation: ValidationReport
+    override_count: int
+    changed_paths: list[str]
+
+
+@dataclass
+class ModeEvaluation:
+    view: ModeView
+    evaluations: list[RuleEvaluation]
+    delta: TokenDelta | None
+
+
+class ModeTokenSet:
+    """A base export normalized once, with per-mode overrides merged on demand.
+
+    Overrides are partial exports in the same format as the base. A mode costs
+    work proportional to its overrides and the aliases that depend on them:
+    the base's alias graph is re-resolved incrementally and restored after
+    each mode, and the merged list is assembled from slices of the base list.
+    """
+
+    def __init__(self, base_payload: Any) -> None:
+        canonical, self.validation = normalize_figma_export(base_payload, resolve_aliases=False)
+        self._resolver = AliasResolver(canonical.tokens)
+        self._resolver.report_issues(self.validation)
+        self.tokens = self._resolver.resolve_tokens(canonical.tokens)
+        self._raw_by_path = {token.path: token for token in canonical.tokens}
+        self._sorted = is_path_sorted(self.tokens)
+
+    def apply(self, mode: str, override_payload: Any) -> ModeView:
+        if override_payload == {}:
+            return ModeView(mode, CanonicalTokenModel("figma_export", self.tokens), ValidationReport(valid=True), 0, [])
+
+        overrides, validation = normalize_figma_export(override_payload, resolve_aliases=False)
+        override_by_path = {token.path: token for token in overrides.tokens}
+        resolver = self._resolver
+        previous = {path: resolver.raw_value(path) if path in resolver else _MISSING for path in override_by_path}
+        affected: set[str] = set()
+        try:
+            for path, token in override_by_path.items():
+                affected.update(resolver.update(path, token.value))
+            resolver.report_issues(validation, affected)
+            replacements = []
+            for path in sorted(affected):
+                source = override_by_path.get(path) or self._raw_by_path[path]
+                replacements.append(
+                    CanonicalToken(
+                        source.group, path, source.name, source.token_type, resolver.value(path), source.source
+                    )
+                )
+        finally:
+            for path, value in previous.items():
+                if value is _MISSING:
+                    resolver.remove(path)
+                else:
+                    resolver.update(path, value)
+
+        tokens, changed_paths = self._merge(replacements)
+        return ModeView(
+            mode, CanonicalTokenModel("figma_export", tokens), validation, len(override_by_path), changed_paths
+        )
+
+    def _merge(self, replacements: list[CanonicalToken]) -> tuple[list[CanonicalToken], list[str]]:
+        """Base tokens with each replacement taking over every base token at its path."""
+        base = self.tokens
+        merged: list[CanonicalToken] = []
+        changed: list[str] = []
+        start = 0
+        for token in replacements:
+            low = bisect_left(base, token.path, lo=start, key=_path_key)
+            high = bisect_right(base, token.path, lo=low, key=_path_key)
+            merged.extend(base[start:low])
+            merged.append(token)
+            if high - low != 1 or base[low] != token:
+                changed.append(token.path)
+            start = high
+        merged.extend(base[start:])
+        return merged, changed
+
+    def evaluate(
+        self, overrides_by_mode: dict[str, Any], specs: Sequence[RuleSpec] | None = None
+    ) -> Iterator[ModeEvaluation]:
+        """Evaluate `specs` (default: every rule) per mode, re-running only the scopes each mode's changes touch.
+
+        One delta state walks from mode to mode, so each step re-evaluates the
+        paths the previous and the current mode changed. Bases with duplicate
+        paths fall back to a full evaluation per mode.
+        """
+        state = DeltaAuditState(specs)
+        state.evaluate(CanonicalTokenModel("figma_export", self.tokens))
+        previous_paths: list[str] = []
+        for mode, override_payload in overrides_by_mode.items():
+            view = self.apply(mode, override_payload)
+            if self._sorted:
+                evaluations = state.evaluate_paths(view.model, previous_paths + view.changed_paths)
+            else:
+                evaluations = state.evaluate(view.model)
+            previous_paths = view.changed_paths
+            yield ModeEvaluation(view, evaluations, state.last_delta)
+
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator
+
+from packages.contracts import CanonicalTokenModel, RuleEvaluation
+from packages.rules.a11y_contrast_rule import evaluate_a11y_contrast
+from packages.rules.token_index import build_token_index
+from packages.rules.tokens_naming_rule import evaluate_tokens_naming
+from packages.rules.tokens_scale_rule import TARGET_GROUPS, evaluate_tokens_scale
+from packages.rules.tokens_semantic_coverage_rule import evaluate_tokens_semantic_coverage
+
+DEFAULT_RULE_WORKERS = int(os.environ.get("QADMS_RULE_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+
+# name -> fn(canonical, groups) where `groups` limits the work to the token groups selected rules read.
+Precomputation = Callable[[CanonicalTokenModel, "frozenset[str] | None"], Any]
+
+
+class UnknownRuleError(ValueError):
+    def __init__(self, rule_ids: list[str]) -> None:
+        super().__init__(f"Unknown rule ids: {', '.join(rule_ids)}")
+        self.rule_ids = rule_ids
+
+
+@dataclass(frozen=True)
+class RuleSpec:
+    """A rule and what it reads.
+
+    `evaluate` is called as `evaluate(canonical, *precomputed)` with one
+    argument per name in `requires`. `groups` lists the token groups the rule
+    reads; None means every group.
+    """
+
+    rule_id: str
+    category: str
+    evaluate: Callable[..., RuleEvaluation]
+    groups: tuple[str, ...] | None = None
+    requires: tuple[str, ...] = ("index",)
+
+
+@dataclass
+class RuleRun:
+    spec: RuleSpec
+    evaluation: RuleEvaluation
+    wall_seconds: float
+    cpu_seconds: float
+
+
+def _timed(spec: RuleSpec, canonical: CanonicalTokenModel, args: tuple[Any, ...]) -> RuleRun:
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    evaluation = spec.evaluate(canonical, *args)
+    return RuleRun(spec, evaluation, time.perf_counter() - wall_start, time.thread_time() - cpu_start)
+
+
+class RuleRegistry:
+    """Registered rules plus the shared precomputations they depend on.
+
+    Rules run in registration order, which fixes violation numbering and the
+    order of results regardless of how a request lists them.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_RULE_WORKERS) -> None:
+        self.max_workers = max_workers
+        self._rules: dict[str, RuleSpec] = {}
+        self._precomputations: dict[str, Precomputation] = {}
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def rule_ids(self) -> tuple[str, ...]:
+        return tuple(self._rules)
+
+    def register(self, spec: RuleSpec) -> RuleSpec:
+        if spec.rule_id in self._rules:
+            raise ValueError(f"Rule `{spec.rule_id}` is already registered.")
+        missing = [name for name in spec.requires if name not in self._precomputations]
+        if missing:
+            raise ValueError(f"Rule `{spec.rule_id}` requires unknown precomputations: {', '.join(missing)}")
+        self._rules[spec.rule_id] = spec
+        return spec
+
+    def register_precomputation(self, name: str, compute: Precomputation) -> None:
+        self._precomputations[name] = compute
+
+    def get(self, rule_id: str) -> RuleSpec | None:
+        return self._rules.get(rule_id)
+
+    def category(self, rule_id: str) -> str:
+        spec = self._rules.get(rule_id)
+        return spec.category if spec is not None else "other"
+
+    def select(self, rule_ids: Iterable[str] | None = None) -> list[RuleSpec]:
+        """Specs for `rule_ids` in registration order; None selects every rule."""
+        if rule_ids is None:
+            return list(self._rules.values())
+        wanted = set(rule_ids)
+        unknown = sorted(wanted - self._rules.keys())
+        if unknown:
+            raise UnknownRuleError(unknown)
+        return [spec for rule_id, spec in self._rules.items() if rule_id in wanted]
+
+    def prepare(self, canonical: CanonicalTokenModel, specs: list[RuleSpec]) -> dict[str, Any]:
+        """Compute each precomputation the selected rules need once, over only the groups they read."""
+        groups: frozenset[str] | None = frozenset()
+        for spec in specs:
+            if spec.groups is None:
+                groups = None
+                break
+            groups |= frozenset(spec.groups)
+        needed = dict.fromkeys(name for spec in specs for name in spec.requires)
+        return {name: self._precomputations[name](canonical, groups) for name in needed}
+
+    def iter_runs(
+        self,
+        canonical: CanonicalTokenModel,
+        specs: list[RuleSpec],
+        precomputed: dict[str, Any],
+        executor: Executor | None = None,
+    ) -> Iterator[RuleRun]:
+        """Evaluate `specs` concurrently once their inputs are ready; yields runs in spec order.
+
+        Rules only read the model and the precomputations, so they are
+        independent. With one worker, or a single rule, they run inline.
+        """
+        calls = [(spec, tuple(precomputed[name] for name in spec.requires)) for spec in specs]
+        executor = executor if executor is not None else self._shared_executor(len(calls))
+        if executor is None:
+            for spec, args in calls:
+                yield _timed(spec, canonical, args)
+            return
+
+        futures: list[Future] = [executor.submit(_timed, spec, canonical, args) for spec, args in calls]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _shared_executor(self, rule_count: int) -> Executor | None:
+        if self.max_workers <= 1 or rule_count <= 1:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="qadms-rule")
+            return self._executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+DEFAULT_RULE_REGISTRY = RuleRegistry()
+DEFAULT_RULE_REGISTRY.register_precomputation("index", lambda canonical, groups: build_token_index(canonical, groups))
+for _spec in (
+    RuleSpec("TOKENS_NAMING", "tokens", evaluate_tokens_naming),
+    RuleSpec("TOKENS_SCALE", "tokens", evaluate_tokens_scale, groups=TARGET_GROUPS),
+    RuleSpec("TOKENS_SEMANTIC_COVERAGE", "tokens", evaluate_tokens_semantic_coverage, groups=("color",)),
+    RuleSpec("A11Y_CONTRAST", "a11y", evaluate_a11y_contrast, groups=("color",)),
+):
+    DEFAULT_RULE_REGISTRY.register(_spec)
+del _spec
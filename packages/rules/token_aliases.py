@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable
+
+from packages.contracts import CanonicalToken, ValidationReport
+
+# `{color.brand.primary}`; Tokens Studio also accepts a trailing `.value`/`.$value` on the path.
+ALIAS_PATTERN = re.compile(r"\{([^{}\s]+)\}")
+_VALUE_SUFFIXES = (".value", ".$value")
+_INTERPOLATED_TYPES = (str, int, float)
+# Longer cycles are abbreviated in the validation message.
+_MAX_CYCLE_PATHS = 8
+
+
+def _has_reference(value: Any) -> bool:
+    if type(value) is str:
+        return "{" in value and ALIAS_PATTERN.search(value) is not None
+    if isinstance(value, dict):
+        return any(_has_reference(item) for item in value.values())
+    if isinstance(value, list):
+        return any(_has_reference(item) for item in value)
+    return False
+
+
+def _references(value: Any) -> tuple[str, ...]:
+    """Referenced paths in first-seen order."""
+    if type(value) is str:
+        if "{" not in value:
+            return ()
+        refs = ALIAS_PATTERN.findall(value)
+        return tuple(dict.fromkeys(refs)) if len(refs) > 1 else tuple(refs)
+    if isinstance(value, (dict, list)):
+        found: dict[str, None] = {}
+        for item in value.values() if isinstance(value, dict) else value:
+            found.update(dict.fromkeys(_references(item)))
+        return tuple(found)
+    return ()
+
+
+class AliasResolver:
+    """Dependency graph of token aliases with memoized, incremental resolution.
+
+    A string that is exactly `{path}` takes the referenced token's resolved
+    value, whatever its type; references inside a longer string are replaced
+    by the text of a string or number value. Composite (object/array) values
+    are resolved item by item. Aliases resolve depth-first with an explicit
+    stack, so each one is computed once however long its chain. Every alias
+    in a cycle (a strongly connected component of the graph) is an error and
+    references to unknown tokens are warnings; either way the unresolvable
+    reference keeps its raw text.
+    """
+
+    def __init__(self, tokens: Iterable[CanonicalToken] = ()) -> None:
+        self._raw: dict[str, Any] = {}
+        self._refs: dict[str, tuple[str, ...]] = {}
+        self._dependents: dict[str, set[str]] = {}
+        self._resolved: dict[str, Any] = {}
+        self._cyclic: set[str] = set()
+        self._errors: dict[str, str] = {}
+        self._warnings: dict[str, str] = {}
+        for token in tokens:
+            self._raw[token.path] = token.value
+        # Linked once every path is known, so `.value` suffixes resolve against the whole export.
+        for path, value in self._raw.items():
+            self._link(path, value)
+        self._resolve(list(self._refs))
+
+    def value(self, path: str) -> Any:
+        """Resolved value of a token; raw for tokens without aliases."""
+        if path in self._resolved:
+            return self._resolved[path]
+        return self._raw[path]
+
+    def resolve_tokens(self, tokens: Iterable[CanonicalToken]) -> list[CanonicalToken]:
+        """`tokens` with aliased values replaced by their resolved values."""
+        resolved_tokens = []
+        for token in tokens:
+            if token.path not in self._resolved:
+                resolved_tokens.append(token)
+                continue
+            if token.value is self._raw[token.path]:
+                value = self._resolved[token.path]
+            else:
+                # A duplicate path: the graph holds the last token's value, so this one resolves its own.
+                value = self._substitute(token.path, token.value)
+            resolved_tokens.append(
+                CanonicalToken(token.group, token.path, token.name, token.token_type, value, token.source)
+            )
+        return resolved_tokens
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._raw
+
+    def raw_value(self, path: str) -> Any:
+        return self._raw[path]
+
+    def update(self, path: str, value: Any) -> list[str]:
+        """Set one token's raw value and re-resolve only the aliases that depend on it.
+
+        Returns the paths whose resolved value may have changed, in path order:
+        `path` itself plus every token that references it, directly or through
+        other aliases.
+        """
+        self._unlink(path)
+        self._raw[path] = value
+        self._link(path, value)
+        return self._invalidate(path)
+
+    def remove(self, path: str) -> list[str]:
+        """Drop a token and re-resolve the aliases that referenced it; returns paths as `update` does."""
+        self._unlink(path)
+        self._raw.pop(path, None)
+        return self._invalidate(path)
+
+    def report_issues(self, report: ValidationReport, paths: Iterable[str] | None = None) -> None:
+        """Add alias errors and warnings to `report`, limited to `paths` when given."""
+        wanted = set(paths) if paths is not None else None
+        for issues, add in ((self._errors, report.add_error), (self._warnings, report.add_warning)):
+            for path in sorted(issues if wanted is None else wanted.intersection(issues)):
+                add(path, issues[path])
+
+    def _invalidate(self, path: str) -> list[str]:
+        affected = {path}
+        pending = [path]
+        while pending:
+            for dependent in self._dependents.get(pending.pop(), ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    pending.append(dependent)
+        for stale in affected:
+            self._resolved.pop(stale, None)
+            self._cyclic.discard(stale)
+            self._errors.pop(stale, None)
+            self._warnings.pop(stale, None)
+        self._resolve(sorted(stale for stale in affected if stale in self._refs))
+        return sorted(affected)
+
+    def _unlink(self, path: str) -> None:
+        for ref in self._refs.pop(path, ()):
+            # Linked under the `.value`-stripped path when that token existed at the time.
+            for target in {ref, *(ref[: -len(suffix)] for suffix in _VALUE_SUFFIXES if ref.endswith(suffix))}:
+                dependents = self._dependents.get(target)
+                if dependents is not None:
+                    dependents.discard(path)
+
+    def _link(self, path: str, value: Any) -> None:
+        refs = _references(value)
+        if not refs:
+            return
+        self._refs[path] = refs
+        for target in refs:
+            self._dependents.setdefault(self._target(target), set()).add(path)
+
+    def _target(self, ref: str) -> str:
+        if ref not in self._raw:
+            for suffix in _VALUE_SUFFIXES:
+                if ref.endswith(suffix) and ref[: -len(suffix)] in self._raw:
+                    return ref[: -len(suffix)]
+        return ref
+
+    def _resolve(self, paths: list[str]) -> None:
+        # Tarjan's strongly connected components, iteratively: a component completes only after
+        # everything it references, so each alias resolves right after its dependencies.
+        raw, refs_of, resolved = self._raw, self._refs, self._resolved
+        index: dict[str, int] = {}
+        lowlink: dict[str, int] = {}
+        # Visited aliases whose component has not completed yet.
+        open_paths: list[str] = []
+        for root in paths:
+            if root in resolved or root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            open_paths.append(root)
+            stack = [(root, iter(refs_of[root]))]
+            while stack:
+                path, refs = stack[-1]
+                for ref in refs:
+                    target = ref if ref in raw else self._target(ref)
+                    if target not in refs_of or target in resolved:
+                        continue
+                    if target in index:
+                        # Visited but unresolved, so still open: a back or cross edge within a component.
+                        lowlink[path] = min(lowlink[path], index[target])
+                        continue
+                    index[target] = lowlink[target] = len(index)
+                    open_paths.append(target)
+                    stack.append((target, iter(refs_of[target])))
+                    break
+                else:
+                    stack.pop()
+                    if stack:
+                        parent = stack[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[path])
+                    if lowlink[path] != index[path]:
+                        continue
+                    at = len(open_paths) - 1
+                    while open_paths[at] != path:
+                        at -= 1
+                    component = open_paths[at:]
+                    del open_paths[at:]
+                    if len(component) > 1 or any(self._target(ref) == path for ref in refs_of[path]):
+                        self._mark_cycle(component)
+                    for member in component:
+                        resolved[member] = self._substitute(member, raw[member])
+
+    def _mark_cycle(self, component: list[str]) -> None:
+        """Flag every alias of a strongly connected component, naming one cycle through its first alias."""
+        start, members = component[0], set(component)
+        parents: dict[str, str] = {}
+        queue = [start]
+        cycle: list[str] = []
+        for path in queue:
+            for ref in self._refs[path]:
+                target = self._target(ref)
+                if target == start:
+                    cycle = [path]
+                    while cycle[-1] != start:
+                        cycle.append(parents[cycle[-1]])
+                    cycle.reverse()
+                    break
+                if target in members and target not in parents and target != start:
+                    parents[target] = path
+                    queue.append(target)
+            if cycle:
+                break
+        if len(cycle) > _MAX_CYCLE_PATHS:
+            chain = " -> ".join(cycle[:_MAX_CYCLE_PATHS] + ["...", cycle[0]]) + f" ({len(cycle)} aliases)"
+        else:
+            chain = " -> ".join(cycle + cycle[:1])
+        # One message shared by the aliases on the named cycle; the rest of the component points at it.
+        message = f"Alias cycle: {chain}."
+        on_cycle = set(cycle)
+        for path in component:
+            self._cyclic.add(path)
+            self._errors.setdefault(
+                path, message if path in on_cycle else f"Alias cycle: {path} is part of the same cycle as {chain}."
+            )
+
+    def _lookup(self, path: str, ref: str) -> tuple[bool, Any]:
+        target = self._target(ref)
+        if target in self._cyclic:
+            self._warnings.setdefault(path, f"Alias `{{{ref}}}` points into an alias cycle.")
+            return False, None
+        if target in self._resolved:
+            return True, self._resolved[target]
+        if target in self._raw:
+            return True, self._raw[target]
+        self._warnings.setdefault(path, f"Alias `{{{ref}}}` does not match any token.")
+        return False, None
+
+    def _substitute(self, path: str, value: Any) -> Any:
+        if path in self._cyclic:
+            return value
+        if type(value) is str:
+            if "{" not in value:
+                return value
+            match = ALIAS_PATTERN.fullmatch(value)
+            if match is not None:
+                found, resolved = self._lookup(path, match.group(1))
+                return resolved if found else value
+
+            def interpolate(match: re.Match[str]) -> str:
+                found, resolved = self._lookup(path, match.group(1))
+                if found and isinstance(resolved, _INTERPOLATED_TYPES) and not isinstance(resolved, bool):
+                    return str(resolved)
+                return match.group(0)
+
+            return ALIAS_PATTERN.sub(interpolate, value)
+        if isinstance(value, dict):
+            return {key: self._substitute(path, item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._substitute(path, item) for item in value]
+        return value
+
+
+def resolve_token_aliases(tokens: list[CanonicalToken], report: ValidationReport) -> list[CanonicalToken]:
+    """Resolve `{path}` references in place of the raw strings; exports without aliases pass through untouched."""
+    if not any(_has_reference(token.value) for token in tokens):
+        return tokens
+    resolver = AliasResolver(tokens)
+    resolver.report_issues(report)
+    return resolver.resolve_tokens(tokens)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Collection
+
+from packages.contracts import CanonicalToken, CanonicalTokenModel
+from packages.rules.token_values import parse_color_cached, parse_numeric
+
+COLOR_GROUP = "color"
+
+
+@dataclass
+class IndexedToken:
+    token: CanonicalToken
+    segments: tuple[str, ...]
+    lower_path: str
+    rgb: tuple[int, int, int] | None = None
+    luminance: float | None = None
+    number: float | None = None
+
+
+@dataclass
+class TokenIndex:
+    """Per-model lookups shared by every rule so an audit scans the tokens once."""
+
+    entries: list[IndexedToken] = field(default_factory=list)
+    by_group: dict[str, list[IndexedToken]] = field(default_factory=dict)
+    by_group_path: dict[str, dict[str, IndexedToken]] = field(default_factory=dict)
+
+    def group(self, group: str) -> list[IndexedToken]:
+        return self.by_group.get(group, [])
+
+    def path_map(self, group: str) -> dict[str, IndexedToken]:
+        return self.by_group_path.get(group, {})
+
+
+def index_token(token: CanonicalToken) -> IndexedToken:
+    entry = IndexedToken(
+        token=token,
+        segments=tuple(token.path.split(".")),
+        lower_path=token.path.lower(),
+    )
+    if token.group == COLOR_GROUP:
+        parsed = parse_color_cached(token.value)
+        if parsed is not None:
+            entry.rgb, entry.luminance = parsed
+    else:
+        entry.number = parse_numeric(token.value)
+    return entry
+
+
+def build_token_index(canonical: CanonicalTokenModel, groups: Collection[str] | None = None) -> TokenIndex:
+    """Index every token, or only tokens in `groups` when the caller's rules read nothing else."""
+    index = TokenIndex()
+    for token in canonical.tokens:
+        if groups is not None and token.group not in groups:
+            continue
+        entry = index_token(token)
+        index.entries.append(entry)
+        index.by_group.setdefault(token.group, []).append(entry)
+        index.by_group_path.setdefault(token.group, {})[token.path] = entry
+    return index
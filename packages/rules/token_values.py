@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import colorsys
+import re
+import threading
+from collections import OrderedDict
+from typing import Any
+
+HEX_PATTERN = re.compile(r"^#([0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})$")
+RGB_PATTERN = re.compile(r"^rgba?\(([^)]+)\)$")
+HSL_PATTERN = re.compile(r"^hsla?\(([^)]+)\)$")
+NUMERIC_PATTERN = re.compile(r"-?\d+(?:\.\d+)?")
+
+DEFAULT_COLOR_CACHE_ENTRIES = 4096
+
+
+def parse_color(value: Any) -> tuple[int, int, int] | None:
+    if not isinstance(value, str):
+        return None
+    raw = value.strip()
+
+    hex_match = HEX_PATTERN.match(raw)
+    if hex_match:
+        color = hex_match.group(1)
+        if len(color) in (3, 4):
+            r = int(color[0] * 2, 16)
+            g = int(color[1] * 2, 16)
+            b = int(color[2] * 2, 16)
+            return (r, g, b)
+        if len(color) in (6, 8):
+            r = int(color[0:2], 16)
+            g = int(color[2:4], 16)
+            b = int(color[4:6], 16)
+            return (r, g, b)
+
+    rgb_match = RGB_PATTERN.match(raw)
+    if rgb_match:
+        parts = [part.strip() for part in rgb_match.group(1).split(",")]
+        if len(parts) < 3:
+            return None
+        try:
+            r = int(float(parts[0]))
+            g = int(float(parts[1]))
+            b = int(float(parts[2]))
+        except ValueError:
+            return None
+        return (_clamp_channel(r), _clamp_channel(g), _clamp_channel(b))
+
+    hsl_match = HSL_PATTERN.match(raw)
+    if hsl_match:
+        parts = [part.strip() for part in hsl_match.group(1).split(",")]
+        if len(parts) < 3:
+            return None
+        try:
+            h = float(parts[0]) % 360.0
+            s = _parse_percent(parts[1])
+            l = _parse_percent(parts[2])
+        except ValueError:
+            return None
+        r, g, b = colorsys.hls_to_rgb(h / 360.0, l, s)
+        return (_clamp_channel(round(r * 255)), _clamp_channel(round(g * 255)), _clamp_channel(round(b * 255)))
+
+    return None
+
+
+def _parse_percent(value: str) -> float:
+    cleaned = value.strip()
+    if cleaned.endswith("%"):
+        return float(cleaned[:-1]) / 100.0
+    return float(cleaned)
+
+
+def _clamp_channel(value: int) -> int:
+    return max(0, min(255, value))
+
+
+def linearize_channel(c: int) -> float:
+    srgb = c / 255.0
+    if srgb <= 0.03928:
+        return srgb / 12.92
+    return ((srgb + 0.055) / 1.055) ** 2.4
+
+
+# Per-channel sRGB linearization for every 8-bit value, shared by every luminance computation.
+CHANNEL_LUT = [linearize_channel(c) for c in range(256)]
+
+
+def relative_luminance(rgb: tuple[int, int, int]) -> float:
+    r, g, b = rgb
+    return 0.2126 * CHANNEL_LUT[r] + 0.7152 * CHANNEL_LUT[g] + 0.0722 * CHANNEL_LUT[b]
+
+
+ParsedColor = tuple[tuple[int, int, int], float]
+# Cached stand-in for literals that do not parse, so they are not re-parsed either.
+_UNPARSEABLE = object()
+
+
+class ColorLiteralCache:
+    """Bounded, thread-safe LRU of raw color literal -> (rgb, relative luminance).
+
+    Design systems repeat a few hundred literals across thousands of tokens and
+    across requests, so each distinct string is parsed once per process.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_COLOR_CACHE_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, value: Any) -> ParsedColor | None:
+        if not isinstance(value, str):
+            return None
+        with self._lock:
+            cached = self._entries.get(value)
+            if cached is not None:
+                self._entries.move_to_end(value)
+                self.hits += 1
+                return None if cached is _UNPARSEABLE else cached
+            self.misses += 1
+
+        rgb = parse_color(value)
+        parsed = (rgb, relative_luminance(rgb)) if rgb is not None else None
+        with self._lock:
+            self._entries[value] = _UNPARSEABLE if parsed is None else parsed
+            self._entries.move_to_end(value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return parsed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+DEFAULT_COLOR_CACHE = ColorLiteralCache()
+
+
+def parse_color_cached(value: Any) -> ParsedColor | None:
+    """`parse_color` through the shared literal cache, with the color's relative luminance."""
+    return DEFAULT_COLOR_CACHE.lookup(value)
+
+
+def parse_numeric(value: Any) -> float | None:
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    if isinstance(value, dict):
+        if "$value" in value:
+            return parse_numeric(value["$value"])
+        if "value" in value:
+            return parse_numeric(value["value"])
+        return None
+
+    if isinstance(value, str):
+        match = NUMERIC_PATTERN.search(value.strip())
+        if not match:
+            return None
+        try:
+            return float(match.group(0))
+        except ValueError:
+            return None
+
+    return None
@@ -3,6 +3,7 @@ from __future__ import annotations
 import re
 
 from packages.contracts import CanonicalToken, CanonicalTokenModel, RuleEvaluation, RuleViolation
+from packages.rules.token_index import IndexedToken, TokenIndex, build_token_index
 
 RULE_ID = "TOKENS_NAMING"
 DOT_SAFE_PATTERN = re.compile(r"^[a-z0-9]+(?:[._-][a-z0-9]+)*(?:\.[a-z0-9]+(?:[._-][a-z0-9]+)*)*$")
@@ -17,7 +18,11 @@ def _normalize_segment(segment: str) -> str:
 
 
 def _normalize_dot_path(path: str) -> str:
-    parts = [part for part in path.split(".") if part]
+    return _normalize_segments(path.split("."))
+
+
+def _normalize_segments(segments: tuple[str, ...] | list[str]) -> str:
+    parts = [part for part in segments if part]
     if not parts:
         return "token"
     return ".".join(_normalize_segment(part) for part in parts)
@@ -50,63 +55,73 @@ def _new_violation(
     )
 
 
-def evaluate_tokens_naming(canonical: CanonicalTokenModel) -> RuleEvaluation:
+def evaluate_token_naming(entry: IndexedToken, start: int = 1) -> list[RuleViolation]:
+    """Naming violations for a single token, numbered from `start`."""
     violations: list[RuleViolation] = []
-
-    for token in canonical.tokens:
-        suggested_path = _normalize_dot_path(token.path)
-        suggested_name = _normalize_dot_path(token.name)
-
-        if not token.path.startswith(f"{token.group}."):
-            violations.append(
-                _new_violation(
-                    index=len(violations) + 1,
-                    code="GROUP_PREFIX",
-                    title="Token Path Missing Group Prefix",
-                    description="Token path must start with its canonical group prefix.",
-                    token=token,
-                    evidence={"expected_prefix": f"{token.group}."},
-                    fix_hint={
-                        "action": "rename_token",
-                        "target": "path",
-                        "suggested_value": f"{token.group}.{suggested_name}",
-                    },
-                )
+    token = entry.token
+    suggested_path = _normalize_segments(entry.segments)
+    suggested_name = _normalize_dot_path(token.name)
+
+    if not token.path.startswith(f"{token.group}."):
+        violations.append(
+            _new_violation(
+                index=start + len(violations),
+                code="GROUP_PREFIX",
+                title="Token Path Missing Group Prefix",
+                description="Token path must start with its canonical group prefix.",
+                token=token,
+                evidence={"expected_prefix": f"{token.group}."},
+                fix_hint={
+                    "action": "rename_token",
+                    "target": "path",
+                    "suggested_value": f"{token.group}.{suggested_name}",
+                },
             )
-
-        if not DOT_SAFE_PATTERN.match(token.path):
-            violations.append(
-                _new_violation(
-                    index=len(violations) + 1,
-                    code="PATH_FORMAT",
-                    title="Token Path Has Invalid Format",
-                    description="Use lowercase dot-safe token path segments (a-z, 0-9, -, _).",
-                    token=token,
-                    evidence={"pattern": DOT_SAFE_PATTERN.pattern},
-                    fix_hint={
-                        "action": "rename_token",
-                        "target": "path",
-                        "suggested_value": suggested_path,
-                    },
-                )
+        )
+
+    if not DOT_SAFE_PATTERN.match(token.path):
+        violations.append(
+            _new_violation(
+                index=start + len(violations),
+                code="PATH_FORMAT",
+                title="Token Path Has Invalid Format",
+                description="Use lowercase dot-safe token path segments (a-z, 0-9, -, _).",
+                token=token,
+                evidence={"pattern": DOT_SAFE_PATTERN.pattern},
+                fix_hint={
+                    "action": "rename_token",
+                    "target": "path",
+                    "suggested_value": suggested_path,
+                },
             )
-
-        if not DOT_SAFE_PATTERN.match(token.name):
-            violations.append(
-                _new_violation(
-                    index=len(violations) + 1,
-                    code="NAME_FORMAT",
-                    title="Token Name Has Invalid Format",
-                    description="Use lowercase dot-safe token names (a-z, 0-9, -, _).",
-                    token=token,
-                    evidence={"pattern": DOT_SAFE_PATTERN.pattern},
-                    fix_hint={
-                        "action": "rename_token",
-                        "target": "name",
-                        "suggested_value": suggested_name,
-                    },
-                )
+        )
+
+    if not DOT_SAFE_PATTERN.match(token.name):
+        violations.append(
+            _new_violation(
+                index=start + len(violations),
+                code="NAME_FORMAT",
+                title="Token Name Has Invalid Format",
+                description="Use lowercase dot-safe token names (a-z, 0-9, -, _).",
+                token=token,
+                evidence={"pattern": DOT_SAFE_PATTERN.pattern},
+                fix_hint={
+                    "action": "rename_token",
+                    "target": "name",
+                    "suggested_value": suggested_name,
+                },
             )
+        )
+
+    return violations
+
+
+def evaluate_tokens_naming(canonical: CanonicalTokenModel, index: TokenIndex | None = None) -> RuleEvaluation:
+    violations: list[RuleViolation] = []
+    index = index or build_token_index(canonical)
+
+    for entry in index.entries:
+        violations.extend(evaluate_token_naming(entry, len(violations) + 1))
 
     status = "fail" if violations else "pass"
     return RuleEvaluation(rule_id=RULE_ID, status=status, violations=violations)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from packages.contracts import CanonicalToken, CanonicalTokenModel, RuleEvaluation, RuleViolation
+from packages.rules.token_index import IndexedToken, TokenIndex, build_token_index
 
 RULE_ID = "TOKENS_SEMANTIC_COVERAGE"
 REQUIRED_STATES = ("hover", "focus", "disabled")
@@ -11,12 +12,11 @@ def _is_state_segment(segment: str) -> bool:
     return segment in REQUIRED_STATES
 
 
-def _is_interactive_path(segments: list[str]) -> bool:
+def _is_interactive_path(segments: tuple[str, ...]) -> bool:
     return any(segment in INTERACTIVE_SEGMENTS for segment in segments)
 
 
-def _root_without_state(path: str) -> tuple[str, str | None]:
-    segments = path.split(".")
+def _root_without_state(path: str, segments: tuple[str, ...]) -> tuple[str, str | None]:
     last = segments[-1] if segments else ""
     if _is_state_segment(last):
         return ".".join(segments[:-1]), last
@@ -51,74 +51,103 @@ def _build_violation(
     )
 
 
-def evaluate_tokens_semantic_coverage(canonical: CanonicalTokenModel) -> RuleEvaluation:
+def semantic_scope(entry: IndexedToken) -> tuple[str, str | None] | None:
+    """(root path, state) for a color entry the rule covers, or None when it is out of scope."""
+    segments = entry.segments
+    if len(segments) < 3 or not _is_interactive_path(segments):
+        return None
+    return _root_without_state(entry.token.path, segments)
+
+
+def evaluate_semantic_root(
+    root: str,
+    representative_token: CanonicalToken,
+    states: set[str],
+    root_token: CanonicalToken | None,
+    start: int = 1,
+) -> list[RuleViolation]:
+    """Coverage violations for one semantic root, numbered from `start`."""
+    violations: list[RuleViolation] = []
+
+    if root_token is None:
+        violations.append(
+            _build_violation(
+                index=start + len(violations),
+                code="MISSING_BASE_STATE",
+                severity="medium",
+                title="Missing Base Semantic Token",
+                description=(
+                    "State tokens exist but the base semantic token is missing."
+                ),
+                token=representative_token,
+                evidence={"root_path": root, "states_found": sorted(states)},
+                fix_hint={
+                    "action": "create_base_semantic_token",
+                    "root_path": root,
+                },
+            )
+        )
+
+    missing_states = [state for state in REQUIRED_STATES if state not in states]
+    if missing_states:
+        violations.append(
+            _build_violation(
+                index=start + len(violations),
+                code="MISSING_SEMANTIC_STATES",
+                severity="medium",
+                title="Missing Semantic State Coverage",
+                description=(
+                    "Interactive semantic tokens should provide hover, focus, and disabled states."
+                ),
+                token=root_token or representative_token,
+                evidence={
+                    "root_path": root,
+                    "required_states": list(REQUIRED_STATES),
+                    "present_states": sorted(states),
+                    "missing_states": missing_states,
+                },
+                fix_hint={
+                    "action": "add_semantic_states",
+                    "root_path": root,
+                    "missing_states": missing_states,
+                },
+            )
+        )
+
+    return violations
+
+
+def evaluate_tokens_semantic_coverage(
+    canonical: CanonicalTokenModel, index: TokenIndex | None = None
+) -> RuleEvaluation:
     violations: list[RuleViolation] = []
-    color_tokens = [token for token in canonical.tokens if token.group == "color"]
-    path_to_token = {token.path: token for token in color_tokens}
+    index = index or build_token_index(canonical)
+    path_to_entry = index.path_map("color")
 
     candidate_roots: dict[str, CanonicalToken] = {}
     seen_states: dict[str, set[str]] = {}
 
-    for token in color_tokens:
-        segments = token.path.split(".")
-        if len(segments) < 3:
-            continue
-        if not _is_interactive_path(segments):
+    for entry in index.group("color"):
+        scope = semantic_scope(entry)
+        if scope is None:
             continue
 
-        root, state = _root_without_state(token.path)
-        candidate_roots.setdefault(root, token)
+        root, state = scope
+        candidate_roots.setdefault(root, entry.token)
         if state:
             seen_states.setdefault(root, set()).add(state)
 
     for root, representative_token in candidate_roots.items():
-        root_token = path_to_token.get(root)
-        states = seen_states.get(root, set())
-
-        if root_token is None:
-            violations.append(
-                _build_violation(
-                    index=len(violations) + 1,
-                    code="MISSING_BASE_STATE",
-                    severity="medium",
-                    title="Missing Base Semantic Token",
-                    description=(
-                        "State tokens exist but the base semantic token is missing."
-                    ),
-                    token=representative_token,
-                    evidence={"root_path": root, "states_found": sorted(states)},
-                    fix_hint={
-                        "action": "create_base_semantic_token",
-                        "root_path": root,
-                    },
-                )
-            )
-
-        missing_states = [state for state in REQUIRED_STATES if state not in states]
-        if missing_states:
-            violations.append(
-                _build_violation(
-                    index=len(violations) + 1,
-                    code="MISSING_SEMANTIC_STATES",
-                    severity="medium",
-                    title="Missing Semantic State Coverage",
-                    description=(
-                        "Interactive semantic tokens should provide hover, focus, and disabled states."
-                    ),
-                    token=root_token or representative_token,
-                    evidence={
-                        "root_path": root,
-                        "required_states": list(REQUIRED_STATES),
-                        "present_states": sorted(states),
-                        "missing_states": missing_states,
-                    },
-                    fix_hint={
-                        "action": "add_semantic_states",
-                        "root_path": root,
-                        "missing_states": missing_states,
-                    },
-                )
+        root_entry = path_to_entry.get(root)
+        violations.extend(
+            evaluate_semantic_root(
+                root,
+                representative_token,
+                seen_states.get(root, set()),
+                root_entry.token if root_entry else None,
+                len(violations) + 1,
             )
+        )
 
     status = "fail" if violations else "pass"
     return RuleEvaluation(rule_id=RULE_ID, status=status, violations=violations)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Hashable, Sequence
+
+from packages.contracts import CanonicalToken
+from packages.contracts.serialization import dumps
+from packages.rules.delta_audit import is_path_sorted
+
+
+@dataclass
+class VersionDiff:
+    """Token-level difference between two versions, each list in path order.
+
+    `renamed` pairs a removed token with an added one of the same group, type
+    and value; those tokens do not also appear in `removed`/`added`. `changed`
+    holds tokens whose type or value differs at the same path. `unchanged`
+    counts the tokens passed in that match at the same path in type and value
+    (they differ only in name or source, or not at all).
+    """
+
+    added: list[CanonicalToken] = field(default_factory=list)
+    removed: list[CanonicalToken] = field(default_factory=list)
+    renamed: list[tuple[CanonicalToken, CanonicalToken]] = field(default_factory=list)
+    changed: list[tuple[CanonicalToken, CanonicalToken]] = field(default_factory=list)
+    unchanged: int = 0
+
+
+# Scalars are compared by kind and equality; JSON encoding is only needed for objects and arrays.
+# The kind keeps 1, 1.0 and True apart, as their JSON encodings do, and being a string rather than
+# the type itself leaves the key tuples free of containers, so the collector can untrack them.
+_SCALAR_KINDS = {int: "int", float: "float", bool: "bool", type(None): "null"}
+
+
+def _path_ordered(tokens: Sequence[CanonicalToken]) -> Sequence[CanonicalToken]:
+    if is_path_sorted(tokens):
+        return tokens
+    # Duplicate paths resolve like the normalizer does: the last token wins.
+    return sorted({token.path: token for token in tokens}.values(), key=lambda token: token.path)
+
+
+def _rename_key(token: CanonicalToken) -> Hashable:
+    value = token.value
+    if type(value) is str:
+        # Most values; a string never equals a value of another kind, so it needs no tag.
+        return token.group, token.token_type, value
+    kind = _SCALAR_KINDS.get(type(value))
+    if kind is not None:
+        return token.group, token.token_type, kind, value
+    return token.group, token.token_type, "json", dumps(value, sort_keys=True)
+
+
+def diff_versions(old: Sequence[CanonicalToken], new: Sequence[CanonicalToken]) -> VersionDiff:
+    """Sorted merge of two versions' tokens, then rename matching over what was added and removed.
+
+    Callers may pass only the tokens that differ between the versions; tokens
+    present unchanged on both sides never affect the result.
+    """
+    old, new = _path_ordered(old), _path_ordered(new)
+    diff = VersionDiff()
+    removed: list[CanonicalToken] = []
+    added: list[CanonicalToken] = []
+    old_idx = new_idx = 0
+    while old_idx < len(old) and new_idx < len(new):
+        old_token, new_token = old[old_idx], new[new_idx]
+        if old_token.path == new_token.path:
+            if old_token.token_type != new_token.token_type or old_token.value != new_token.value:
+                diff.changed.append((old_token, new_token))
+            else:
+                diff.unchanged += 1
+            old_idx += 1
+            new_idx += 1
+        elif old_token.path < new_token.path:
+            removed.append(old_token)
+            old_idx += 1
+        else:
+            added.append(new_token)
+            new_idx += 1
+    removed.extend(old[old_idx:])
+    added.extend(new[new_idx:])
+
+    if not removed or not added:
+        diff.added, diff.removed = added, removed
+        return diff
+
+    # Each removed token is claimed by at most one added token, first in path order. Removed tokens
+    # sharing a key are chained by index (`next_match`) rather than collected into a list per key.
+    first_match: dict[Hashable, int] = {}
+    next_match = [-1] * len(removed)
+    for index in range(len(removed) - 1, -1, -1):
+        key = _rename_key(removed[index])
+        next_match[index] = first_match.get(key, -1)
+        first_match[key] = index
+    renamed_from: set[int] = set()
+    for token in added:
+        key = _rename_key(token)
+        index = first_match.get(key, -1)
+        if index >= 0:
+            first_match[key] = next_match[index]
+            renamed_from.add(index)
+            diff.renamed.append((removed[index], token))
+        else:
+            diff.added.append(token)
+    if renamed_from:
+        removed = [token for index, token in enumerate(removed) if index not in renamed_from]
+    diff.removed = removed
+    return diff
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from apps.api.src import rule_audit_endpoint
+from apps.api.src.audit_cache import AuditResultCache
+from apps.api.src.rule_audit_endpoint import post_rule_audit, post_rule_report
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = ROOT / "design" / "tokens" / "figma"
+
+
+class AuditResultCacheTests(unittest.TestCase):
+    def test_repeat_audit_skips_rule_evaluation(self) -> None:
+        cache = AuditResultCache()
+        payload = (FIXTURES / "sample-figma-tokens.json").read_bytes()
+
+        with mock.patch.object(
+            rule_audit_endpoint, "_evaluate_rules", wraps=rule_audit_endpoint._evaluate_rules
+        ) as evaluate:
+            first_status, first = post_rule_audit("source-a", payload, audit_cache=cache)
+            second_status, second = post_rule_audit("source-b", payload, audit_cache=cache)
+            report_status, report = post_rule_report("source-a", payload, audit_cache=cache)
+
+        self.assertEqual(evaluate.call_count, 1)
+        self.assertEqual((first_status, second_status, report_status), (200, 200, 200))
+        self.assertEqual(second["source_id"], "source-b")
+        self.assertNotEqual(first["audit_id"], second["audit_id"])
+        self.assertEqual(first["summary"], second["summary"])
+        self.assertEqual(first["violations"], second["violations"])
+        self.assertEqual(report["violations"], first["violations"])
+        self.assertEqual(cache.hits, 2)
+
+    def test_invalid_json_is_not_cached(self) -> None:
+        cache = AuditResultCache()
+
+        status, response = post_rule_audit("source-a", b"{invalid", audit_cache=cache)
+
+        self.assertEqual(status, 400)
+        self.assertEqual(response["error"]["code"], "invalid_json")
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction_respects_byte_budget(self) -> None:
+        entry = {"violations": ["x" * 100]}
+        entry_size = len(json.dumps(entry, separators=(",", ":")))
+        cache = AuditResultCache(max_bytes=entry_size * 2)
+
+        cache.put("a", entry)
+        cache.put("b", entry)
+        self.assertIsNotNone(cache.get("a"))
+        cache.put("c", entry)
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertLessEqual(cache.size_bytes, cache.max_bytes)
+
+    def test_disk_tier_survives_new_cache_instance(self) -> None:
+        payload = json.dumps({"color": {"bg": {"canvas": {"$value": "#ffffff"}}}}).encode("utf-8")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _, first = post_rule_audit("source-a", payload, audit_cache=AuditResultCache(disk_dir=tmp_dir))
+
+            warm_cache = AuditResultCache(disk_dir=tmp_dir)
+            with mock.patch.object(rule_audit_endpoint, "_evaluate_rules") as evaluate:
+                status, second = post_rule_audit("source-a", payload, audit_cache=warm_cache)
+
+        evaluate.assert_not_called()
+        self.assertEqual(status, 200)
+        self.assertEqual(second["summary"], first["summary"])
+
+
+if __name__ == "__main__":
+    unittest.main()
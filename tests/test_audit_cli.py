@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+from apps.cli.audit import expand_inputs, iter_audits, main, run_audit
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = ROOT / "design" / "tokens" / "figma"
+
+LOW_CONTRAST = {
+    "color": {
+        "text": {"primary": {"$value": "#9ca3af", "$type": "color"}},
+        "bg": {"canvas": {"$value": "#ffffff", "$type": "color"}},
+    }
+}
+
+
+def _run_main(argv: list[str]) -> tuple[int, list[dict]]:
+    stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+        code = main(argv)
+    stdout.flush()
+    return code, [json.loads(line) for line in stdout.buffer.getvalue().splitlines()]
+
+
+class AuditCliTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        (self.root / "nested").mkdir()
+        (self.root / "a.json").write_bytes((FIXTURES / "sample-figma-tokens.json").read_bytes())
+        (self.root / "nested" / "b.json").write_text(json.dumps(LOW_CONTRAST), encoding="utf-8")
+        (self.root / "notes.txt").write_text("ignored", encoding="utf-8")
+
+    def test_expand_inputs_walks_directories_and_globs_without_duplicates(self) -> None:
+        paths = expand_inputs([str(self.root), str(self.root / "**" / "*.json"), str(self.root / "missing.json")])
+
+        self.assertEqual(
+            paths,
+            [str(self.root / "a.json"), str(self.root / "nested" / "b.json"), str(self.root / "missing.json")],
+        )
+
+    def test_run_audit_streams_results_in_input_order_then_summary(self) -> None:
+        (self.root / "empty.json").write_bytes(b"")
+        (self.root / "broken.json").write_bytes(b"{not json")
+        paths = expand_inputs([str(self.root)]) + [str(self.root / "missing.json")]
+        out = io.BytesIO()
+
+        totals = run_audit(paths, out, rule_ids=["A11Y_CONTRAST"])
+
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([record["path"] for record in records[:-1]], paths)
+        by_name = {Path(record["path"]).name: record for record in records[:-1]}
+        self.assertEqual(by_name["b.json"]["summary"]["by_rule"], {"A11Y_CONTRAST": 1})
+        self.assertEqual(by_name["a.json"]["summary"]["total_violations"], 0)
+        self.assertEqual(by_name["empty.json"]["error"]["code"], "invalid_json")
+        self.assertEqual(by_name["broken.json"]["error"]["code"], "invalid_json")
+        self.assertEqual(by_name["missing.json"]["error"]["code"], "unreadable_file")
+
+        summary = records[-1]
+        self.assertEqual(summary["type"], "summary")
+        self.assertEqual((summary["file_count"], summary["audited"], summary["failed"]), (5, 2, 3))
+        self.assertEqual(summary["by_rule"], {"A11Y_CONTRAST": 1})
+        self.assertTrue(totals.reached("medium"))
+        self.assertFalse(totals.reached("critical"))
+
+    def test_worker_processes_match_inline_results(self) -> None:
+        paths = expand_inputs([str(self.root)]) * 3
+
+        inline = list(iter_audits(paths, workers=1))
+        pooled = list(iter_audits(paths, workers=2))
+
+        self.assertEqual(pooled, inline)
+
+    def test_main_exit_codes_follow_fail_on_and_unreadable_inputs(self) -> None:
+        code, records = _run_main([str(self.root), "--fail-on", "critical", "--summary-only", "--workers", "1"])
+        self.assertEqual(code, 0)
+        self.assertNotIn("violations", records[0])
+
+        code, _ = _run_main([str(self.root), "--fail-on", "high", "--workers", "1"])
+        self.assertEqual(code, 1)
+
+        code, records = _run_main([str(self.root / "missing.json"), "--workers", "1"])
+        self.assertEqual(code, 2)
+        self.assertEqual(records[-1]["failed"], 1)
+
+        with self.assertRaises(SystemExit):
+            _run_main([str(self.root), "--rules", "NOPE"])
+
+
+if __name__ == "__main__":
+    unittest.main()
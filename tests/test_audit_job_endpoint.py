@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import os
+import unittest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from apps.api.src.audit_job_endpoint import get_audit_job, post_rule_audit_job
+from apps.api.src.audit_jobs import AuditJobQueue
+from apps.api.src.audit_store import InMemoryAuditStore
+from apps.api.src.violations_query_endpoint import get_audit_violations
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = ROOT / "design" / "tokens" / "figma"
+
+
+class _ManualExecutor:
+    """Holds submitted work until the test runs it, so queue states are observable."""
+
+    def __init__(self) -> None:
+        self.submitted: list[tuple[Future, object, tuple]] = []
+
+    def submit(self, fn, *args):
+        future: Future = Future()
+        self.submitted.append((future, fn, args))
+        return future
+
+    def run_next(self) -> None:
+        future, fn, args = self.submitted.pop(0)
+        future.set_running_or_notify_cancel()
+        future.set_result(fn(*args))
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        return None
+
+
+class AuditJobEndpointTests(unittest.TestCase):
+    def test_job_moves_from_queued_to_done_with_result(self) -> None:
+        executor = _ManualExecutor()
+        queue = AuditJobQueue(max_queue_depth=4, executor_factory=lambda: executor)
+        payload = (FIXTURES / "sample-figma-tokens.json").read_bytes()
+
+        status, accepted = post_rule_audit_job("source-jobs", payload, job_queue=queue)
+        self.assertEqual(status, 202)
+        self.assertEqual(accepted["status"], "queued")
+
+        _, queued = get_audit_job(accepted["job_id"], job_queue=queue)
+        self.assertEqual(queued["status"], "queued")
+        self.assertNotIn("result", queued)
+
+        executor.run_next()
+        status, done = get_audit_job(accepted["job_id"], job_queue=queue)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(done["status"], "done")
+        self.assertEqual(done["result_status"], 200)
+        self.assertEqual(done["result"]["source_id"], "source-jobs")
+        self.assertIn("summary", done["result"])
+        self.assertEqual(queue.pending, 0)
+
+    def test_full_queue_rejects_with_error_envelope(self) -> None:
+        queue = AuditJobQueue(max_queue_depth=1, executor_factory=_ManualExecutor)
+        body = json.dumps({"color": {}}).encode("utf-8")
+
+        first_status, _ = post_rule_audit_job("source-jobs", body, job_queue=queue)
+        status, response = post_rule_audit_job("source-jobs", body, job_queue=queue)
+
+        self.assertEqual(first_status, 202)
+        self.assertEqual(status, 429)
+        self.assertEqual(response["error"]["code"], "audit_queue_full")
+
+    def test_unknown_job_returns_not_found(self) -> None:
+        status, response = get_audit_job("missing", job_queue=AuditJobQueue(executor_factory=_ManualExecutor))
+
+        self.assertEqual(status, 404)
+        self.assertEqual(response["error"]["code"], "job_not_found")
+
+    def test_process_pool_runs_audit_off_the_request_path(self) -> None:
+        queue = AuditJobQueue(max_workers=1, max_queue_depth=2)
+        self.addCleanup(queue.shutdown)
+        body = json.dumps({"color": {"text": {"fg": {"$value": "#9ca3af"}}, "bg": {"canvas": {"$value": "#fff"}}}})
+
+        _, accepted = post_rule_audit_job("source-jobs", body.encode("utf-8"), job_queue=queue)
+        queue.wait(accepted["job_id"], timeout=60)
+        _, done = get_audit_job(accepted["job_id"], job_queue=queue)
+
+        self.assertEqual(done["status"], "done")
+        self.assertEqual(done["result"]["summary"]["by_rule"], {"A11Y_CONTRAST": 1})
+
+    def test_completed_process_job_is_queryable_in_the_parent(self) -> None:
+        audit_store = InMemoryAuditStore()
+        queue = AuditJobQueue(max_workers=1, max_queue_depth=2, audit_store=audit_store)
+        self.addCleanup(queue.shutdown)
+        body = json.dumps({"color": {"text": {"fg": {"$value": "#9ca3af"}}, "bg": {"canvas": {"$value": "#fff"}}}})
+
+        _, accepted = post_rule_audit_job("source-jobs", body.encode("utf-8"), job_queue=queue)
+        queue.wait(accepted["job_id"], timeout=60)
+        _, done = get_audit_job(accepted["job_id"], job_queue=queue)
+        status, page = get_audit_violations("source-jobs", done["result"]["audit_id"], audit_store=audit_store)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(page["total"], 1)
+        self.assertEqual(page["violations"][0]["rule_id"], "A11Y_CONTRAST")
+
+    def test_job_runs_with_the_requested_rules_and_timings(self) -> None:
+        executor = _ManualExecutor()
+        queue = AuditJobQueue(max_queue_depth=4, executor_factory=lambda: executor, audit_store=InMemoryAuditStore())
+        payload = json.dumps(
+            {
+                "color": {
+                    "text": {"primary": {"$value": "#9ca3af", "$type": "color"}},
+                    "bg": {"canvas": {"$value": "#ffffff", "$type": "color"}},
+                    "Bad Name": {"$value": "#ffffff", "$type": "color"},
+                }
+            }
+        ).encode("utf-8")
+
+        _, accepted = post_rule_audit_job(
+            "source-jobs", payload, job_queue=queue, include_timings=True, rules=["A11Y_CONTRAST"]
+        )
+        executor.run_next()
+        _, done = get_audit_job(accepted["job_id"], job_queue=queue)
+
+        self.assertEqual(done["result_status"], 200)
+        self.assertEqual(set(done["result"]["summary"]["by_rule"]), {"A11Y_CONTRAST"})
+        self.assertIn("timings", done["result"])
+
+    def test_unsupported_selection_is_rejected_before_queueing(self) -> None:
+        executor = _ManualExecutor()
+        queue = AuditJobQueue(max_queue_depth=4, executor_factory=lambda: executor)
+        cases = (
+            ({"mode": "delta"}, "unsupported_audit_mode"),
+            ({"mode": "partial"}, "invalid_audit_mode"),
+            ({"rules": ["NOT_A_RULE"]}, "unknown_rule"),
+        )
+        for kwargs, code in cases:
+            with self.subTest(code=code):
+                status, response = post_rule_audit_job("source-jobs", b"{}", job_queue=queue, **kwargs)
+                self.assertEqual(status, 400)
+                self.assertEqual(response["error"]["code"], code)
+        self.assertEqual(executor.submitted, [])
+
+    def test_crashed_worker_fails_its_job_and_the_pool_is_replaced(self) -> None:
+        executor = _ManualExecutor()
+        queue = AuditJobQueue(max_queue_depth=4, executor_factory=lambda: executor)
+        _, accepted = post_rule_audit_job("source-jobs", b"{}", job_queue=queue)
+        future, _, _ = executor.submitted.pop(0)
+        future.set_running_or_notify_cancel()
+        future.set_exception(BrokenProcessPool("worker exited"))
+
+        _, failed = get_audit_job(accepted["job_id"], job_queue=queue)
+
+        self.assertEqual(failed["status"], "failed")
+        self.assertEqual(failed["result"]["error"]["code"], "audit_job_failed")
+        self.assertEqual(queue.pending, 0)
+
+    def test_process_pool_recovers_after_a_worker_crash(self) -> None:
+        queue = AuditJobQueue(max_workers=1, max_queue_depth=2)
+        self.addCleanup(queue.shutdown)
+        queue.submit("source-jobs", b"{}")
+        crash = queue._executor.submit(os._exit, 1)
+        with self.assertRaises(BrokenProcessPool):
+            crash.result(timeout=60)
+
+        status, accepted = post_rule_audit_job("source-jobs", b'{"color": {}}', job_queue=queue)
+        queue.wait(accepted["job_id"], timeout=60)
+        _, done = get_audit_job(accepted["job_id"], job_queue=queue)
+
+        self.assertEqual(status, 202)
+        self.assertEqual(done["status"], "done")
+
+
+if __name__ == "__main__":
+    unittest.main()
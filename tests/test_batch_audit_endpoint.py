@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+import os
+import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from apps.api.src.audit_store import InMemoryAuditStore
+from apps.api.src.batch_audit_endpoint import BatchAuditPool, post_batch_audit
+from apps.api.src.figma_import_endpoint import post_tokens_import_figma
+from apps.api.src.persistence import InMemoryTokenImportStore
+from apps.api.src.streaming import iter_ndjson
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = ROOT / "design" / "tokens" / "figma"
+
+
+class BatchAuditEndpointTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pool = BatchAuditPool(executor_factory=lambda: ThreadPoolExecutor(max_workers=2))
+        self.addCleanup(self.pool.shutdown)
+
+    def test_batch_streams_per_source_results_and_aggregate_summary(self) -> None:
+        sample = json.loads((FIXTURES / "sample-figma-tokens.json").read_text(encoding="utf-8"))
+        low_contrast = {
+            "color": {
+                "text": {"primary": {"$value": "#9ca3af", "$type": "color"}},
+                "bg": {"canvas": {"$value": "#ffffff", "$type": "color"}},
+            }
+        }
+        import_store = InMemoryTokenImportStore()
+        import_store.upsert_source("brand-c")
+        version = import_store.create_token_version(
+            source_id="brand-c",
+            input_format="figma_json",
+            input_sha256="0" * 64,
+            token_source="figma_export",
+            token_counts={},
+            validation_valid=True,
+        )
+        _, imported = post_tokens_import_figma("brand-e", json.dumps(low_contrast).encode(), import_store=import_store)
+        body = {
+            "sources": [
+                {"source_id": "brand-a", "payload": sample},
+                {"source_id": "brand-b", "payload": low_contrast},
+                {"source_id": "", "payload": sample},
+                {"source_id": "brand-c", "version_id": version.version_id},
+                {"source_id": "brand-d", "version_id": "missing"},
+                {"source_id": "brand-e", "version_id": imported["version_id"]},
+            ]
+        }
+        audit_store = InMemoryAuditStore()
+
+        status, records = post_batch_audit(
+            json.dumps(body).encode(), pool=self.pool, import_store=import_store, audit_store=audit_store
+        )
+        self.assertEqual(status, 200)
+        records = [json.loads(line) for line in iter_ndjson(records)]
+
+        self.assertEqual(records[0]["type"], "batch")
+        self.assertEqual(records[0]["source_count"], 6)
+        results = {record["index"]: record for record in records if record["type"] == "result"}
+        self.assertEqual(sorted(results), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(results[2]["error"]["code"], "invalid_source_id")
+        self.assertEqual(results[3]["status"], 422)
+        self.assertEqual(results[3]["error"]["code"], "version_payload_unavailable")
+        self.assertEqual(results[4]["error"]["code"], "version_not_found")
+        self.assertEqual(results[1]["audit"]["summary"]["by_rule"], {"A11Y_CONTRAST": 1})
+        self.assertEqual(results[5]["audit"]["violations"], results[1]["audit"]["violations"])
+        self.assertIsNotNone(audit_store.get_audit("brand-b", results[1]["audit"]["audit_id"]))
+
+        summary = records[-1]
+        self.assertEqual(summary["type"], "summary")
+        self.assertEqual((summary["succeeded"], summary["failed"]), (3, 3))
+        self.assertEqual(
+            summary["total_violations"],
+            sum(results[index]["audit"]["summary"]["total_violations"] for index in (0, 1, 5)),
+        )
+        self.assertGreaterEqual(summary["by_rule"]["A11Y_CONTRAST"], 1)
+
+    def test_batch_worker_failure_does_not_abort_the_batch(self) -> None:
+        def flaky(fn, *args):
+            if args[0] == "broken":
+                raise RuntimeError("worker crashed")
+            return fn(*args)
+
+        class _FlakyExecutor(ThreadPoolExecutor):
+            def submit(self, fn, *args):
+                return super().submit(flaky, fn, *args)
+
+        pool = BatchAuditPool(executor_factory=lambda: _FlakyExecutor(max_workers=1))
+        self.addCleanup(pool.shutdown)
+        body = {"sources": [{"source_id": "broken", "payload": {}}, {"source_id": "fine", "payload": {}}]}
+
+        _, records = post_batch_audit(json.dumps(body).encode(), pool=pool, audit_store=InMemoryAuditStore())
+        records = list(records)
+
+        statuses = {record["source_id"]: record["status"] for record in records if record["type"] == "result"}
+        self.assertEqual(statuses, {"broken": 500, "fine": 200})
+        self.assertEqual(records[-1]["failed"], 1)
+
+    def test_crashed_worker_fails_only_its_own_entries(self) -> None:
+        class _CrashingExecutor(ThreadPoolExecutor):
+            def submit(self, fn, *args):
+                if args[0] != "crashed":
+                    return super().submit(fn, *args)
+                future: Future = Future()
+                future.set_exception(BrokenProcessPool("worker exited"))
+                return future
+
+        pool = BatchAuditPool(executor_factory=lambda: _CrashingExecutor(max_workers=1))
+        self.addCleanup(pool.shutdown)
+        body = {"sources": [{"source_id": "crashed", "payload": {}}, {"source_id": "fine", "payload": {}}]}
+
+        _, records = post_batch_audit(json.dumps(body).encode(), pool=pool, audit_store=InMemoryAuditStore())
+        results = {record["source_id"]: record for record in records if record["type"] == "result"}
+
+        self.assertEqual(results["fine"]["status"], 200)
+        self.assertEqual(results["crashed"]["status"], 500)
+        self.assertEqual(results["crashed"]["error"]["code"], "audit_failed")
+        self.assertIn("worker process exited", results["crashed"]["error"]["message"])
+
+    def test_process_pool_is_replaced_after_a_worker_crash(self) -> None:
+        pool = BatchAuditPool(max_workers=1)
+        self.addCleanup(pool.shutdown)
+        crash = pool.submit(os._exit, 1)
+        with self.assertRaises(BrokenProcessPool):
+            crash.result(timeout=60)
+        body = {"sources": [{"source_id": "brand-a", "payload": {"color": {}}}]}
+
+        _, records = post_batch_audit(json.dumps(body).encode(), pool=pool, audit_store=InMemoryAuditStore())
+        records = list(records)
+
+        self.assertEqual(records[1]["status"], 200)
+        self.assertEqual(records[-1]["failed"], 0)
+
+    def test_batch_validation_errors_use_error_envelope(self) -> None:
+        for body, code in (
+            (b"not json", "invalid_json"),
+            (b'{"sources": []}', "invalid_batch"),
+            (json.dumps({"sources": [{"source_id": "x", "payload": {}}] * 300}).encode(), "batch_too_large"),
+        ):
+            status, response = post_batch_audit(body, pool=self.pool)
+            self.assertEqual(status, 400)
+            self.assertEqual(response["error"]["code"], code)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import unittest
+
+from apps.api.src.rule_audit_endpoint import _evaluate_rules
+from benchmarks.generators import (
+    COLOR_FORMATS,
+    ExportSpec,
+    generate_theme_config_export,
+    generate_tokens_studio_export,
+)
+from benchmarks.run import REFERENCE_CASE, compare
+
+
+class BenchmarkGeneratorTests(unittest.TestCase):
+    def test_tokens_studio_export_has_requested_size_and_depth(self) -> None:
+        spec = ExportSpec(size=300, depth=4, color_formats=COLOR_FORMATS, violation_fraction=0.0)
+
+        canonical, validation, violations = _evaluate_rules(generate_tokens_studio_export(spec))
+
+        self.assertTrue(validation.valid)
+        self.assertEqual(len(canonical.tokens), 300)
+        self.assertTrue(all(token.path.count(".") == 4 for token in canonical.tokens))
+        self.assertEqual(violations, [])
+
+    def test_violation_fraction_produces_violations_of_every_kind(self) -> None:
+        spec = ExportSpec(size=400, violation_fraction=0.25, seed=3)
+
+        _, _, violations = _evaluate_rules(generate_tokens_studio_export(spec))
+
+        rule_ids = {violation["rule_id"] for violation in violations}
+        self.assertEqual(rule_ids, {"TOKENS_NAMING", "TOKENS_SCALE", "TOKENS_SEMANTIC_COVERAGE", "A11Y_CONTRAST"})
+
+    def test_generators_are_deterministic(self) -> None:
+        spec = ExportSpec(size=50, color_formats=("hsl", "rgba"), seed=9)
+
+        self.assertEqual(generate_tokens_studio_export(spec), generate_tokens_studio_export(spec))
+        self.assertEqual(len(generate_theme_config_export(spec)["colors"]), 50)
+
+    def test_invalid_spec_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            ExportSpec(color_formats=("cmyk",))
+
+
+class BenchmarkGateTests(unittest.TestCase):
+    def test_compare_flags_throughput_and_memory_regressions(self) -> None:
+        baseline = {
+            "fast": {"unit": "tokens", "items": 10, "relative_throughput": 1.0, "peak_kib": 100.0},
+            "lean": {"unit": "tokens", "items": 10, "relative_throughput": 1.0, "peak_kib": 100.0},
+            "resized": {"unit": "tokens", "items": 20, "relative_throughput": 1.0, "peak_kib": 100.0},
+        }
+        results = {
+            "fast": {"unit": "tokens", "items": 10, "relative_throughput": 0.6, "peak_kib": 100.0},
+            "lean": {"unit": "tokens", "items": 10, "relative_throughput": 0.9, "peak_kib": 150.0},
+            "resized": {"unit": "tokens", "items": 10, "relative_throughput": 0.001, "peak_kib": 100.0},
+        }
+
+        failures = compare(results, baseline, throughput_tolerance=0.3, memory_tolerance=0.2)
+
+        self.assertEqual(len(failures), 2)
+        self.assertTrue(failures[0].startswith("fast:"))
+        self.assertTrue(failures[1].startswith("lean: peak"))
+
+    def test_slower_machine_is_not_a_regression(self) -> None:
+        baseline = {
+            REFERENCE_CASE: {"unit": "records", "items": 10, "throughput": 4000.0, "peak_kib": 10.0},
+            "audit": {"unit": "tokens", "items": 10, "throughput": 1000.0, "relative_throughput": 0.25, "peak_kib": 1},
+        }
+        # Everything, the reference included, runs at half speed.
+        results = {
+            REFERENCE_CASE: {"unit": "records", "items": 10, "throughput": 2000.0, "peak_kib": 10.0},
+            "audit": {"unit": "tokens", "items": 10, "throughput": 500.0, "relative_throughput": 0.25, "peak_kib": 1},
+        }
+
+        self.assertEqual(compare(results, baseline, throughput_tolerance=0.3, memory_tolerance=0.2), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import random
+import unittest
+from unittest import mock
+
+from packages.contracts import CanonicalToken, CanonicalTokenModel
+from packages.rules import contrast_engine, evaluate_a11y_contrast
+from packages.rules.contrast_engine import contrast_matrix, min_contrast_per_row
+
+
+def _random_palette(seed: int, size: int) -> list[tuple[int, int, int]]:
+    rng = random.Random(seed)
+    palette = [(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(24)]
+    return [rng.choice(palette) for _ in range(size)]
+
+
+class ContrastEngineTests(unittest.TestCase):
+    def test_row_minimum_keeps_first_background_on_ties(self) -> None:
+        white = (255, 255, 255)
+        grey = (156, 163, 175)
+
+        result = min_contrast_per_row([grey], [(0, 0, 0), white, white])
+
+        self.assertEqual(result, [(2.539, 1)])
+
+    def test_row_minimum_matches_contrast_matrix(self) -> None:
+        text = _random_palette(1, 40)
+        backgrounds = _random_palette(2, 30)
+
+        matrix = contrast_matrix(text, backgrounds)
+        expected = [(min(row), row.index(min(row))) for row in matrix]
+
+        self.assertEqual(min_contrast_per_row(text, backgrounds), expected)
+
+    @unittest.skipIf(contrast_engine.np is None, "numpy is not installed")
+    def test_numpy_and_python_paths_are_identical(self) -> None:
+        text = _random_palette(3, 400)
+        backgrounds = _random_palette(4, 300)
+
+        vectorized = min_contrast_per_row(text, backgrounds)
+        with mock.patch.object(contrast_engine, "np", None):
+            fallback = min_contrast_per_row(text, backgrounds)
+
+        self.assertEqual(vectorized, fallback)
+
+    def test_rule_uses_luminance_from_the_color_literal_cache(self) -> None:
+        tokens = [
+            CanonicalToken("color", f"color.text.t{idx}", f"text.t{idx}", "color", "#%02x%02x%02x" % rgb)
+            for idx, rgb in enumerate(_random_palette(7, 30))
+        ] + [
+            CanonicalToken("color", f"color.bg.b{idx}", f"bg.b{idx}", "color", "#%02x%02x%02x" % rgb)
+            for idx, rgb in enumerate(_random_palette(8, 20))
+        ]
+        model = CanonicalTokenModel(source="manual_upload", tokens=tokens)
+        texts = [contrast_engine.relative_luminance(rgb) for rgb in _random_palette(7, 30)]
+        backgrounds = [contrast_engine.relative_luminance(rgb) for rgb in _random_palette(8, 20)]
+
+        with mock.patch.object(contrast_engine, "relative_luminance", side_effect=AssertionError("recomputed")):
+            evaluation = evaluate_a11y_contrast(model)
+            rows = contrast_engine.min_luminance_contrast_per_row(texts, backgrounds)
+
+        self.assertEqual(rows, min_contrast_per_row(_random_palette(7, 30), _random_palette(8, 20)))
+        self.assertTrue(evaluation.violations)
+
+    def test_rule_output_is_unchanged_without_numpy(self) -> None:
+        tokens = [
+            CanonicalToken("color", f"color.text.t{idx}", f"text.t{idx}", "color", "#%02x%02x%02x" % rgb)
+            for idx, rgb in enumerate(_random_palette(5, 30))
+        ] + [
+            CanonicalToken("color", f"color.bg.b{idx}", f"bg.b{idx}", "color", "#%02x%02x%02x" % rgb)
+            for idx, rgb in enumerate(_random_palette(6, 20))
+        ]
+        model = CanonicalTokenModel(source="manual_upload", tokens=tokens)
+
+        expected = evaluate_a11y_contrast(model).to_dict()
+        with mock.patch.object(contrast_engine, "np", None):
+            fallback = evaluate_a11y_contrast(model).to_dict()
+
+        self.assertEqual(fallback, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import threading
+import unittest
+
+from apps.api.src.cpu_executor import CpuExecutor, ExecutorSaturated, gc_paused
+
+
+class CpuExecutorTests(unittest.TestCase):
+    def executor(self, **kwargs) -> CpuExecutor:
+        executor = CpuExecutor(**kwargs)
+        self.addCleanup(executor.shutdown)
+        return executor
+
+    def test_run_returns_the_handler_result_and_counts_completions(self) -> None:
+        executor = self.executor(max_workers=2)
+
+        result = asyncio.run(executor.run(divmod, 7, 2))
+
+        self.assertEqual(result, (3, 1))
+        self.assertEqual((executor.queued, executor.running, executor.completed), (0, 0, 1))
+
+    def test_full_queue_sheds_load_with_error_envelope(self) -> None:
+        executor = self.executor(max_workers=1, max_queue_depth=1)
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocked() -> None:
+            started.set()
+            release.wait(5)
+
+        running = executor.submit(blocked)
+        started.wait(5)
+        waiting = executor.submit(blocked)
+        with self.assertRaises(ExecutorSaturated) as raised:
+            executor.submit(blocked)
+        self.assertEqual((executor.running, executor.queued, executor.rejected), (1, 1, 1))
+
+        release.set()
+        running.result(5)
+        waiting.result(5)
+        status_code, response = raised.exception.response()
+        self.assertEqual(status_code, 429)
+        self.assertEqual(response["error"]["code"], "server_busy")
+
+    def test_iterate_yields_every_item_and_closes_abandoned_iterators(self) -> None:
+        executor = self.executor(max_workers=2)
+        closed = []
+
+        def records(count: int):
+            try:
+                yield from range(count)
+            finally:
+                closed.append(count)
+
+        async def collect(count: int, stop_after: int | None = None) -> list[int]:
+            items = []
+            stream = executor.iterate(records(count), batch_size=4)
+            async for item in stream:
+                items.append(item)
+                if stop_after is not None and len(items) == stop_after:
+                    break
+            await stream.aclose()
+            return items
+
+        self.assertEqual(asyncio.run(collect(10)), list(range(10)))
+        self.assertEqual(asyncio.run(collect(10, stop_after=5)), list(range(5)))
+        self.assertEqual(closed, [10, 10])
+
+    def test_gc_pauses_nest_and_restore_the_previous_state(self) -> None:
+        self.addCleanup(gc.enable)
+        with gc_paused():
+            with gc_paused():
+                self.assertFalse(gc.isenabled())
+            self.assertFalse(gc.isenabled())
+        self.assertTrue(gc.isenabled())
+
+        gc.disable()
+        with gc_paused():
+            pass
+        self.assertFalse(gc.isenabled())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+import random
+import unittest
+from dataclasses import replace
+
+from apps.api.src.audit_cache import AuditResultCache
+from apps.api.src.audit_store import DeltaStateStore, InMemoryAuditStore
+from apps.api.src.rule_audit_endpoint import post_rule_audit
+from benchmarks.generators import ExportSpec, generate_tokens_studio_export
+from packages.contracts import CanonicalToken, CanonicalTokenModel
+from packages.rules import normalize_figma_export
+from packages.contracts import RuleEvaluation
+from packages.rules.delta_audit import DeltaAuditState, diff_tokens, full_evaluations
+from packages.rules.registry import DEFAULT_RULE_REGISTRY, RuleSpec
+
+
+def _color(path: str, value: str) -> CanonicalToken:
+    return CanonicalToken("color", path, path.split(".", 1)[1], "color", value)
+
+
+def _model(tokens: list[CanonicalToken]) -> CanonicalTokenModel:
+    return CanonicalTokenModel(source="manual_upload", tokens=sorted(tokens, key=lambda token: token.path))
+
+
+def _dump(evaluations) -> list[tuple[str, str, list[tuple]]]:
+    return [
+        (
+            evaluation.rule_id,
+            evaluation.status,
+            [
+                (violation.violation_id, violation.code, violation.severity, violation.evidence)
+                for violation in evaluation.violations
+            ],
+        )
+        for evaluation in evaluations
+    ]
+
+
+class DeltaAuditTests(unittest.TestCase):
+    def assertMatchesFull(self, state: DeltaAuditState, model: CanonicalTokenModel) -> None:
+        self.assertEqual(_dump(state.evaluate(model)), _dump(full_evaluations(model)))
+
+    def test_diff_tokens_reports_added_removed_and_changed_paths(self) -> None:
+        old = _model([_color("color.a", "#000"), _color("color.b", "#111"), _color("color.c", "#222")])
+        new = _model([_color("color.b", "#111"), _color("color.c", "#333"), _color("color.d", "#444")])
+
+        delta = diff_tokens(old.tokens, new.tokens)
+
+        self.assertEqual((delta.added, delta.removed, delta.changed), (["color.d"], ["color.a"], ["color.c"]))
+
+    def test_contrast_rows_follow_background_edits(self) -> None:
+        tokens = [
+            _color("color.bg.canvas", "#ffffff"),
+            _color("color.bg.muted", "#f3f4f6"),
+            _color("color.text.primary", "#111827"),
+            _color("color.text.subtle", "#9ca3af"),
+        ]
+        state = DeltaAuditState()
+        self.assertMatchesFull(state, _model(tokens))
+        self.assertTrue(state.last_delta.full)
+
+        steps = [
+            tokens + [_color("color.bg.dark", "#1f2937")],  # new worst column for the dark text
+            tokens[:1] + tokens[2:] + [_color("color.bg.dark", "#1f2937")],  # worst background removed
+            [_color("color.bg.canvas", "#9ca3af")] + tokens[1:],  # first background changed
+            tokens + [_color("color.text.broken", "bad")],
+            [_color("color.bg.canvas", "bad"), _color("color.bg.muted", "nope")] + tokens[2:],
+            tokens,
+        ]
+        for step in steps:
+            self.assertMatchesFull(state, _model(step))
+            self.assertFalse(state.last_delta.full)
+
+    def test_semantic_and_scale_scopes_update_per_root_and_group(self) -> None:
+        spacing = [
+            CanonicalToken("spacing", f"spacing.scale.{value}", f"scale.{value}", "dimension", str(value))
+            for value in (4, 8, 16)
+        ]
+        button = [_color("color.button.primary.hover", "#111"), _color("color.button.primary.focus", "#222")]
+        state = DeltaAuditState()
+        self.assertMatchesFull(state, _model(spacing + button))
+
+        self.assertMatchesFull(state, _model(spacing + button + [_color("color.button.primary", "#000")]))
+        self.assertEqual(state.last_delta.added, ["color.button.primary"])
+        self.assertMatchesFull(state, _model(spacing[:2] + [replace(spacing[2], value="13")] + button))
+        self.assertMatchesFull(state, _model(spacing + button[:1] + [_color("color.link.primary.disabled", "#333")]))
+
+    def test_random_edit_sequences_match_full_evaluation(self) -> None:
+        rng = random.Random(7)
+        canonical, _ = normalize_figma_export(
+            generate_tokens_studio_export(ExportSpec(size=400, color_formats=("hex", "rgb", "hsl"), seed=3))
+        )
+        tokens = list(canonical.tokens)
+        values = ["#ffffff", "#000000", "#9ca3af", "#777777", "bad", "4", "12", "abc"]
+        state = DeltaAuditState()
+        for _ in range(20):
+            for _ in range(rng.choice([1, 3, 40])):
+                position = rng.randrange(len(tokens))
+                action = rng.random()
+                if action < 0.5:
+                    tokens[position] = replace(tokens[position], value=rng.choice(values))
+                elif action < 0.75 and len(tokens) > 1:
+                    tokens.pop(position)
+                else:
+                    token = tokens[position]
+                    tokens.append(replace(token, path=f"{token.path}.{rng.choice(['text', 'bg', 'hover'])}"))
+            tokens = sorted({token.path: token for token in tokens}.values(), key=lambda token: token.path)
+            self.assertMatchesFull(state, _model(tokens))
+
+    def test_only_selected_rules_are_tracked(self) -> None:
+        calls: list[int] = []
+
+        def count_tokens(canonical: CanonicalTokenModel) -> RuleEvaluation:
+            calls.append(len(canonical.tokens))
+            return RuleEvaluation(rule_id="TOKEN_COUNT", status="pass", violations=[])
+
+        specs = [
+            *DEFAULT_RULE_REGISTRY.select(["A11Y_CONTRAST"]),
+            RuleSpec("TOKEN_COUNT", "other", count_tokens, requires=()),
+        ]
+        tokens = [_color("color.bg.canvas", "#ffffff"), _color("color.Text.Primary", "#9ca3af")]
+        state = DeltaAuditState(specs)
+
+        dark = _color("color.bg.dark", "#1f2937")
+        runs = []
+        for step in (tokens, tokens + [dark], tokens + [dark]):
+            expected = _dump(full_evaluations(_model(step), specs))
+            before = len(calls)
+            evaluations = state.evaluate(_model(step))
+            runs.append(len(calls) - before)
+            self.assertEqual(_dump(evaluations), expected)
+
+        self.assertEqual([evaluation.rule_id for evaluation in evaluations], ["A11Y_CONTRAST", "TOKEN_COUNT"])
+        # Naming would flag `Text.Primary`, but its scopes are never evaluated.
+        self.assertEqual(state._naming, {})
+        # Unscoped rules re-run only when tokens change.
+        self.assertEqual(runs, [1, 1, 0])
+
+    def test_duplicate_paths_fall_back_to_full_evaluation(self) -> None:
+        tokens = [_color("color.text.primary", "#777777"), _color("color.text.primary", "#111111")]
+        model = CanonicalTokenModel(source="manual_upload", tokens=tokens + [_color("color.bg.canvas", "#fff")])
+        state = DeltaAuditState()
+
+        self.assertMatchesFull(state, model)
+        self.assertTrue(state.last_delta.full)
+        self.assertEqual(state.tokens, [])
+
+    def test_rule_audit_delta_mode_reports_changed_paths(self) -> None:
+        payload = {
+            "color": {
+                "text": {"primary": {"$value": "#9ca3af", "$type": "color"}},
+                "bg": {"canvas": {"$value": "#ffffff", "$type": "color"}},
+            }
+        }
+        store = DeltaStateStore()
+        kwargs = {"audit_store": InMemoryAuditStore(), "mode": "delta", "delta_store": store}
+
+        status, first = post_rule_audit("source-delta", json.dumps(payload).encode(), AuditResultCache(), **kwargs)
+        self.assertEqual(status, 200)
+        self.assertEqual(first["delta"], {"full": True, "added": 2, "removed": 0, "changed": 0})
+
+        payload["color"]["text"]["primary"]["$value"] = "#111827"
+        _, second = post_rule_audit("source-delta", json.dumps(payload).encode(), AuditResultCache(), **kwargs)
+        _, full = post_rule_audit("source-delta", json.dumps(payload).encode(), AuditResultCache())
+        self.assertEqual(second["delta"], {"full": False, "added": 0, "removed": 0, "changed": 1})
+        self.assertEqual(second["violations"], full["violations"])
+        self.assertNotIn("delta", full)
+        self.assertEqual(len(store), 1)
+
+        # A repeated body is not served from the cache: the state still reports (and applies) its delta.
+        shared_cache = AuditResultCache()
+        for value in ("#9ca3af", "#111827", "#9ca3af"):
+            payload["color"]["text"]["primary"]["$value"] = value
+            _, repeated = post_rule_audit("source-delta", json.dumps(payload).encode(), shared_cache, **kwargs)
+            self.assertEqual(repeated["delta"], {"full": False, "added": 0, "removed": 0, "changed": 1})
+        _, cached_full = post_rule_audit(
+            "source-delta", json.dumps(payload).encode(), shared_cache, include_timings=True
+        )
+        self.assertTrue(cached_full["timings"]["cache_hit"])
+
+        # A different rule selection starts a fresh state that evaluates only those rules.
+        _, contrast_only = post_rule_audit(
+            "source-delta", json.dumps(payload).encode(), AuditResultCache(), rules=["A11Y_CONTRAST"], **kwargs
+        )
+        self.assertTrue(contrast_only["delta"]["full"])
+        state = store.state_for("source-delta", DEFAULT_RULE_REGISTRY.select(["A11Y_CONTRAST"]))
+        self.assertEqual(state.rule_ids, {"A11Y_CONTRAST"})
+        _, contrast_full = post_rule_audit(
+            "source-delta", json.dumps(payload).encode(), AuditResultCache(), rules=["A11Y_CONTRAST"]
+        )
+        self.assertEqual(contrast_only["summary"], contrast_full["summary"])
+
+        status, response = post_rule_audit("source-delta", b"{}", mode="partial")
+        self.assertEqual(status, 400)
+        self.assertEqual(response["error"]["code"], "invalid_audit_mode")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+from apps.api.src.batch_audit_endpoint import BatchAuditPool
+from apps.api.src.cpu_executor import CpuExecutor
+from apps.api.src.persistence import DEFAULT_IMPORT_STORE
+from apps.api.src.request_limits import RequestLimits
+
+try:
+    from fastapi.testclient import TestClient
+
+    from apps.api.src.fastapi_app import create_app
+except (ImportError, RuntimeError):  # pragma: no cover - optional runtime dependency
+    TestClient = None
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = ROOT / "design" / "tokens" / "figma"
+
+
+@unittest.skipIf(TestClient is None, "fastapi test client is not installed")
+class FastApiAppTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = TestClient(create_app())
+
+    def test_import_hashes_the_exact_client_bytes(self) -> None:
+        raw = b'{\n  "color": {"bg": {"canvas": {"$value": "#ffffff"}}}\n}\n'
+
+        response = self.client.post(
+            "/api/v1/sources/source-raw-bytes/tokens/import/figma",
+            content=raw,
+            headers={"Content-Type": "application/json"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        versions = DEFAULT_IMPORT_STORE.list_versions_for_source("source-raw-bytes")
+        self.assertEqual(versions[-1].input_sha256, hashlib.sha256(raw).hexdigest())
+
+    def test_invalid_json_uses_error_envelope(self) -> None:
+        response = self.client.post("/api/v1/sources/source-raw-bytes/audits/rules", content=b"{invalid")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], "invalid_json")
+
+    def test_oversized_body_is_rejected_while_reading(self) -> None:
+        raw = (FIXTURES / "sample-figma-tokens.json").read_bytes()
+
+        with patch("apps.api.src.fastapi_app.DEFAULT_REQUEST_LIMITS", RequestLimits(max_body_bytes=64)):
+            response = self.client.post("/api/v1/sources/source-raw-bytes/audits/rules", content=raw)
+
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.json()["error"]["details"]["max_body_bytes"], 64)
+
+    def test_audit_route_passes_raw_body_to_handler(self) -> None:
+        raw = (FIXTURES / "sample-figma-tokens.json").read_bytes()
+
+        response = self.client.post("/api/v1/sources/source-raw-bytes/audits/rules", content=raw)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("summary", response.json())
+
+    def test_audit_and_report_routes_stream_ndjson_on_request(self) -> None:
+        raw = (FIXTURES / "sample-figma-tokens.json").read_bytes()
+        headers = {"accept": "application/x-ndjson"}
+
+        for route in ("rules", "report"):
+            response = self.client.post(f"/api/v1/sources/source-ndjson/audits/{route}", content=raw, headers=headers)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.headers["content-type"].startswith("application/x-ndjson"))
+            records = [json.loads(line) for line in response.text.splitlines()]
+            self.assertEqual((records[0]["type"], records[-1]["type"]), ("header", "summary"))
+
+        invalid = self.client.post("/api/v1/sources/source-ndjson/audits/rules", content=b"{", headers=headers)
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(invalid.json()["error"]["code"], "invalid_json")
+
+    def test_async_audit_route_forwards_rule_selection(self) -> None:
+        raw = (FIXTURES / "sample-figma-tokens.json").read_bytes()
+
+        with patch("apps.api.src.fastapi_app.post_rule_audit_job", return_value=(202, {})) as handler:
+            accepted = self.client.post(
+                "/api/v1/sources/source-async/audits/rules",
+                params={"async": "true", "rules": "A11Y_CONTRAST", "timings": "true"},
+                content=raw,
+            )
+        delta = self.client.post(
+            "/api/v1/sources/source-async/audits/rules", params={"async": "true", "mode": "delta"}, content=raw
+        )
+
+        self.assertEqual(accepted.status_code, 202)
+        self.assertEqual(handler.call_args.kwargs["rules"], ["A11Y_CONTRAST"])
+        self.assertTrue(handler.call_args.kwargs["include_timings"])
+        self.assertEqual(delta.status_code, 400)
+        self.assertEqual(delta.json()["error"]["code"], "unsupported_audit_mode")
+
+    def test_metrics_endpoint_serves_prometheus_text(self) -> None:
+        raw = (FIXTURES / "sample-figma-tokens.json").read_bytes()
+        self.client.post("/api/v1/sources/source-metrics/audits/rules", params={"timings": "true"}, content=raw)
+
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertIn("# TYPE qadms_audit_stage_wall_seconds histogram", response.text)
+        self.assertIn('qadms_audit_stage_wall_seconds_count{stage="serialize"}', response.text)
+        self.assertIn("# TYPE qadms_audit_cache_entries gauge", response.text)
+        self.assertIn("# TYPE qadms_audit_cache_hits_total counter", response.text)
+        self.assertIn("# TYPE qadms_color_cache_misses_total counter", response.text)
+
+    def test_batch_route_streams_ndjson_records(self) -> None:
+        raw = (FIXTURES / "sample-figma-tokens.json").read_text(encoding="utf-8")
+        body = '{"sources": [{"source_id": "brand-a", "payload": %s}]}' % raw
+        pool = BatchAuditPool(executor_factory=lambda: ThreadPoolExecutor(max_workers=1))
+        self.addCleanup(pool.shutdown)
+
+        with patch("apps.api.src.batch_audit_endpoint.DEFAULT_BATCH_POOL", pool):
+            response = self.client.post("/api/v1/audits/batch", content=body)
+        invalid = self.client.post("/api/v1/audits/batch", content=b'{"sources": []}')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("application/x-ndjson"))
+        records = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual([record["type"] for record in records], ["batch", "result", "summary"])
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(invalid.json()["error"]["code"], "invalid_batch")
+
+    def test_mode_routes_audit_and_import_each_mode(self) -> None:
+        raw = (FIXTURES / "sample-figma-tokens.json").read_text(encoding="utf-8")
+        body = '{"base": %s, "modes": {"light": {}, "dark": {"color": {"bg": {"$value": "#111827"}}}}}' % raw
+
+        audit = self.client.post(
+            "/api/v1/sources/source-modes/audits/modes", params={"rules": "A11Y_CONTRAST"}, content=body
+        )
+        imported = self.client.post("/api/v1/sources/source-modes/tokens/import/figma/modes", content=body)
+
+        self.assertEqual(audit.status_code, 200)
+        self.assertEqual([mode["mode"] for mode in audit.json()["modes"]], ["light", "dark"])
+        self.assertEqual(imported.status_code, 200)
+        self.assertEqual(len(imported.json()["modes"]), 2)
+
+    def test_cheap_routes_answer_while_cpu_executor_is_saturated(self) -> None:
+        executor = CpuExecutor(max_workers=1, max_queue_depth=0)
+        self.addCleanup(executor.shutdown)
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocked() -> None:
+            started.set()
+            release.wait(5)
+
+        busy = executor.submit(blocked)
+        started.wait(5)
+        try:
+            with patch("apps.api.src.fastapi_app.DEFAULT_CPU_EXECUTOR", executor):
+                health = self.client.get("/health")
+                job = self.client.get("/api/v1/jobs/missing")
+                audit = self.client.post("/api/v1/sources/source-busy/audits/rules", content=b"{}")
+                metrics = self.client.get("/metrics")
+        finally:
+            release.set()
+            busy.result(5)
+
+        self.assertEqual(health.status_code, 200)
+        self.assertEqual(job.status_code, 404)
+        self.assertEqual(audit.status_code, 429)
+        self.assertEqual(audit.json()["error"]["code"], "server_busy")
+        self.assertIn("qadms_cpu_executor_rejected_total 1", metrics.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
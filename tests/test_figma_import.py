@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import json
+import pickle
 import unittest
+from dataclasses import replace
 from hashlib import sha256
 from pathlib import Path
 
 from apps.api.src.figma_import_endpoint import post_tokens_import_figma
 from apps.api.src.persistence import InMemoryTokenImportStore
 from packages.contracts import CanonicalToken, CanonicalTokenModel
+from packages.rules import normalize_figma_export
 from packages.rules.demo_rule import evaluate_token_coverage
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -23,6 +26,16 @@ class FigmaImportTests(unittest.TestCase):
         self.assertEqual(response["error"]["code"], "invalid_json")
         self.assertIsInstance(response["error"]["details"], dict)
 
+    def test_non_finite_numbers_are_rejected_as_invalid_json(self) -> None:
+        store = InMemoryTokenImportStore()
+        for body in (b'{"spacing": {"a": {"$value": 1e400}}}', b'{"spacing": {"a": {"$value": NaN}}}'):
+            with self.subTest(body=body):
+                status, response = post_tokens_import_figma("source-demo", body, import_store=store)
+
+                self.assertEqual(status, 400)
+                self.assertEqual(response["error"]["code"], "invalid_json")
+        self.assertEqual(store.list_versions_for_source("source-demo"), [])
+
     def test_invalid_source_id_returns_error_envelope(self) -> None:
         payload = (FIXTURES / "sample-figma-tokens.json").read_bytes()
         status, response = post_tokens_import_figma("   ", payload)
@@ -73,6 +86,18 @@ class FigmaImportTests(unittest.TestCase):
         self.assertEqual(figma_eval["token_counts"], manual_eval["token_counts"])
         self.assertEqual(figma_eval["total_tokens"], manual_eval["total_tokens"])
 
+    def test_canonical_tokens_are_slotted_and_share_interned_fields(self) -> None:
+        payload = json.loads((FIXTURES / "sample-figma-tokens.json").read_text())
+        canonical, _ = normalize_figma_export(payload)
+        first, second = (CanonicalToken(**token.to_dict()) for token in canonical.tokens[:2])
+
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertIs(first.source, second.source)
+        self.assertIs(first.group, canonical.tokens[0].group)
+        self.assertEqual(first.to_dict(), canonical.tokens[0].to_dict())
+        self.assertEqual(pickle.loads(pickle.dumps(canonical.tokens[0])), canonical.tokens[0])
+        self.assertEqual(replace(first, value="#000000").value, "#000000")
+
     def test_response_contains_ui_provenance_metadata(self) -> None:
         payload = (FIXTURES / "sample-figma-tokens.json").read_bytes()
 
@@ -123,6 +148,21 @@ class FigmaImportTests(unittest.TestCase):
         self.assertEqual(persisted.token_counts, response["token_version"]["token_counts"])
         self.assertTrue(persisted.validation_valid)
 
+    def test_versions_store_content_addressed_tokens(self) -> None:
+        payload = json.loads((FIXTURES / "sample-figma-tokens.json").read_text(encoding="utf-8"))
+        store = InMemoryTokenImportStore()
+
+        _, first = post_tokens_import_figma("source-tokens", json.dumps(payload).encode(), import_store=store)
+        payload["color"]["bg"]["canvas"]["$value"] = "#fafafa"
+        _, second = post_tokens_import_figma("source-tokens", json.dumps(payload).encode(), import_store=store)
+
+        first_tokens = store.get_version_tokens(first["version_id"])
+        second_tokens = store.get_version_tokens(second["version_id"])
+        self.assertEqual([token.to_dict() for token in second_tokens], second["token_version"]["tokens"])
+        changed = [old.path for old, new in zip(first_tokens, second_tokens) if old is not new]
+        self.assertEqual(changed, ["color.bg.canvas"])
+        self.assertIsNone(store.get_version_tokens("missing"))
+
 
 if __name__ == "__main__":
     unittest.main()
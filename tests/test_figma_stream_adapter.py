@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+import unittest
+from pathlib import Path
+
+from packages.rules import normalize_figma_export, normalize_figma_export_stream
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = ROOT / "design" / "tokens" / "figma"
+
+
+def _as_dicts(result):
+    canonical, report = result
+    return canonical.to_dict(), report.to_dict()
+
+
+class FigmaStreamAdapterTests(unittest.TestCase):
+    def assert_matches_materialized(self, raw: bytes) -> None:
+        expected = _as_dicts(normalize_figma_export(json.loads(raw)))
+        self.assertEqual(_as_dicts(normalize_figma_export_stream(raw)), expected)
+
+    def test_fixtures_match_materialized_normalizer(self) -> None:
+        for fixture in ("sample-figma-tokens.json", "invalid-figma-tokens.json", "theme-config.json"):
+            with self.subTest(fixture=fixture):
+                self.assert_matches_materialized((FIXTURES / fixture).read_bytes())
+
+    def test_duplicate_keys_and_leaf_edge_cases_match(self) -> None:
+        raw = (
+            b'{"spacing": {"a": {"value": "4"}, "b": 3, "a": {"x": {"$value": "8"}}},'
+            b' "color": {"$type": "color", "text": {"$value": null, "fg": {"$value": "#000"}},'
+            b' "bg": {"type": "color", "value": {"r": 1}}, "list": [1, 2]},'
+            b' "radius": "8", "extra": {"ignored": true}, "uiTokens": {"fontSize": "14"}}'
+        )
+
+        self.assert_matches_materialized(raw)
+
+    def test_non_object_payload_matches(self) -> None:
+        self.assert_matches_materialized(b'[{"color": {}}]')
+
+    def test_chunked_input_and_deep_nesting(self) -> None:
+        depth = 3000
+        raw = b'{"color":' + b'{"a":' * depth + b'{"$value": "#fff"}' + b"}" * depth + b"}"
+        chunks = [raw[idx : idx + 64] for idx in range(0, len(raw), 64)]
+
+        canonical, report = normalize_figma_export_stream(chunks)
+
+        self.assertTrue(report.valid)
+        self.assertEqual(len(canonical.tokens), 1)
+        self.assertEqual(canonical.tokens[0].path, "color" + ".a" * depth)
+
+    def test_malformed_json_raises_value_error(self) -> None:
+        for raw in (b'{"color": {', b'{"color": {}} trailing', b""):
+            with self.subTest(raw=raw):
+                with self.assertRaises(ValueError):
+                    normalize_figma_export_stream(raw)
+
+
+if __name__ == "__main__":
+    unittest.main()
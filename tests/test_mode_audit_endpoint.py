@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import unittest
+
+from apps.api.src.audit_store import InMemoryAuditStore
+from apps.api.src.figma_import_endpoint import post_tokens_import_figma_modes
+from apps.api.src.instrumentation import MetricsRegistry
+from apps.api.src.mode_audit_endpoint import post_rule_mode_audit
+from apps.api.src.persistence import InMemoryTokenImportStore
+from apps.api.src.rule_audit_endpoint import post_rule_audit
+from apps.api.src.violations_query_endpoint import get_audit_violations
+from packages.rules.mode_tokens import MAX_MODES
+
+BASE = {
+    "color": {
+        "brand": {"ink": {"$value": "#111827"}, "paper": {"$value": "#ffffff"}},
+        "text": {"primary": {"$value": "{color.brand.ink}"}, "muted": {"$value": "#6b7280"}},
+        "bg": {"canvas": {"$value": "{color.brand.paper}"}},
+    },
+    "spacing": {"sm": {"$value": "4"}, "md": {"$value": "8"}, "lg": {"$value": "16"}},
+}
+MODES = {
+    "light": {},
+    "dark": {"color": {"brand": {"ink": {"$value": "#f9fafb"}, "paper": {"$value": "#111827"}}}},
+    "low-contrast": {"color": {"text": {"muted": {"$value": "#f3f4f6"}}}},
+    "dense": {"spacing": {"md": {"$value": "7"}, "xl": {"$value": "{spacing.lg}"}}},
+}
+
+
+def _merge(base: dict, overrides: dict) -> dict:
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict) and "$value" not in value:
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _body(base: dict, modes: dict) -> bytes:
+    return json.dumps({"base": base, "modes": modes}).encode("utf-8")
+
+
+class ModeAuditEndpointTests(unittest.TestCase):
+    def test_each_mode_matches_an_audit_of_its_merged_export(self) -> None:
+        status, response = post_rule_mode_audit(
+            "brand", _body(BASE, MODES), audit_store=InMemoryAuditStore(), metrics=MetricsRegistry()
+        )
+
+        self.assertEqual(status, 200)
+        self.assertEqual([mode["mode"] for mode in response["modes"]], list(MODES))
+        for mode in response["modes"]:
+            with self.subTest(mode=mode["mode"]):
+                merged = json.dumps(_merge(BASE, MODES[mode["mode"]])).encode("utf-8")
+                _, full = post_rule_audit("brand", merged, audit_store=InMemoryAuditStore(), metrics=MetricsRegistry())
+                self.assertEqual(mode["violations"], full["violations"])
+                self.assertEqual(mode["summary"], full["summary"])
+        by_mode = {mode["mode"]: mode for mode in response["modes"]}
+        self.assertEqual(by_mode["light"]["changed_token_count"], 0)
+        # Overriding the brand colors also changes the two aliases built on them.
+        self.assertEqual(by_mode["dark"]["changed_token_count"], 4)
+        self.assertEqual(response["summary"]["mode_count"], 4)
+        self.assertEqual(
+            response["summary"]["total_violations"], sum(response["summary"]["by_mode"].values())
+        )
+
+    def test_mode_audits_are_queryable_and_respect_rule_selection(self) -> None:
+        store = InMemoryAuditStore()
+        status, response = post_rule_mode_audit(
+            "brand", _body(BASE, MODES), audit_store=store, metrics=MetricsRegistry(), rules=["A11Y_CONTRAST"]
+        )
+
+        self.assertEqual(status, 200)
+        low_contrast = next(mode for mode in response["modes"] if mode["mode"] == "low-contrast")
+        self.assertGreater(low_contrast["summary"]["total_violations"], 0)
+        self.assertEqual(set(low_contrast["summary"]["by_rule"]), {"A11Y_CONTRAST"})
+        status, page = get_audit_violations("brand", low_contrast["audit_id"], audit_store=store)
+        self.assertEqual(status, 200)
+        self.assertEqual(page["total"], low_contrast["summary"]["total_violations"])
+
+    def test_invalid_bodies_are_rejected(self) -> None:
+        cases = {
+            b"[]": "invalid_mode_payload",
+            _body(BASE, {}): "invalid_mode_payload",
+            _body(BASE, {"dark": []}): "invalid_mode_payload",
+            _body(BASE, {f"mode-{index}": {} for index in range(MAX_MODES + 1)}): "too_many_modes",
+        }
+        for body, code in cases.items():
+            with self.subTest(code=code):
+                status, response = post_rule_mode_audit("brand", body, audit_store=InMemoryAuditStore())
+                self.assertEqual(status, 400)
+                self.assertEqual(response["error"]["code"], code)
+
+    def test_import_stores_one_version_per_mode(self) -> None:
+        store = InMemoryTokenImportStore()
+
+        status, response = post_tokens_import_figma_modes("brand", _body(BASE, MODES), import_store=store)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(len(store.list_versions_for_source("brand")), len(MODES))
+        dark = next(mode for mode in response["modes"] if mode["mode"] == "dark")
+        values = {token.path: token.value for token in store.get_version_tokens(dark["version_id"])}
+        self.assertEqual(values["color.text.primary"], "#f9fafb")
+        self.assertEqual(values["color.bg.canvas"], "#111827")
+        dense = next(mode for mode in response["modes"] if mode["mode"] == "dense")
+        self.assertEqual(dense["token_counts"], {"color": 5, "spacing": 4})
+        # Documented: the per-mode input hash covers the body plus the mode name.
+        body = _body(BASE, MODES)
+        self.assertEqual(
+            store.get_version(dark["version_id"]).input_sha256, hashlib.sha256(body + b"\0dark").hexdigest()
+        )
+        status, response = post_tokens_import_figma_modes("brand", _body(BASE, {}), import_store=store)
+        self.assertEqual((status, response["error"]["code"]), (400, "invalid_mode_payload"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import struct
+import unittest
+import zlib
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from apps.api.src import pixel_diff
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional runtime dependency
+    np = None
+
+
+def _png_rgba(pixels, filter_type: int = 0) -> bytes:
+    height, width = pixels.shape[:2]
+    rows = b"".join(bytes([filter_type]) + _filter_row(pixels, y, filter_type) for y in range(height))
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    return (
+        pixel_diff.PNG_SIGNATURE
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _filter_row(pixels, y: int, filter_type: int) -> bytes:
+    row = pixels[y].astype(np.int16).reshape(-1)
+    left = np.concatenate([np.zeros(4, dtype=np.int16), row[:-4]])
+    up = pixels[y - 1].astype(np.int16).reshape(-1) if y else np.zeros_like(row)
+    upper_left = np.concatenate([np.zeros(4, dtype=np.int16), up[:-4]])
+    if filter_type == 1:
+        row = row - left
+    elif filter_type == 2:
+        row = row - up
+    elif filter_type == 3:
+        row = row - (left + up) // 2
+    elif filter_type == 4:
+        estimate = left + up - upper_left
+        dist_left, dist_up, dist_ul = abs(estimate - left), abs(estimate - up), abs(estimate - upper_left)
+        predictor = np.where((dist_left <= dist_up) & (dist_left <= dist_ul), left, np.where(dist_up <= dist_ul, up, upper_left))
+        row = row - predictor
+    return (row % 256).astype(np.uint8).tobytes()
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class PixelDiffTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.baseline = np.full((40, 60, 4), 255, dtype=np.uint8)
+        self.baseline[10:20, 10:30, :3] = 0
+
+    def test_stdlib_decoder_handles_every_row_filter(self) -> None:
+        pixels = np.random.default_rng(7).integers(0, 256, (5, 7, 4), dtype=np.uint8)
+        for filter_type in range(5):
+            with self.subTest(filter_type=filter_type):
+                decoded = pixel_diff._decode_png_stdlib(_png_rgba(pixels, filter_type))
+                np.testing.assert_array_equal(decoded, pixels)
+
+    def test_identical_images_have_no_changes(self) -> None:
+        result = pixel_diff.diff_images(self.baseline, self.baseline.copy())
+
+        self.assertEqual(result.changed_pixels, 0)
+        self.assertEqual(result.regions, [])
+        self.assertEqual(result.total_pixels, 2400)
+
+    def test_changed_regions_report_bounding_boxes(self) -> None:
+        current = self.baseline.copy()
+        current[25:35, 40:55, :3] = (200, 0, 0)
+        current[2, 2, :3] = 0
+
+        result = pixel_diff.diff_images(current, self.baseline, detect_antialiasing=False)
+
+        self.assertEqual(result.changed_pixels, 151)
+        self.assertEqual(
+            [region.to_dict() for region in result.regions],
+            [
+                {"x": 40, "y": 25, "width": 15, "height": 10, "changed_pixels": 150},
+                {"x": 2, "y": 2, "width": 1, "height": 1, "changed_pixels": 1},
+            ],
+        )
+
+    def test_changed_edge_shading_counts_as_antialiasing(self) -> None:
+        baseline = np.full_like(self.baseline, 255)
+        baseline[10:30, 11:30, :3] = 0
+        baseline[10:30, 10, :3] = 128
+        current = baseline.copy()
+        current[10:30, 10, :3] = 90
+
+        result = pixel_diff.diff_images(baseline, current)
+        strict = pixel_diff.diff_images(baseline, current, detect_antialiasing=False)
+
+        self.assertEqual(result.changed_pixels, 0)
+        self.assertEqual(result.antialiased_pixels, 20)
+        self.assertEqual(strict.changed_pixels, 20)
+
+    def test_inverted_checkerboard_is_a_real_change(self) -> None:
+        checkerboard = np.full((64, 64, 4), 255, dtype=np.uint8)
+        checkerboard[np.indices((64, 64)).sum(axis=0) % 2 == 1, :3] = 0
+        inverted = checkerboard.copy()
+        inverted[..., :3] = 255 - checkerboard[..., :3]
+
+        result = pixel_diff.diff_images(checkerboard, inverted)
+
+        self.assertEqual(result.changed_pixels, 4096)
+        self.assertEqual(result.antialiased_pixels, 0)
+
+    def test_new_stroke_next_to_an_existing_one_is_a_real_change(self) -> None:
+        baseline = np.full_like(self.baseline, 255)
+        baseline[:, 10, :3] = 0
+        current = baseline.copy()
+        current[:, 11, :3] = 0
+
+        result = pixel_diff.diff_images(baseline, current)
+
+        self.assertEqual(result.changed_pixels, 40)
+        self.assertEqual(result.antialiased_pixels, 0)
+
+    def test_dense_and_sparse_passes_agree(self) -> None:
+        rng = np.random.default_rng(3)
+        # Shapes off the block grid, spanning several blocks, with and without translucent pixels.
+        for shape, translucent in (((30, 40), False), ((75, 101), False), ((66, 33), True)):
+            with self.subTest(shape=shape, translucent=translucent):
+                baseline = np.repeat(rng.integers(0, 3, (*shape, 1)).astype(np.uint8) * 120, 4, axis=2)
+                baseline[..., 3] = rng.choice([128, 255], shape) if translucent else 255
+                baseline[rng.random(shape) < 0.5] = baseline[0, 0]
+                current = baseline.copy()
+                redrawn = rng.random(shape) < 0.3
+                current[redrawn, :3] = rng.integers(0, 3, (int(redrawn.sum()), 1)).astype(np.uint8) * 120
+                changed = baseline.view(np.uint32)[..., 0] != current.view(np.uint32)[..., 0]
+
+                sparse_mask, sparse_aa = pixel_diff._diff_sparse(baseline, current, changed.copy(), 0, True)
+                dense_mask, dense_aa = pixel_diff._diff_dense(baseline, current, changed.copy(), 0, True)
+
+                np.testing.assert_array_equal(sparse_mask, dense_mask)
+                self.assertEqual(sparse_aa, dense_aa)
+                self.assertGreater(sparse_aa, 0)
+
+    def test_color_tolerance_ignores_small_channel_deltas(self) -> None:
+        current = self.baseline.copy()
+        current[..., 0] = np.where(current[..., 0] > 0, current[..., 0] - 3, 3)
+
+        self.assertEqual(pixel_diff.diff_images(self.baseline, current, color_tolerance=3).changed_pixels, 0)
+        self.assertEqual(pixel_diff.diff_images(self.baseline, current, color_tolerance=2).changed_pixels, 2400)
+
+    def test_size_mismatch_counts_uncovered_pixels_as_changed(self) -> None:
+        result = pixel_diff.diff_images(self.baseline, self.baseline[:30])
+
+        self.assertEqual(result.changed_pixels, 600)
+        self.assertEqual(result.regions[0].to_dict(), {"x": 0, "y": 30, "width": 60, "height": 10, "changed_pixels": 600})
+
+    def test_mask_png_round_trips(self) -> None:
+        mask = np.zeros((9, 13), dtype=bool)
+        mask[3:5, 2:11] = True
+
+        decoded = pixel_diff.decode_png(pixel_diff.encode_mask_png(mask))
+
+        np.testing.assert_array_equal(decoded[..., 0] == 255, mask)
+
+    def test_load_png_snapshot_rejects_refs_outside_root(self) -> None:
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "base.png").write_bytes(_png_rgba(self.baseline))
+
+            self.assertTrue(pixel_diff.load_png_snapshot("file://base.png", root).startswith(pixel_diff.PNG_SIGNATURE))
+            with self.assertRaises(pixel_diff.SnapshotError):
+                pixel_diff.load_png_snapshot("file://../base.png", root)
+            with self.assertRaises(pixel_diff.SnapshotError):
+                pixel_diff.load_png_snapshot("file://base.png", None)
+        self.assertIsNone(pixel_diff.load_png_snapshot("component:button:default"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+import unittest
+from unittest.mock import patch
+
+from apps.api.src import request_limits
+from apps.api.src.audit_cache import AuditResultCache
+from apps.api.src.audit_store import InMemoryAuditStore
+from apps.api.src.figma_import_endpoint import post_tokens_import_figma
+from apps.api.src.persistence import InMemoryTokenImportStore
+from apps.api.src.request_limits import RequestLimits, json_depth, parse_json_body
+from apps.api.src.rule_audit_endpoint import post_rule_audit, post_rule_audit_stream
+
+LOW_CONTRAST = {
+    "color": {
+        "text": {"primary": {"$value": "#9ca3af", "$type": "color"}},
+        "bg": {"canvas": {"$value": "#ffffff", "$type": "color"}},
+    }
+}
+
+
+class RequestLimitsTests(unittest.TestCase):
+    def test_json_depth_ignores_brackets_inside_strings(self) -> None:
+        cases = {
+            b"": 0,
+            b"1": 0,
+            b'{"a": [1, {"b": []}]}': 4,
+            b'{"a": "[[[{{{", "b": ["x"]}': 2,
+            b'{"a": "\\"[[[", "b": "\\\\", "c": {"d": "]]]"}}': 2,
+            b"[" * 5000 + b"]" * 5000: 5000,
+        }
+        for body, depth in cases.items():
+            self.assertEqual(json_depth(body), depth, body[:40])
+        with patch.object(request_limits, "np", None):
+            for body, depth in cases.items():
+                self.assertEqual(json_depth(body), depth, body[:40])
+
+    def test_parse_json_body_rejects_oversized_deep_and_malformed_bodies(self) -> None:
+        limits = RequestLimits(max_body_bytes=64, max_json_depth=3)
+        for body, status, code in (
+            (b'{"a": "' + b"x" * 100 + b'"}', 413, "request_too_large"),
+            (b'{"a": [[[1]]]}', 422, "json_too_deep"),
+            (b'{"a": ', 400, "invalid_json"),
+            (b'{"a": NaN}', 400, "invalid_json"),
+            (b'{"a": -Infinity}', 400, "invalid_json"),
+            (b'{"a": -1e400}', 400, "invalid_json"),
+        ):
+            payload, error = parse_json_body(body, limits)
+            self.assertIsNone(payload)
+            self.assertEqual(error[0], status)
+            self.assertEqual(error[1]["error"]["code"], code)
+
+        self.assertEqual(parse_json_body(b'{"a": [[1]]}', limits), ({"a": [[1]]}, None))
+
+    def test_deeply_nested_audit_body_is_rejected_before_parsing(self) -> None:
+        body = b'{"color": ' + b"[" * 100_000 + b"]" * 100_000 + b"}"
+
+        status, response = post_rule_audit("source-deep", body, AuditResultCache(), InMemoryAuditStore())
+
+        self.assertEqual(status, 422)
+        self.assertEqual(response["error"]["code"], "json_too_deep")
+        self.assertEqual(response["error"]["details"]["json_depth"], 100_001)
+
+    def test_token_and_violation_caps_use_error_envelope(self) -> None:
+        body = json.dumps(LOW_CONTRAST).encode("utf-8")
+        kwargs = {"audit_cache": AuditResultCache(), "audit_store": InMemoryAuditStore()}
+
+        status, response = post_rule_audit("source-caps", body, limits=RequestLimits(max_tokens=1), **kwargs)
+        self.assertEqual((status, response["error"]["code"]), (422, "too_many_tokens"))
+
+        status, response = post_rule_audit("source-caps", body, limits=RequestLimits(max_violations=0), **kwargs)
+        self.assertEqual((status, response["error"]["code"]), (422, "too_many_violations"))
+
+        status, response = post_tokens_import_figma(
+            "source-caps", body, import_store=InMemoryTokenImportStore(), limits=RequestLimits(max_tokens=1)
+        )
+        self.assertEqual((status, response["error"]["code"]), (422, "too_many_tokens"))
+
+    def test_stream_stops_with_error_record_when_violation_cap_is_hit(self) -> None:
+        body = json.dumps(LOW_CONTRAST).encode("utf-8")
+
+        status, records = post_rule_audit_stream("source-caps", body, limits=RequestLimits(max_violations=0))
+        records = list(records)
+
+        self.assertEqual(status, 200)
+        self.assertEqual([record["type"] for record in records], ["header", "error"])
+        self.assertEqual(records[-1]["error"]["code"], "too_many_violations")
+
+        status, response = post_rule_audit_stream("source-caps", body, limits=RequestLimits(max_tokens=1))
+        self.assertEqual((status, response["error"]["code"]), (422, "too_many_tokens"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,10 @@ import json
 import unittest
 from pathlib import Path
 
-from apps.api.src.rule_audit_endpoint import post_rule_audit
+from apps.api.src.audit_cache import AuditResultCache
+from apps.api.src.instrumentation import AuditTimings, MetricsRegistry, StageTiming
+from apps.api.src.rule_audit_endpoint import RULESET_VERSION, post_rule_audit, post_rule_audit_stream
+from apps.api.src.streaming import encode_json, iter_ndjson
 
 ROOT = Path(__file__).resolve().parents[1]
 FIXTURES = ROOT / "design" / "tokens" / "figma"
@@ -64,6 +67,122 @@ class RuleAuditEndpointTests(unittest.TestCase):
         self.assertIn("error", response)
         self.assertEqual(response["error"]["code"], "invalid_source_id")
 
+    def test_results_cached_before_alias_resolution_are_not_reused(self) -> None:
+        payload = json.dumps(
+            {
+                "color": {
+                    "brand": {"muted": {"$value": "#9ca3af", "$type": "color"}},
+                    "text": {"primary": {"$value": "{color.brand.muted}", "$type": "color"}},
+                    "bg": {"canvas": {"$value": "#ffffff", "$type": "color"}},
+                }
+            }
+        ).encode("utf-8")
+        cache = AuditResultCache()
+        # What the ruleset produced before aliases resolved: the alias string was not a color.
+        cache.put(cache.make_key(payload, "2026.10.1"), {"summary": {"total_violations": 0}, "violations": []})
+
+        status, response = post_rule_audit("source-aliases", payload, audit_cache=cache, include_timings=True)
+
+        self.assertNotEqual(RULESET_VERSION, "2026.10.1")
+        self.assertEqual(status, 200)
+        self.assertFalse(response["timings"]["cache_hit"])
+        self.assertEqual(response["summary"]["by_rule"], {"A11Y_CONTRAST": 1})
+
+    def test_rule_audit_reports_opt_in_timings_and_records_metrics(self) -> None:
+        payload = (FIXTURES / "sample-figma-tokens.json").read_bytes()
+        cache = AuditResultCache()
+        metrics = MetricsRegistry()
+
+        status, response = post_rule_audit("source-audit", payload, audit_cache=cache, metrics=metrics)
+        self.assertEqual(status, 200)
+        self.assertNotIn("timings", response)
+
+        status, response = post_rule_audit(
+            "source-audit", payload, audit_cache=AuditResultCache(), include_timings=True, metrics=metrics
+        )
+        timings = response["timings"]
+        self.assertFalse(timings["cache_hit"])
+        stages = [(stage["stage"], stage.get("rule_id")) for stage in timings["stages"]]
+        self.assertEqual(
+            stages,
+            [
+                ("cache_lookup", None),
+                ("parse", None),
+                ("normalization", None),
+                ("index", None),
+                ("rule", "TOKENS_NAMING"),
+                ("rule", "TOKENS_SCALE"),
+                ("rule", "TOKENS_SEMANTIC_COVERAGE"),
+                ("rule", "A11Y_CONTRAST"),
+                ("sort", None),
+                ("cache_store", None),
+            ],
+        )
+        rule_violations = sum(stage.get("violation_count", 0) for stage in timings["stages"] if stage["stage"] == "rule")
+        self.assertEqual(rule_violations, response["summary"]["total_violations"])
+
+        _, cached = post_rule_audit("source-audit", payload, audit_cache=cache, include_timings=True, metrics=metrics)
+        self.assertTrue(cached["timings"]["cache_hit"])
+        self.assertEqual([stage["stage"] for stage in cached["timings"]["stages"]], ["cache_lookup"])
+
+        exposition = metrics.render_prometheus()
+        self.assertIn('qadms_audit_requests_total{cache="miss"} 2', exposition)
+        self.assertIn('qadms_audit_requests_total{cache="hit"} 1', exposition)
+        self.assertIn('qadms_audit_stage_wall_seconds_count{stage="rule",rule_id="A11Y_CONTRAST"} 2', exposition)
+
+    def test_total_wall_time_is_elapsed_time_not_the_sum_of_overlapping_stages(self) -> None:
+        timings = AuditTimings()
+        for rule_id in ("TOKENS_NAMING", "A11Y_CONTRAST"):
+            # Rules run concurrently, so their stage times can each cover most of the request.
+            timings.stages.append(StageTiming(stage="rule", rule_id=rule_id, wall_seconds=5.0, cpu_seconds=0.5))
+
+        summary = timings.to_dict()
+
+        self.assertLess(summary["total_wall_ms"], 5000)
+        self.assertEqual(summary["total_cpu_ms"], 1000)
+
+    def test_response_encoding_is_recorded_as_serialize_stage(self) -> None:
+        payload = (FIXTURES / "sample-figma-tokens.json").read_bytes()
+        metrics = MetricsRegistry()
+        _, audit = post_rule_audit("source-encode", payload, audit_cache=AuditResultCache())
+
+        body = encode_json(audit, metrics)
+        _, records = post_rule_audit_stream("source-encode", payload)
+        lines = list(iter_ndjson(records, metrics))
+
+        self.assertEqual(json.loads(body), audit)
+        self.assertEqual(json.loads(lines[-1])["type"], "summary")
+        exposition = metrics.render_prometheus()
+        self.assertIn('qadms_audit_stage_wall_seconds_count{stage="serialize"} 2', exposition)
+        # Encoding is a stage of its own, not another audit request.
+        self.assertIn('qadms_audit_requests_total{cache="miss"} 0', exposition)
+
+    def test_rule_audit_stream_matches_json_audit(self) -> None:
+        payload = (FIXTURES / "sample-figma-tokens.json").read_bytes()
+        metrics = MetricsRegistry()
+
+        _, audit = post_rule_audit("source-stream", payload, audit_cache=AuditResultCache())
+        status, records = post_rule_audit_stream("source-stream", payload, metrics=metrics)
+        self.assertEqual(status, 200)
+        header = next(records)
+        self.assertEqual(header["type"], "header")
+        self.assertEqual(header["normalization"], audit["normalization"])
+        self.assertNotIn('cache="miss"} 1', metrics.render_prometheus())
+
+        records = list(records)
+        violations = [{key: value for key, value in record.items() if key != "type"} for record in records[:-1]]
+        self.assertTrue(all(record["type"] == "violation" for record in records[:-1]))
+        self.assertEqual(
+            sorted(violations, key=lambda item: item["violation_id"]),
+            sorted(audit["violations"], key=lambda item: item["violation_id"]),
+        )
+        self.assertEqual(records[-1], {"type": "summary", **audit["summary"]})
+        self.assertIn('qadms_audit_requests_total{cache="miss"} 1', metrics.render_prometheus())
+
+        status, response = post_rule_audit_stream(" ", payload)
+        self.assertEqual(status, 400)
+        self.assertEqual(response["error"]["code"], "invalid_source_id")
+
 
 if __name__ == "__main__":
     unittest.main()
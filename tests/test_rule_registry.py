@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from apps.api.src.audit_cache import AuditResultCache
+from apps.api.src.audit_store import InMemoryAuditStore
+from apps.api.src.rule_audit_endpoint import post_rule_audit
+from packages.contracts import RuleEvaluation
+from packages.rules import normalize_figma_export
+from packages.rules.registry import DEFAULT_RULE_REGISTRY, RuleRegistry, RuleSpec, UnknownRuleError
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = ROOT / "design" / "tokens" / "figma"
+
+
+def _sample_canonical():
+    payload = json.loads((FIXTURES / "sample-figma-tokens.json").read_text(encoding="utf-8"))
+    canonical, _ = normalize_figma_export(payload)
+    return canonical
+
+
+class RuleRegistryTests(unittest.TestCase):
+    def test_select_keeps_registration_order_and_rejects_unknown_ids(self) -> None:
+        specs = DEFAULT_RULE_REGISTRY.select(["A11Y_CONTRAST", "TOKENS_NAMING"])
+        self.assertEqual([spec.rule_id for spec in specs], ["TOKENS_NAMING", "A11Y_CONTRAST"])
+
+        with self.assertRaises(UnknownRuleError) as raised:
+            DEFAULT_RULE_REGISTRY.select(["TOKENS_NAMING", "NOPE"])
+        self.assertEqual(raised.exception.rule_ids, ["NOPE"])
+
+    def test_register_rejects_duplicates_and_missing_precomputations(self) -> None:
+        registry = RuleRegistry(max_workers=1)
+        registry.register_precomputation("index", lambda canonical, groups: None)
+        spec = RuleSpec("X", "tokens", lambda canonical, index: RuleEvaluation("X", "pass", []))
+        registry.register(spec)
+
+        with self.assertRaises(ValueError):
+            registry.register(spec)
+        with self.assertRaises(ValueError):
+            registry.register(RuleSpec("Y", "tokens", spec.evaluate, requires=("graph",)))
+
+    def test_prepare_limits_the_index_to_groups_the_selected_rules_read(self) -> None:
+        canonical = _sample_canonical()
+
+        color_only = DEFAULT_RULE_REGISTRY.prepare(canonical, DEFAULT_RULE_REGISTRY.select(["A11Y_CONTRAST"]))
+        everything = DEFAULT_RULE_REGISTRY.prepare(canonical, DEFAULT_RULE_REGISTRY.select())
+
+        self.assertEqual(set(color_only["index"].by_group), {"color"})
+        self.assertGreater(len(everything["index"].by_group), 1)
+
+    def test_parallel_runs_match_inline_runs(self) -> None:
+        canonical = _sample_canonical()
+        specs = DEFAULT_RULE_REGISTRY.select()
+        precomputed = DEFAULT_RULE_REGISTRY.prepare(canonical, specs)
+
+        inline = RuleRegistry(max_workers=1)
+        sequential = [run.evaluation for run in inline.iter_runs(canonical, specs, precomputed)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            parallel = [
+                run.evaluation for run in DEFAULT_RULE_REGISTRY.iter_runs(canonical, specs, precomputed, executor)
+            ]
+
+        self.assertEqual([evaluation.to_dict() for evaluation in parallel], [e.to_dict() for e in sequential])
+
+    def test_rule_audit_runs_only_selected_rules(self) -> None:
+        payload = json.loads((FIXTURES / "sample-figma-tokens.json").read_text(encoding="utf-8"))
+        payload["color"] = {
+            "Text": {"Primary": {"$value": "#9ca3af", "$type": "color"}},
+            "bg": {"canvas": {"$value": "#ffffff", "$type": "color"}},
+        }
+        body = json.dumps(payload).encode("utf-8")
+        cache = AuditResultCache()
+        store = InMemoryAuditStore()
+
+        status, selected = post_rule_audit("source-rules", body, cache, store, rules=["A11Y_CONTRAST"])
+        _, full = post_rule_audit("source-rules", body, cache, store)
+
+        self.assertEqual(status, 200)
+        self.assertEqual({violation["rule_id"] for violation in selected["violations"]}, {"A11Y_CONTRAST"})
+        self.assertEqual(set(selected["summary"]["by_rule"]), {"A11Y_CONTRAST"})
+        self.assertEqual(len(cache), 2)
+        self.assertGreater(full["summary"]["total_violations"], selected["summary"]["total_violations"])
+
+        for rules, code in ((["NOPE"], "unknown_rule"), ([], "invalid_rules")):
+            status, response = post_rule_audit("source-rules", body, cache, store, rules=rules)
+            self.assertEqual(status, 400)
+            self.assertEqual(response["error"]["code"], code)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,7 @@ import unittest
 from pathlib import Path
 
 from apps.api.src.rule_audit_endpoint import post_rule_audit
-from apps.api.src.rule_audit_endpoint import post_rule_report
+from apps.api.src.rule_audit_endpoint import post_rule_report, post_rule_report_stream
 
 ROOT = Path(__file__).resolve().parents[1]
 FIXTURES = ROOT / "design" / "tokens" / "figma"
@@ -23,6 +23,19 @@ class RuleReportEndpointTests(unittest.TestCase):
         self.assertIn("violations", response)
         self.assertIn("generated_at", response)
 
+    def test_report_stream_emits_header_violations_and_summary(self) -> None:
+        payload = (FIXTURES / "sample-figma-tokens.json").read_bytes()
+
+        _, report = post_rule_report("source-report", payload)
+        status, records = post_rule_report_stream("source-report", payload)
+        records = list(records)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(records[0]["type"], "header")
+        self.assertIn("generated_at", records[0])
+        self.assertEqual(records[-1], {"type": "summary", **report["summary"]})
+        self.assertEqual(len(records) - 2, report["summary"]["total_violations"])
+
     def test_report_invalid_json(self) -> None:
         status, response = post_rule_report("source-report", b"{invalid")
 
@@ -30,6 +43,10 @@ class RuleReportEndpointTests(unittest.TestCase):
         self.assertIn("error", response)
         self.assertEqual(response["error"]["code"], "invalid_json")
 
+        status, response = post_rule_report_stream("source-report", b"{invalid")
+        self.assertEqual(status, 400)
+        self.assertEqual(response["error"]["code"], "invalid_json")
+
     def test_report_invalid_source_id(self) -> None:
         payload = (FIXTURES / "sample-figma-tokens.json").read_bytes()
         status, response = post_rule_report("  ", payload)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+import unittest
+from dataclasses import asdict
+
+from packages.contracts import CanonicalToken, RuleViolation, TokenVersionRecord, ValidationReport
+from packages.contracts.serialization import dataclass_encoder, dumps, loads
+
+
+class SerializationTests(unittest.TestCase):
+    def test_encoders_match_asdict_without_deep_copies(self) -> None:
+        violation = RuleViolation(
+            violation_id="A11Y_CONTRAST:1",
+            rule_id="A11Y_CONTRAST",
+            code="LOW_CONTRAST",
+            severity="high",
+            title="Low contrast",
+            description="Contrast is too low.",
+            evidence={"text_path": "color.text.primary", "ratios": [1.2, 2.4]},
+        )
+        token = CanonicalToken("color", "color.text.primary", "text.primary", "color", "#111827")
+        version = TokenVersionRecord("v1", "s1", "2026-01-01T00:00:00+00:00", "figma_json", "0" * 64, "figma", {"color": 1}, True)
+        report = ValidationReport()
+        report.add_error("$.color", "bad")
+
+        for record in (violation, token, version):
+            self.assertEqual(record.to_dict(), asdict(record))
+        self.assertIs(violation.to_dict()["evidence"], violation.evidence)
+        self.assertEqual(report.to_dict()["errors"], [{"path": "$.color", "message": "bad"}])
+        self.assertIs(dataclass_encoder(RuleViolation), dataclass_encoder(RuleViolation))
+
+    def test_dumps_produces_compact_json_bytes(self) -> None:
+        value = {"name": "Brand Text", "ratio": 4.5, "paths": ["color.text"], "ok": True, "missing": None}
+
+        encoded = dumps(value)
+
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(json.loads(encoded), value)
+        self.assertEqual(loads(encoded), value)
+        self.assertNotIn(b": ", encoded)
+
+    def test_dumps_falls_back_for_values_outside_the_fast_backend(self) -> None:
+        value = {"huge": 2**70, 1: "non-string key"}
+
+        self.assertEqual(json.loads(dumps(value)), {"huge": 2**70, "1": "non-string key"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+import unittest
+from dataclasses import replace
+from pathlib import Path
+from unittest.mock import patch
+
+from apps.api.src.figma_import_endpoint import post_tokens_import_figma
+from apps.api.src.persistence import SqliteTokenImportStore, encode_token, token_digest
+from packages.contracts import CanonicalToken
+from packages.rules import normalize_figma_export
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = ROOT / "design" / "tokens" / "figma"
+
+
+def _version_fields(source_id: str, input_sha256: str) -> dict:
+    return {
+        "source_id": source_id,
+        "input_format": "figma_json",
+        "input_sha256": input_sha256,
+        "token_source": "figma_export",
+        "token_counts": {"color": 2},
+        "validation_valid": True,
+    }
+
+
+class SqliteTokenImportStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.db_path = Path(tmp_dir.name) / "qadms.sqlite3"
+
+    def open_store(self, **kwargs) -> SqliteTokenImportStore:
+        store = SqliteTokenImportStore(self.db_path, **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def test_versions_survive_reopening_the_database(self) -> None:
+        store = self.open_store()
+        store.upsert_source("source-sqlite")
+        first = store.create_token_version(**_version_fields("source-sqlite", "a" * 64))
+        second = store.create_token_version(**_version_fields("source-sqlite", "b" * 64))
+        store.close()
+
+        reopened = self.open_store()
+
+        self.assertEqual(reopened.list_versions_for_source("source-sqlite"), [first, second])
+        self.assertEqual(reopened.list_versions_for_source("source-sqlite", limit=1), [second])
+        self.assertEqual(reopened.get_version(first.version_id), first)
+        self.assertIsNone(reopened.get_version("missing"))
+
+    def test_wal_mode_and_contract_indexes_are_enabled(self) -> None:
+        store = self.open_store(dedupe=True)
+        connection = store._connection()
+
+        journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        indexes = {row[1] for row in connection.execute("PRAGMA index_list('token_source_versions')")}
+
+        self.assertEqual(journal_mode, "wal")
+        self.assertIn("idx_token_source_versions_source_imported", indexes)
+        self.assertIn("uq_token_source_versions_source_sha", indexes)
+
+    def test_dedupe_returns_existing_version_for_same_input(self) -> None:
+        store = self.open_store(dedupe=True)
+        store.upsert_source("source-sqlite")
+
+        first = store.create_token_version(**_version_fields("source-sqlite", "c" * 64))
+        again = store.create_token_version(**_version_fields("source-sqlite", "c" * 64))
+
+        self.assertEqual(again.version_id, first.version_id)
+        self.assertEqual(len(store.list_versions_for_source("source-sqlite")), 1)
+
+    def test_batch_insert_and_concurrent_writers(self) -> None:
+        store = self.open_store()
+        store.upsert_source("source-sqlite")
+        store.create_token_versions([_version_fields("source-sqlite", f"{idx:064d}") for idx in range(50)])
+
+        def worker(offset: int) -> None:
+            for idx in range(10):
+                store.create_token_version(**_version_fields("source-sqlite", f"{offset + idx:064d}"))
+
+        threads = [threading.Thread(target=worker, args=(1000 * (n + 1),)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(store.list_versions_for_source("source-sqlite")), 90)
+
+    def test_import_endpoint_persists_through_sqlite_store(self) -> None:
+        store = self.open_store()
+        payload = (FIXTURES / "sample-figma-tokens.json").read_bytes()
+
+        status, response = post_tokens_import_figma("source-sqlite", payload, import_store=store)
+
+        self.assertEqual(status, 200)
+        persisted = store.get_version(response["version_id"])
+        self.assertIsNotNone(persisted)
+        self.assertEqual(persisted.token_counts, response["token_version"]["token_counts"])
+
+    def test_token_manifests_share_rows_across_versions(self) -> None:
+        store = self.open_store(dedupe=True)
+        store.upsert_source("source-sqlite")
+        canonical, _ = normalize_figma_export(
+            json.loads((FIXTURES / "sample-figma-tokens.json").read_text(encoding="utf-8"))
+        )
+        edited = [
+            replace(token, value="#000000") if token.path == "color.bg.canvas" else token for token in canonical.tokens
+        ]
+
+        first = store.create_token_version(**_version_fields("source-sqlite", "d" * 64), tokens=canonical.tokens)
+        second = store.create_token_version(**_version_fields("source-sqlite", "e" * 64), tokens=edited)
+        again = store.create_token_version(**_version_fields("source-sqlite", "e" * 64), tokens=edited)
+        legacy = store.create_token_version(**_version_fields("source-sqlite", "f" * 64))
+        store.close()
+
+        reopened = self.open_store(dedupe=True)
+        self.assertEqual(again.version_id, second.version_id)
+        self.assertEqual(reopened.get_version_tokens(first.version_id), canonical.tokens)
+        self.assertEqual(reopened.get_version_tokens(second.version_id), edited)
+        self.assertIsNone(reopened.get_version_tokens(legacy.version_id))
+        stored = reopened._connection().execute("SELECT COUNT(*) FROM canonical_tokens").fetchone()[0]
+        self.assertEqual(stored, len(canonical.tokens) + 1)
+
+    def test_token_digest_does_not_depend_on_the_json_backend(self) -> None:
+        token = CanonicalToken("color", "color.brand.ink", "ink", "color", {"r": 0.5, "g": "é", "b": 10**20}, "figma")
+        expected = json.dumps(
+            ["color", "color.brand.ink", "ink", "color", {"b": 10**20, "g": "é", "r": 0.5}, "figma"],
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+        with patch("packages.contracts.serialization.orjson", None):
+            without_orjson = token_digest(encode_token(token))
+
+        self.assertEqual(encode_token(token), expected)
+        self.assertEqual(token_digest(encode_token(token)), without_orjson)
+        with self.assertRaises(ValueError):
+            encode_token(replace(token, value=float("nan")))
+
+
+if __name__ == "__main__":
+    unittest.main()
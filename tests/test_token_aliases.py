@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+import unittest
+
+from packages.contracts import CanonicalToken, ValidationReport
+from packages.rules import (
+    AliasResolver,
+    evaluate_a11y_contrast,
+    evaluate_tokens_scale,
+    normalize_figma_export,
+    normalize_figma_export_stream,
+    resolve_token_aliases,
+)
+
+
+def _token(path: str, value, token_type: str = "color") -> CanonicalToken:
+    group, name = path.split(".", 1)
+    return CanonicalToken(group, path, name, token_type, value)
+
+
+class TokenAliasTests(unittest.TestCase):
+    def test_normalizer_resolves_aliases_before_rules_run(self) -> None:
+        payload = {
+            "color": {
+                "brand": {"ink": {"$value": "#111827"}, "paper": {"$value": "#ffffff"}},
+                "text": {"primary": {"$value": "{color.brand.ink}"}},
+                "bg": {"canvas": {"$value": "{color.brand.paper.value}"}},
+            },
+            "spacing": {
+                "sm": {"$value": "4"},
+                "md": {"$value": "{spacing.sm}"},
+                "lg": {"$value": "{spacing.md}"},
+                "xl": {"$value": "16"},
+            },
+        }
+
+        canonical, report = normalize_figma_export(payload)
+
+        values = {token.path: token.value for token in canonical.tokens}
+        self.assertTrue(report.valid)
+        self.assertEqual(values["color.text.primary"], "#111827")
+        self.assertEqual(values["color.bg.canvas"], "#ffffff")
+        self.assertEqual(values["spacing.lg"], "4")
+        self.assertEqual(evaluate_a11y_contrast(canonical).violation_count, 0)
+        codes = {violation.code for violation in evaluate_tokens_scale(canonical).violations}
+        self.assertNotIn("INVALID_NUMERIC_VALUE", codes)
+
+    def test_embedded_and_composite_references_resolve(self) -> None:
+        tokens = [
+            _token("color.border", "#d1d5db"),
+            _token("spacing.md", 8, "dimension"),
+            _token("spacing.lg", "calc({spacing.md} * 2)", "dimension"),
+            _token("shadow.card", {"color": "{color.border}", "blur": "{spacing.md}"}, "shadow"),
+        ]
+
+        resolved = {token.path: token.value for token in resolve_token_aliases(tokens, ValidationReport())}
+
+        self.assertEqual(resolved["spacing.lg"], "calc(8 * 2)")
+        self.assertEqual(resolved["shadow.card"], {"color": "#d1d5db", "blur": 8})
+
+    def test_cycles_are_errors_and_unknown_references_are_warnings(self) -> None:
+        tokens = [
+            _token("color.a", "{color.b}"),
+            _token("color.b", "{color.a}"),
+            _token("color.c", "{color.missing}"),
+        ]
+        report = ValidationReport()
+
+        resolved = resolve_token_aliases(tokens, report)
+
+        self.assertEqual([token.value for token in resolved], ["{color.b}", "{color.a}", "{color.missing}"])
+        self.assertFalse(report.valid)
+        self.assertEqual([issue.path for issue in report.errors], ["color.a", "color.b"])
+        self.assertEqual(report.errors[0].message, "Alias cycle: color.a -> color.b -> color.a.")
+        self.assertEqual([issue.path for issue in report.warnings], ["color.c"])
+
+    def test_every_alias_in_a_cycle_is_an_error(self) -> None:
+        tokens = [
+            _token("color.a", "{color.b} {color.c}"),
+            _token("color.b", "{color.a}"),
+            _token("color.c", "{color.b}"),
+            _token("color.d", "{color.c}"),
+            _token("color.e", "{color.e}"),
+        ]
+        report = ValidationReport()
+
+        resolved = resolve_token_aliases(tokens, report)
+
+        self.assertEqual([token.value for token in resolved], [token.value for token in tokens])
+        messages = {issue.path: issue.message for issue in report.errors}
+        self.assertEqual(sorted(messages), ["color.a", "color.b", "color.c", "color.e"])
+        self.assertEqual(messages["color.b"], "Alias cycle: color.a -> color.b -> color.a.")
+        self.assertIn("color.a -> color.b -> color.a", messages["color.c"])
+        self.assertEqual(messages["color.e"], "Alias cycle: color.e -> color.e.")
+        self.assertEqual([issue.path for issue in report.warnings], ["color.d"])
+
+    def test_update_re_resolves_only_dependent_aliases(self) -> None:
+        resolver = AliasResolver(
+            [
+                _token("color.base", "#000000"),
+                _token("color.mid", "{color.base}"),
+                _token("color.top", "{color.mid}"),
+                _token("color.other", "#ffffff"),
+                _token("color.other.alias", "{color.other}"),
+            ]
+        )
+
+        changed = resolver.update("color.base", "#123456")
+
+        self.assertEqual(changed, ["color.base", "color.mid", "color.top"])
+        self.assertEqual(resolver.value("color.top"), "#123456")
+        self.assertEqual(resolver.value("color.other.alias"), "#ffffff")
+
+        self.assertEqual(resolver.update("color.base", "{color.top}"), ["color.base", "color.mid", "color.top"])
+        report = ValidationReport()
+        resolver.report_issues(report)
+        self.assertEqual(len(report.errors), 3)
+
+        resolver.update("color.base", "#abcdef")
+        report = ValidationReport()
+        resolver.report_issues(report)
+        self.assertTrue(report.valid)
+        self.assertEqual(resolver.value("color.top"), "#abcdef")
+
+    def test_deep_chains_resolve_without_recursion(self) -> None:
+        depth = 20_000
+        tokens = [_token("color.t0", "#0f0f0f")]
+        tokens += [_token(f"color.t{idx}", f"{{color.t{idx - 1}}}") for idx in range(1, depth)]
+
+        resolved = resolve_token_aliases(tokens, ValidationReport())
+
+        self.assertEqual(resolved[-1].value, "#0f0f0f")
+
+    def test_stream_normalizer_resolves_aliases_identically(self) -> None:
+        raw = json.dumps(
+            {
+                "color": {"a": {"$value": "{color.b}"}, "b": {"$value": "{color.a}"}, "c": {"$value": "{color.d}"}},
+                "spacing": {"sm": {"$value": "4"}, "md": {"$value": "{spacing.sm}"}},
+            }
+        ).encode()
+
+        expected = normalize_figma_export(json.loads(raw))
+        streamed = normalize_figma_export_stream(raw)
+        self.assertEqual(streamed[0].to_dict(), expected[0].to_dict())
+        self.assertEqual(streamed[1].to_dict(), expected[1].to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
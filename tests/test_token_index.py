@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import unittest
+
+from packages.contracts import CanonicalToken, CanonicalTokenModel
+from packages.rules import build_token_index, evaluate_a11y_contrast, evaluate_tokens_scale
+from packages.rules.token_values import ColorLiteralCache, parse_color, relative_luminance
+
+
+class TokenIndexTests(unittest.TestCase):
+    def test_index_groups_tokens_and_parses_values_once(self) -> None:
+        model = CanonicalTokenModel(
+            source="manual_upload",
+            tokens=[
+                CanonicalToken("color", "color.text.primary", "text.primary", "color", "#111827"),
+                CanonicalToken("color", "color.bg.canvas", "bg.canvas", "color", "rgb(255, 255, 255)"),
+                CanonicalToken("spacing", "spacing.scale.100", "scale.100", "dimension", "4px"),
+            ],
+        )
+
+        index = build_token_index(model)
+
+        self.assertEqual(len(index.entries), 3)
+        self.assertEqual([entry.token.path for entry in index.group("color")], ["color.text.primary", "color.bg.canvas"])
+        self.assertEqual(index.path_map("color")["color.bg.canvas"].rgb, (255, 255, 255))
+        self.assertEqual(index.group("spacing")[0].segments, ("spacing", "scale", "100"))
+        self.assertEqual(index.group("spacing")[0].number, 4.0)
+        self.assertEqual(index.group("radius"), [])
+
+    def test_rules_accept_a_shared_index(self) -> None:
+        model = CanonicalTokenModel(
+            source="manual_upload",
+            tokens=[
+                CanonicalToken("color", "color.text.subtle", "text.subtle", "color", "#9ca3af"),
+                CanonicalToken("color", "color.bg.canvas", "bg.canvas", "color", "#ffffff"),
+                CanonicalToken("spacing", "spacing.scale.bad", "scale.bad", "dimension", "abc"),
+            ],
+        )
+        index = build_token_index(model)
+
+        self.assertEqual(
+            evaluate_a11y_contrast(model, index).to_dict(),
+            evaluate_a11y_contrast(model).to_dict(),
+        )
+        self.assertEqual(
+            evaluate_tokens_scale(model, index).to_dict(),
+            evaluate_tokens_scale(model).to_dict(),
+        )
+
+
+class ColorLiteralCacheTests(unittest.TestCase):
+    def test_cache_returns_rgb_and_luminance_and_counts_hits(self) -> None:
+        cache = ColorLiteralCache(max_entries=2)
+
+        self.assertEqual(cache.lookup("#ffffff"), ((255, 255, 255), relative_luminance((255, 255, 255))))
+        self.assertEqual(cache.lookup("#ffffff")[0], parse_color("#ffffff"))
+        self.assertIsNone(cache.lookup("not-a-color"))
+        self.assertIsNone(cache.lookup("not-a-color"))
+        self.assertIsNone(cache.lookup({"$value": "#fff"}))
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_cache_evicts_least_recently_used_literal(self) -> None:
+        cache = ColorLiteralCache(max_entries=2)
+        cache.lookup("#000")
+        cache.lookup("#111")
+        cache.lookup("#000")
+        cache.lookup("#222")
+
+        self.assertEqual(len(cache), 2)
+        cache.lookup("#000")
+        cache.lookup("#111")
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
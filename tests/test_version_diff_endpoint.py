@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from apps.api.src.audit_cache import AuditResultCache
+from apps.api.src.persistence import InMemoryTokenImportStore, SqliteTokenImportStore
+from apps.api.src.version_diff_endpoint import get_version_diff
+from packages.contracts import CanonicalToken
+
+
+def _token(path: str, value: str, token_type: str = "color") -> CanonicalToken:
+    group = path.split(".", 1)[0]
+    return CanonicalToken(group, path, path.rsplit(".", 1)[-1], token_type, value, "figma_export")
+
+
+def _save(store, source_id: str, tokens: list[CanonicalToken] | None):
+    store.upsert_source(source_id)
+    return store.create_token_version(
+        source_id=source_id,
+        input_format="figma_json",
+        input_sha256="0" * 64,
+        token_source="figma_export",
+        token_counts={},
+        validation_valid=True,
+        tokens=tokens,
+    )
+
+
+OLD = [
+    _token("color.bg.canvas", "#ffffff"),
+    _token("color.brand.primary", "#2563eb"),
+    _token("color.text.muted", "#6b7280"),
+    _token("color.text.primary", "#111827"),
+    _token("spacing.md", "16", "dimension"),
+]
+NEW = [
+    _token("color.bg.canvas", "#ffffff"),
+    _token("color.brand.accent", "#2563eb"),
+    _token("color.text.muted", "#4b5563"),
+    _token("color.text.primary", "#111827"),
+    _token("spacing.lg", "24", "dimension"),
+]
+
+
+class VersionDiffEndpointTests(unittest.TestCase):
+    def stores(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        sqlite_store = SqliteTokenImportStore(Path(tmp_dir.name) / "qadms.sqlite3")
+        self.addCleanup(sqlite_store.close)
+        return {"memory": InMemoryTokenImportStore(), "sqlite": sqlite_store}
+
+    def test_diff_reports_added_removed_renamed_and_changed_tokens(self) -> None:
+        for name, store in self.stores().items():
+            with self.subTest(store=name):
+                old = _save(store, "brand", OLD)
+                new = _save(store, "brand", NEW)
+
+                status, response = get_version_diff(
+                    "brand", old.version_id, new.version_id, import_store=store, diff_cache=AuditResultCache()
+                )
+
+                self.assertEqual(status, 200)
+                self.assertEqual(
+                    response["summary"], {"added": 1, "removed": 1, "renamed": 1, "changed": 1, "unchanged": 2}
+                )
+                self.assertEqual([entry["path"] for entry in response["added"]], ["spacing.lg"])
+                self.assertEqual([entry["path"] for entry in response["removed"]], ["spacing.md"])
+                self.assertEqual(
+                    response["renamed"],
+                    [
+                        {
+                            "from_path": "color.brand.primary",
+                            "to_path": "color.brand.accent",
+                            "group": "color",
+                            "token_type": "color",
+                            "value": "#2563eb",
+                        }
+                    ],
+                )
+                self.assertEqual(
+                    response["changed"],
+                    [
+                        {
+                            "path": "color.text.muted",
+                            "group": "color",
+                            "from": {"token_type": "color", "value": "#6b7280"},
+                            "to": {"token_type": "color", "value": "#4b5563"},
+                        }
+                    ],
+                )
+
+    def test_diff_of_a_version_with_itself_is_empty(self) -> None:
+        store = InMemoryTokenImportStore()
+        version = _save(store, "brand", OLD)
+
+        _, response = get_version_diff("brand", version.version_id, version.version_id, import_store=store)
+
+        self.assertEqual(response["summary"]["unchanged"], len(OLD))
+        self.assertEqual(response["added"] + response["removed"] + response["renamed"] + response["changed"], [])
+
+    def test_tokens_differing_only_in_name_or_source_count_as_unchanged(self) -> None:
+        renamed_only = [
+            CanonicalToken(token.group, token.path, f"{token.name}-v2", token.token_type, token.value, "tokens_studio")
+            for token in OLD
+        ]
+        for name, store in self.stores().items():
+            with self.subTest(store=name):
+                old = _save(store, "brand", OLD)
+                new = _save(store, "brand", renamed_only)
+
+                _, response = get_version_diff(
+                    "brand", old.version_id, new.version_id, import_store=store, diff_cache=AuditResultCache()
+                )
+
+                self.assertEqual(
+                    response["summary"], {"added": 0, "removed": 0, "renamed": 0, "changed": 0, "unchanged": len(OLD)}
+                )
+
+    def test_diff_results_are_cached_per_version_pair(self) -> None:
+        store = InMemoryTokenImportStore()
+        old, new = _save(store, "brand", OLD), _save(store, "brand", NEW)
+        cache = AuditResultCache()
+
+        _, first = get_version_diff("brand", old.version_id, new.version_id, import_store=store, diff_cache=cache)
+        _, second = get_version_diff("brand", old.version_id, new.version_id, import_store=store, diff_cache=cache)
+        _, reverse = get_version_diff("brand", new.version_id, old.version_id, import_store=store, diff_cache=cache)
+
+        self.assertEqual(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertEqual(reverse["renamed"][0]["from_path"], "color.brand.accent")
+
+    def test_diff_errors_use_error_envelope(self) -> None:
+        store = InMemoryTokenImportStore()
+        stored = _save(store, "brand", OLD)
+        bare = _save(store, "brand", None)
+        other = _save(store, "other", OLD)
+
+        for args, status_code, code in (
+            (("", stored.version_id, stored.version_id), 400, "invalid_source_id"),
+            (("brand", stored.version_id, "missing"), 404, "version_not_found"),
+            (("brand", stored.version_id, other.version_id), 404, "version_not_found"),
+            (("brand", stored.version_id, bare.version_id), 422, "version_tokens_unavailable"),
+        ):
+            status, response = get_version_diff(*args, import_store=store, diff_cache=AuditResultCache())
+            self.assertEqual(status, status_code)
+            self.assertEqual(response["error"]["code"], code)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import unittest
+from unittest import mock
+
+from apps.api.src.audit_cache import AuditResultCache
+from apps.api.src import audit_store
+from apps.api.src.audit_store import InMemoryAuditStore
+from apps.api.src.rule_audit_endpoint import post_rule_audit
+from apps.api.src.violations_query_endpoint import get_audit_violations
+
+PAYLOAD = {
+    "color": {
+        "Text": {
+            "Primary": {"$value": "#9ca3af"},
+            "Muted": {"$value": "#d1d5db"},
+            "broken": {"$value": "not-a-color"},
+        },
+        "bg": {"canvas": {"$value": "#ffffff"}},
+        "button": {"primary": {"$value": "#1f936d"}, "link": {"hover": {"$value": "#1a7f5f"}}},
+    },
+    "spacing": {
+        "100": {"$value": "4"},
+        "200": {"$value": "8"},
+        "900": {"$value": "64"},
+        "Bad": {"$value": "abc"},
+    },
+}
+
+
+class ViolationsQueryEndpointTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = InMemoryAuditStore()
+        self.cache = AuditResultCache()
+        status, self.audit = post_rule_audit(
+            "source-query",
+            json.dumps(PAYLOAD).encode("utf-8"),
+            audit_cache=self.cache,
+            audit_store=self.store,
+        )
+        self.assertEqual(status, 200)
+        self.all_violations = self.audit["violations"]
+
+    def query(self, **params: str) -> tuple[int, dict]:
+        return get_audit_violations("source-query", self.audit["audit_id"], params, audit_store=self.store)
+
+    def test_filters_match_client_side_filtering(self) -> None:
+        status, response = self.query(severity="medium,high", rule_id="TOKENS_NAMING")
+
+        expected = [
+            violation
+            for violation in self.all_violations
+            if violation["severity"] in {"medium", "high"} and violation["rule_id"] == "TOKENS_NAMING"
+        ]
+        self.assertEqual(status, 200)
+        self.assertEqual(response["total"], len(expected))
+        self.assertEqual(response["violations"], expected)
+
+    def test_cursor_pagination_walks_every_violation_in_order(self) -> None:
+        collected: list[dict] = []
+        cursor = None
+        while True:
+            params = {"limit": "2"}
+            if cursor:
+                params["cursor"] = cursor
+            _, page = self.query(**params)
+            collected.extend(page["violations"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(collected, self.all_violations)
+
+    def test_path_prefix_and_search(self) -> None:
+        _, by_prefix = self.query(path_prefix="spacing.")
+        _, by_search = self.query(q="contrast text")
+
+        self.assertGreater(by_prefix["total"], 0)
+        self.assertTrue(all(v["evidence"]["token_path"].startswith("spacing.") for v in by_prefix["violations"]))
+        self.assertGreater(by_search["total"], 0)
+        self.assertTrue(all(v["rule_id"] == "A11Y_CONTRAST" for v in by_search["violations"]))
+
+    def test_summary_counts_match_stored_index(self) -> None:
+        _, high = self.query(severity="high")
+
+        self.assertEqual(high["total"], self.audit["summary"]["by_severity"]["high"])
+
+    def test_index_is_built_on_the_first_query_only(self) -> None:
+        with mock.patch.object(audit_store, "ViolationIndex", wraps=audit_store.ViolationIndex) as index_class:
+            status, cached = post_rule_audit(
+                "source-query",
+                json.dumps(PAYLOAD).encode("utf-8"),
+                audit_cache=self.cache,
+                audit_store=self.store,
+                include_timings=True,
+            )
+            self.assertEqual(status, 200)
+            self.assertTrue(cached["timings"]["cache_hit"])
+            index_class.assert_not_called()
+
+            self.query(severity="high")
+            self.query(q="contrast")
+
+        index_class.assert_called_once()
+
+    def test_unknown_audit_and_bad_cursor_use_error_envelope(self) -> None:
+        missing_status, missing = get_audit_violations("source-query", "missing", audit_store=self.store)
+        cursor_status, bad_cursor = self.query(cursor="not-a-cursor")
+        limit_status, bad_limit = self.query(limit="0")
+
+        self.assertEqual((missing_status, missing["error"]["code"]), (404, "audit_not_found"))
+        self.assertEqual((cursor_status, bad_cursor["error"]["code"]), (400, "invalid_query"))
+        self.assertEqual((limit_status, bad_limit["error"]["code"]), (400, "invalid_query"))
+
+
+if __name__ == "__main__":
+    unittest.main()
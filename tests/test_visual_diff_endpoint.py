@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+import base64
 import json
 import unittest
 
+from apps.api.src.pixel_diff import encode_mask_png
 from apps.api.src.visual_diff_endpoint import post_visual_diff_audit
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional runtime dependency
+    np = None
+
+
+def _mask_snapshot(mask) -> str:
+    return "data:image/png;base64," + base64.b64encode(encode_mask_png(mask)).decode("ascii")
+
 
 class VisualDiffEndpointTests(unittest.TestCase):
     def test_visual_diff_pass_for_identical_snapshots(self) -> None:
@@ -46,6 +57,37 @@ class VisualDiffEndpointTests(unittest.TestCase):
         self.assertEqual(status, 400)
         self.assertEqual(response["error"]["code"], "invalid_visual_diff_payload")
 
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_visual_diff_compares_png_snapshots_pixel_by_pixel(self) -> None:
+        baseline = np.zeros((20, 30), dtype=bool)
+        current = baseline.copy()
+        current[4:8, 5:15] = True
+        payload = {
+            "baseline_snapshot": _mask_snapshot(baseline),
+            "current_snapshot": base64.b64encode(encode_mask_png(current)).decode("ascii"),
+            "threshold": 0.05,
+        }
+
+        status, response = post_visual_diff_audit("source-visual", json.dumps(payload).encode("utf-8"))
+
+        self.assertEqual(status, 200)
+        self.assertEqual(response["status"], "fail")
+        self.assertEqual(response["summary"]["mode"], "pixel")
+        self.assertEqual(response["summary"]["changed_pixels"], 40)
+        self.assertEqual(response["regions"], [{"x": 5, "y": 4, "width": 10, "height": 4, "changed_pixels": 40}])
+        self.assertTrue(response["artifacts"]["diff_mask"].startswith("data:image/png;base64,"))
+
+    def test_visual_diff_rejects_mixed_snapshot_kinds(self) -> None:
+        payload = {
+            "baseline_snapshot": "data:image/png;base64,bm90LWEtcG5n",
+            "current_snapshot": "component:button:default",
+        }
+
+        status, response = post_visual_diff_audit("source-visual", json.dumps(payload).encode("utf-8"))
+
+        self.assertEqual(status, 400)
+        self.assertEqual(response["error"]["code"], "invalid_snapshot")
+
 
 if __name__ == "__main__":
     unittest.main()